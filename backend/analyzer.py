@@ -1,29 +1,47 @@
 from __future__ import annotations
 
+import os
 import re
-from functools import lru_cache
-from typing import Dict, List, Tuple, Optional
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from typing import AsyncIterator, Dict, Iterator, List, Tuple, Optional
 import asyncio
 
 import numpy as np
 import spacy
-try:  # pragma: no cover - optional dependency in tests
-    # Sentence-BERT models from PWC (https://paperswithcode.com/paper/sentence-bert)
-    from sentence_transformers import SentenceTransformer, CrossEncoder
-except Exception:  # pragma: no cover
-    SentenceTransformer = None  # type: ignore
-    CrossEncoder = None  # type: ignore
-try:  # pragma: no cover - keyword extraction via GitHub project FlashText
-    # FlashText repo: https://github.com/vi3k6i5/flashtext
-    from flashtext import KeywordProcessor
-except Exception:  # pragma: no cover
-    KeywordProcessor = None  # type: ignore
-try:  # pragma: no cover - grammar checking
-    import language_tool_python
-except Exception:  # pragma: no cover
-    language_tool_python = None  # type: ignore
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 from spacy.language import Language
+
+from .batching import (
+    INFERENCE_MAX_BATCH_TOKENS,
+    MICROBATCH_MAX_ITEMS,
+    MICROBATCH_MAX_WAIT_MS,
+    MicroBatcher,
+    estimate_tokens,
+    run_bucketed,
+)
+from .cache import LRUCache, content_key
+from .deadline import CostModel, Deadline
+from .embedding_cache import get_embedding_cache
+from .executor import get_executor
+from .grammar import GRAMMAR_TIMEOUT, grammar_check
+from .inference import (
+    CROSS_ENCODER_MAX_LENGTH,
+    CROSS_ENCODER_PATH,
+    EMBEDDER_MAX_LENGTH,
+    EMBEDDER_PATH,
+    CrossEncoder,
+    SentenceTransformer,
+    backend_tag,
+    load_cross_encoder,
+    load_embedder,
+)
+from .keywords import KeywordMatcher, compile_keywords
+from .metrics import Trace, observe_stage, record_degraded, start_trace
+from .model_server import RemoteCrossEncoder, RemoteEmbedder, get_client
 # Add skill synonyms mapping
 SKILL_SYNONYMS = {
     "javascript": "JavaScript",
@@ -60,11 +78,15 @@ from spacy.pipeline import EntityRuler
 # NLP model loading
 # ---------------------------------------------------------------------------
 
+SPACY_MODEL = "en_core_web_sm"
+SPACY_BATCH_SIZE = int(os.getenv("SPACY_BATCH_SIZE", "32"))
+SPACY_N_PROCESS = int(os.getenv("SPACY_N_PROCESS", "1"))
+
 @lru_cache(maxsize=1)
 def get_nlp() -> Language:
     """Load and cache the spaCy model."""
     try:
-        nlp = spacy.load("en_core_web_sm")
+        nlp = spacy.load(SPACY_MODEL)
     except OSError:
         # Fallback to blank model if the small English model is unavailable
         nlp = spacy.blank("en")
@@ -91,10 +113,32 @@ def _add_skill_ruler(nlp: Language) -> None:
 # ---------------------------------------------------------------------------
 
 
-def extract_skills(text: str) -> List[str]:
-    """Extract skills from text using NER and synonym mapping."""
+def _unused_pipes(nlp: Language) -> List[str]:
+    """Pipes that skill extraction can skip: SKILL entities come from the EntityRuler alone."""
+    return [name for name in nlp.pipe_names if name != "entity_ruler"]
+
+
+def parse_for_skills(
+    texts: List[str],
+    batch_size: Optional[int] = None,
+    n_process: Optional[int] = None,
+) -> List[spacy.tokens.Doc]:
+    """Run only the EntityRuler over ``texts`` in batches via ``nlp.pipe``."""
     nlp = get_nlp()
-    doc = nlp(text)
+    return list(
+        nlp.pipe(
+            texts,
+            disable=_unused_pipes(nlp),
+            batch_size=batch_size or SPACY_BATCH_SIZE,
+            n_process=n_process or SPACY_N_PROCESS,
+        )
+    )
+
+
+def extract_skills(text: str, doc: Optional[spacy.tokens.Doc] = None) -> List[str]:
+    """Extract skills from text using NER and synonym mapping."""
+    if doc is None:
+        doc = parse_for_skills([text])[0]
     skill_map: Dict[str, str] = SKILL_SYNONYMS
     skills = set()
     for ent in doc.ents:
@@ -113,20 +157,99 @@ def semantic_similarity(a: str, b: str) -> float:
     return float(doc_a.similarity(doc_b))
 
 
+# Sentence-BERT models from PWC (https://paperswithcode.com/paper/sentence-bert)
+EMBEDDER_MODEL = "all-MiniLM-L6-v2"
+CROSS_ENCODER_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+# Resume sentences re-ranked per JD sentence; 0 scores every pair.
+CROSS_ENCODER_TOP_K = int(os.getenv("CROSS_ENCODER_TOP_K", "5"))
+
+
 @lru_cache(maxsize=1)
 def get_embedder() -> SentenceTransformer:
-    """Load and cache the sentence transformer model."""
-    if SentenceTransformer is None:  # pragma: no cover
-        raise ImportError("sentence-transformers not installed")
-    return SentenceTransformer("all-MiniLM-L6-v2")
+    """Load and cache the sentence transformer model on the configured backend.
+
+    With a model server configured this is a proxy to the server's copy.
+    """
+    client = get_client()
+    if client is not None:
+        return RemoteEmbedder(client)
+    return load_embedder(EMBEDDER_MODEL, EMBEDDER_PATH)
 
 
 @lru_cache(maxsize=1)
 def get_cross_encoder() -> CrossEncoder:
-    """Load and cache cross-encoder model for fine-grained similarity."""
-    if CrossEncoder is None:  # pragma: no cover
-        raise ImportError("sentence-transformers not installed")
-    return CrossEncoder("cross-encoder/ms-marco-MiniLM-L-6-v2")
+    """Load and cache cross-encoder model for fine-grained similarity (or its model-server proxy)."""
+    client = get_client()
+    if client is not None:
+        return RemoteCrossEncoder(client)
+    return load_cross_encoder(CROSS_ENCODER_MODEL, CROSS_ENCODER_PATH)
+
+
+def embedder_id() -> str:
+    """Embedding cache namespace; backends other than fp32 torch get their own vectors."""
+    tag = backend_tag()
+    return EMBEDDER_MODEL if tag == "torch" else f"{EMBEDDER_MODEL}@{tag}"
+
+
+@lru_cache(maxsize=1)
+def model_fingerprint() -> str:
+    """Identify the models and settings that shape analysis output, without loading them."""
+    spacy_model = SPACY_MODEL if spacy.util.is_package(SPACY_MODEL) else "blank-en"
+    return "|".join([
+        EMBEDDER_MODEL,
+        CROSS_ENCODER_MODEL,
+        f"{spacy_model}@spacy-{spacy.__version__}",
+        f"top_k={CROSS_ENCODER_TOP_K}",
+        f"backend={backend_tag()}",
+    ])
+
+
+# Seconds per sentence / pair, learned from every model call; seeded with MiniLM on one CPU core.
+embedding_cost = CostModel(0.002)
+cross_encoder_cost = CostModel(0.004)
+
+
+def embed_bucketed(sentences: List[str]) -> np.ndarray:
+    """Embed in length buckets of at most ``INFERENCE_MAX_BATCH_TOKENS`` padded tokens."""
+    start = time.perf_counter()
+    out = run_bucketed(
+        lambda batch: get_embedder().encode(batch, normalize_embeddings=True, batch_size=len(batch)),
+        sentences,
+        [estimate_tokens(s, limit=EMBEDDER_MAX_LENGTH) for s in sentences],
+        INFERENCE_MAX_BATCH_TOKENS,
+    )
+    embedding_cost.observe(len(sentences), time.perf_counter() - start)
+    return out
+
+
+def predict_bucketed(pairs: List[List[str]]) -> np.ndarray:
+    """Score pairs in length buckets of at most ``INFERENCE_MAX_BATCH_TOKENS`` padded tokens."""
+    start = time.perf_counter()
+    out = run_bucketed(
+        lambda batch: get_cross_encoder().predict(batch, batch_size=len(batch)),
+        pairs,
+        [estimate_tokens(*p, limit=CROSS_ENCODER_MAX_LENGTH) for p in pairs],
+        INFERENCE_MAX_BATCH_TOKENS,
+    )
+    cross_encoder_cost.observe(len(pairs), time.perf_counter() - start)
+    return out
+
+
+@lru_cache(maxsize=1)
+def get_embed_batcher() -> MicroBatcher:
+    """Share embedder forward passes between concurrent requests."""
+    return MicroBatcher(embed_bucketed, MICROBATCH_MAX_ITEMS, MICROBATCH_MAX_WAIT_MS / 1000)
+
+
+@lru_cache(maxsize=1)
+def get_cross_batcher() -> MicroBatcher:
+    """Share cross-encoder forward passes between concurrent requests."""
+    return MicroBatcher(predict_bucketed, MICROBATCH_MAX_ITEMS, MICROBATCH_MAX_WAIT_MS / 1000)
+
+
+def encode_sentences(sentences: List[str]) -> np.ndarray:
+    """Return normalized sentence embeddings, encoding only cache misses."""
+    return get_embedding_cache().encode(sentences, embedder_id(), get_embed_batcher().submit)
 
 
 def split_sents(text: str) -> List[str]:
@@ -141,21 +264,215 @@ def split_sents(text: str) -> List[str]:
                 sents.append(p)
             if len(sents) >= 200:
                 return sents[:200]
-    return sents[:200]
+    return sents
+
+
+RESUME_SNAPSHOT_CACHE_SIZE = int(os.getenv("RESUME_SNAPSHOT_CACHE_SIZE", "1024"))
+
+
+@dataclass
+class ResumeSnapshot:
+    """Sentence-level results of a user's last analysis, reused by the next one."""
+
+    resume_sents: List[str]
+    jd_sents: List[str]
+    similarity: np.ndarray
+    pair_scores: Dict[Tuple[str, str], float]
+
+    @cached_property
+    def rows(self) -> Dict[str, int]:
+        return {s: i for i, s in enumerate(self.resume_sents)}
+
+
+resume_snapshots = LRUCache(RESUME_SNAPSHOT_CACHE_SIZE)
+
+
+@dataclass
+class AnalysisContext:
+    """Per-request artifacts shared by every scoring stage.
+
+    Sentences, embeddings and similarities are computed on first access, so
+    each is built at most once per request; the JD's TF-IDF artifacts come
+    from the shared :class:`JDProfile` cache. ``timings`` collects
+    wall-clock seconds per stage, which also feed the stage metrics and the
+    optional ``trace``.
+
+    With a ``previous`` snapshot for the same JD, similarity rows and
+    cross-encoder pair scores of unchanged resume sentences are copied
+    instead of recomputed; ``recomputed`` counts the sentences that were not.
+
+    With a ``deadline``, model stages that would not fit their time budget
+    run reduced or are skipped; ``degraded`` maps each such stage to what
+    was done instead (e.g. ``"top_k=2"`` or ``"skipped"``).
+    """
+
+    resume_text: str
+    job_text: str
+    timings: Dict[str, float] = field(default_factory=dict)
+    previous: Optional[ResumeSnapshot] = None
+    pair_scores: Dict[Tuple[str, str], float] = field(default_factory=dict)
+    recomputed: Optional[int] = None
+    deadline: Optional[Deadline] = None
+    degraded: Dict[str, str] = field(default_factory=dict)
+    trace: Optional[Trace] = None
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings[stage] = self.timings.get(stage, 0.0) + elapsed
+            observe_stage(stage, elapsed)
+            if self.trace is not None:
+                self.trace.span(stage, start, elapsed)
+
+    @cached_property
+    def resume_sents(self) -> List[str]:
+        return split_sents(self.resume_text)
+
+    @cached_property
+    def jd_sents(self) -> List[str]:
+        return split_sents(self.job_text)
+
+    @cached_property
+    def resume_emb(self) -> np.ndarray:
+        return encode_sentences(self.resume_sents)
+
+    @cached_property
+    def jd_emb(self) -> np.ndarray:
+        return encode_sentences(self.jd_sents)
+
+    @cached_property
+    def similarity(self) -> np.ndarray:
+        """Resume x JD cosine similarities."""
+        prev = self.previous
+        if prev is None or prev.jd_sents != self.jd_sents:
+            self.recomputed = len(self.resume_sents)
+            return np.clip(self.resume_emb @ self.jd_emb.T, -1, 1)
+        changed = [s for s in dict.fromkeys(self.resume_sents) if s not in prev.rows]
+        self.recomputed = len(changed)
+        fresh = {}
+        if changed:
+            fresh = dict(zip(changed, np.clip(encode_sentences(changed) @ self.jd_emb.T, -1, 1)))
+        return np.array([
+            fresh[s] if s in fresh else prev.similarity[prev.rows[s]] for s in self.resume_sents
+        ])
+
+    def snapshot(self) -> Optional[ResumeSnapshot]:
+        """Capture what the next analysis of an edited resume can reuse."""
+        if "similarity" not in self.__dict__:
+            return None
+        return ResumeSnapshot(self.resume_sents, self.jd_sents, self.similarity, self.pair_scores)
+
+
+def fit_tfidf(jd_sents: List[str], job_text: str) -> Tuple[TfidfVectorizer, sparse.csr_matrix]:
+    """Fit TF-IDF on the JD sentences (or the whole JD when it has none)."""
+    docs = jd_sents or [job_text]
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2)).fit(docs)
+    return vectorizer, vectorizer.transform(docs)
+
+
+# ---------------------------------------------------------------------------
+# JD profiles
+# ---------------------------------------------------------------------------
+
+JD_PROFILE_CACHE_SIZE = int(os.getenv("JD_PROFILE_CACHE_SIZE", "256"))
+
+
+def _priority_terms(role: Optional[str], seniority: Optional[str]) -> frozenset:
+    priority = set()
+    if role:
+        priority.update(ROLE_PRIORITY.get(role.lower(), []))
+    if seniority:
+        priority.update(SENIORITY_PRIORITY.get(seniority.lower(), []))
+    return frozenset(priority)
+
+
+@dataclass
+class JDProfile:
+    """TF-IDF artifacts that depend only on the JD text, role and seniority."""
+
+    jd_sents: List[str]
+    vectorizer: TfidfVectorizer
+    matrix: sparse.csr_matrix
+    column_max: np.ndarray
+    sentence_weights: np.ndarray
+    priority: frozenset
+    _skill_weights: Dict[Tuple[str, ...], Dict[str, float]] = field(default_factory=dict)
+
+    def skill_weights(self, job_skills: List[str]) -> Dict[str, float]:
+        """TF-IDF weight per skill from the precomputed column maxima."""
+        key = tuple(job_skills)
+        cached = self._skill_weights.get(key)
+        if cached is not None:
+            return cached
+        vocab = self.vectorizer.vocabulary_
+        weights: Dict[str, float] = {}
+        for skill in job_skills:
+            name = skill.lower()
+            tokens = name.split()
+            phrase_idx = vocab.get(name)
+            cols = [phrase_idx] if phrase_idx is not None else []
+            if phrase_idx is None or len(tokens) > 1:
+                cols.extend(vocab[t] for t in tokens if t in vocab)
+            weight = float(self.column_max[cols].sum()) if cols else 0.0
+            if weight == 0.0:
+                weight = 0.1
+            if name in self.priority:
+                weight *= 1.3
+            weights[skill] = weight
+        if len(self._skill_weights) < 8:
+            self._skill_weights[key] = weights
+        return weights
+
+
+def build_jd_profile(
+    jd_sents: List[str], job_text: str, role: Optional[str] = None, seniority: Optional[str] = None
+) -> JDProfile:
+    vectorizer, matrix = fit_tfidf(jd_sents, job_text)
+    priority = _priority_terms(role, seniority)
+    column_max = matrix.max(axis=0).toarray().ravel()
+    sentence_weights = np.asarray(matrix.sum(axis=1)).ravel() if jd_sents else np.array([1.0])
+    for i, jd_sentence in enumerate(jd_sents):
+        if any(p in jd_sentence.lower() for p in priority):
+            sentence_weights[i] *= 1.3
+    if sentence_weights.sum() == 0:
+        sentence_weights += 1.0
+    return JDProfile(jd_sents, vectorizer, matrix, column_max, sentence_weights, priority)
+
+
+jd_profile_cache = LRUCache(JD_PROFILE_CACHE_SIZE)
 
 
-def embedding_match(resume_text: str, jd_text: str) -> Dict:
+def get_jd_profile(
+    jd_sents: List[str], job_text: str, role: Optional[str] = None, seniority: Optional[str] = None
+) -> JDProfile:
+    """Return the cached profile for this JD, role and seniority, building it on a miss.
+
+    The key is built from ``jd_sents``, the sentences the profile is fitted on,
+    so JDs that differ only in layout share a profile whose weights line up
+    with their sentences.
+    """
+    text = "\n".join(jd_sents) if jd_sents else job_text
+    key = content_key(text, (role or "").lower(), (seniority or "").lower())
+    profile = jd_profile_cache.get(key)
+    if profile is None:
+        profile = build_jd_profile(jd_sents, job_text, role, seniority)
+        jd_profile_cache.put(key, profile)
+    return profile
+
+
+def embedding_match(resume_text: str, jd_text: str, ctx: Optional[AnalysisContext] = None) -> Dict:
     """Return semantic matching stats using sentence embeddings."""
-    resume = split_sents(resume_text)
-    jd = split_sents(jd_text)
+    ctx = ctx or AnalysisContext(resume_text, jd_text)
+    resume = ctx.resume_sents
+    jd = ctx.jd_sents
     if not resume or not jd:
-        return {"semantic": 0.0, "weak_requirements": jd, "support": []}
+        return {"semantic": 0.0, "weak_requirements": jd, "support": [], "similarity": None}
 
-    model = get_embedder()
-    R = model.encode(resume, normalize_embeddings=True)
-    J = model.encode(jd, normalize_embeddings=True)
-
-    sims = np.clip(R @ J.T, -1, 1)
+    sims = ctx.similarity
     best_idx = sims.argmax(axis=0)
     top_per_jd = sims[best_idx, np.arange(len(jd))]
 
@@ -168,42 +485,77 @@ def embedding_match(resume_text: str, jd_text: str) -> Dict:
         "semantic": float(top_per_jd.mean()) if len(top_per_jd) else 0.0,
         "weak_requirements": weak,
         "support": support,
+        "similarity": sims,
     }
 
 
-def cross_encoder_match(resume_text: str, jd_text: str) -> Dict:
-    """Refine semantic stats using a cross-encoder model."""
-    resume = split_sents(resume_text)
-    jd = split_sents(jd_text)
+def cross_encoder_candidates(
+    similarity: Optional[np.ndarray], k: int, n_resume: int, n_jd: int
+) -> np.ndarray:
+    """Resume sentence indices re-ranked per JD sentence: the ``k`` most similar, or all."""
+    if similarity is not None and 0 < k < n_resume:
+        return np.argpartition(-similarity, k - 1, axis=0)[:k].T
+    return np.tile(np.arange(n_resume), (n_jd, 1))
+
+
+def cross_encoder_match(
+    resume_text: str,
+    jd_text: str,
+    similarity: Optional[np.ndarray] = None,
+    top_k: Optional[int] = None,
+    ctx: Optional[AnalysisContext] = None,
+) -> Dict:
+    """Refine semantic stats using a cross-encoder model.
+
+    When the bi-encoder ``similarity`` matrix (resume x JD) is given, only the
+    ``top_k`` most similar resume sentences per JD sentence are re-ranked.
+    """
+    ctx = ctx or AnalysisContext(resume_text, jd_text)
+    resume = ctx.resume_sents
+    jd = ctx.jd_sents
     if not resume or not jd:
-        return {"semantic": 0.0, "support": []}
-
-    model = get_cross_encoder()
-    pairs = [[j, r] for j in jd for r in resume]
-    scores = np.array(model.predict(pairs))
-    scores = 1 / (1 + np.exp(-scores))  # map logits to 0–1
-    scores = 2 * scores - 1  # optional [-1, 1] range for cosine consistency
-    scores = scores.reshape(len(jd), len(resume))
-    scores = np.clip(scores, -1, 1)
-
-    best_idx = scores.argmax(axis=1)
-    top_scores = scores[np.arange(len(jd)), best_idx]
+        return {"semantic": 0.0, "support": [], "pairs_scored": 0}
+
+    k = CROSS_ENCODER_TOP_K if top_k is None else top_k
+    candidates = cross_encoder_candidates(similarity, k, len(resume), len(jd))
+
+    pairs = [(jd[i], resume[r]) for i in range(len(jd)) for r in candidates[i]]
+    known = ctx.previous.pair_scores if ctx.previous is not None else {}
+    todo = list(dict.fromkeys(p for p in pairs if p not in known))
+    if todo:
+        logits = get_cross_batcher().submit([list(p) for p in todo])
+        fresh = 1 / (1 + np.exp(-logits))  # map logits to 0–1
+        fresh = 2 * fresh - 1  # optional [-1, 1] range for cosine consistency
+        known = {**known, **dict(zip(todo, np.clip(fresh, -1, 1).tolist()))}
+    ctx.pair_scores = {p: known[p] for p in pairs}
+    scores = np.array([known[p] for p in pairs]).reshape(candidates.shape)
+
+    rows = np.arange(len(jd))
+    best = scores.argmax(axis=1)
+    best_idx = candidates[rows, best]
+    top_scores = scores[rows, best]
     support = [
         (jd[i], resume[best_idx[i]], float(np.clip(top_scores[i], -1, 1)))
         for i in range(len(jd))
     ]
     semantic = float(np.clip(top_scores.mean(), -1, 1)) if len(top_scores) else 0.0
-    return {"semantic": semantic, "support": support}
+    return {"semantic": semantic, "support": support, "pairs_scored": len(todo)}
+
+
+def skill_matcher(job_skills: List[str]) -> KeywordMatcher:
+    """Return the cached keyword automaton for ``SKILL_SYNONYMS`` plus ``job_skills``."""
+    patterns = {s.lower() for s in job_skills} | set(SKILL_SYNONYMS)
+    return compile_keywords(tuple(sorted(patterns)))
 
 
 def prioritize_missing(job_skills: List[str], resume_skills: List[str], job_text: str) -> Dict[str, List[str]]:
     """Return missing skills prioritized by frequency and first occurrence."""
     missing = [s for s in job_skills if s not in resume_skills]
     scored: List[Tuple[str, float]] = []
-    lower_job = job_text.lower()
+    hits = skill_matcher(job_skills).scan(job_text)
     for skill in missing:
-        freq = lower_job.count(skill.lower())
-        pos = lower_job.find(skill.lower())
+        freq = hits.counts.get(skill.lower(), 0)
+        pos = hits.first.get(skill.lower(), -1)
         weight = freq + (1 / (pos + 1) if pos >= 0 else 0)
         scored.append((skill, weight))
     high = [s for s, w in scored if w >= 2]
@@ -211,32 +563,12 @@ def prioritize_missing(job_skills: List[str], resume_skills: List[str], job_text
     return {"high_priority": sorted(high), "medium_priority": sorted(med)}
 
 
-# ---------------------------------------------------------------------------
-# Grammar checking
-# ---------------------------------------------------------------------------
-
-def grammar_check(text: str) -> List[Dict[str, str]]:
-    """Return grammar issues with suggested replacements."""
-    if language_tool_python is None:
-        return []
-    try:
-        tool = language_tool_python.LanguageTool("en-US")
-        matches = tool.check(text)
-    except Exception:
-        return []
-    issues: List[Dict[str, str]] = []
-    for m in matches[:5]:
-        replacement = m.replacements[0] if m.replacements else ""
-        issues.append({"issue": m.message, "replacement": replacement})
-    return issues
-
-
 # ---------------------------------------------------------------------------
 # ATS optimisation
 # ---------------------------------------------------------------------------
 
-def ats_analysis(resume_text: str, job_skills: List[str]) -> Tuple[float, List[str], List[Dict[str, str]]]:
-    """Compute ATS compliance score and suggestions."""
+def ats_rules(resume_text: str, job_skills: List[str]) -> Tuple[float, List[str]]:
+    """Score keyword density, action verbs and sections (out of 20) with suggestions."""
     suggestions: List[str] = []
     total_score = 0.0
     text_lower = resume_text.lower()
@@ -244,15 +576,14 @@ def ats_analysis(resume_text: str, job_skills: List[str]) -> Tuple[float, List[s
     # Keyword density (10 points)
     tokens = resume_text.split()
     total_tokens = len(tokens) or 1
-    if KeywordProcessor:
-        kp = KeywordProcessor(case_sensitive=False)
-        for skill in job_skills:
-            kp.add_keyword(skill)
-        found = kp.extract_keywords(text_lower)
-        density = len(found) / total_tokens
-    else:
-        keyword_hits = sum(text_lower.count(skill.lower()) for skill in job_skills)
-        density = keyword_hits / total_tokens
+    # Whole-word hits of each job skill or one of its synonyms (e.g. "js").
+    wanted = {skill.lower() for skill in job_skills}
+    hits = skill_matcher(job_skills).scan(text_lower)
+    keyword_hits = sum(
+        n for pattern, n in hits.words.items()
+        if SKILL_SYNONYMS.get(pattern, pattern).lower() in wanted
+    )
+    density = keyword_hits / total_tokens
     if density > 0.02:
         total_score += 10
     elif density > 0.01:
@@ -279,8 +610,22 @@ def ats_analysis(resume_text: str, job_skills: List[str]) -> Tuple[float, List[s
     else:
         total_score += 2
         suggestions.append("Include Education and Experience sections")
+    return total_score, suggestions
 
-    grammar = grammar_check(resume_text)
+
+def ats_analysis(
+    resume_text: str,
+    job_skills: List[str],
+    ctx: Optional[AnalysisContext] = None,
+) -> Tuple[float, List[str], List[Dict[str, str]]]:
+    """Compute ATS compliance score and suggestions."""
+    total_score, suggestions = ats_rules(resume_text, job_skills)
+    if ctx is None:
+        grammar = grammar_check(resume_text)
+    else:
+        with ctx.timed("grammar"):
+            timeout = plan_grammar(ctx)
+            grammar = [] if timeout == 0 else grammar_check(resume_text, timeout)
     return total_score, suggestions, grammar
 
 
@@ -288,95 +633,166 @@ def ats_analysis(resume_text: str, job_skills: List[str]) -> Tuple[float, List[s
 # Scoring
 # ---------------------------------------------------------------------------
 
-def calculate_scores(
+# ---------------------------------------------------------------------------
+# Time budgets
+# ---------------------------------------------------------------------------
+
+# Share of the analysis timeout the bi-encoder and the cross-encoder may each use.
+EMBEDDING_BUDGET_SHARE = float(os.getenv("EMBEDDING_BUDGET_SHARE", "0.35"))
+CROSS_ENCODER_BUDGET_SHARE = float(os.getenv("CROSS_ENCODER_BUDGET_SHARE", "0.35"))
+# Seconds held back from the timeout for result assembly and the database write.
+ANALYSIS_RESERVE = float(os.getenv("ANALYSIS_RESERVE", "0.15"))
+# Fewest resume sentences worth embedding; with less time the stage is skipped.
+DEGRADED_MIN_SENTENCES = int(os.getenv("DEGRADED_MIN_SENTENCES", "5"))
+GRAMMAR_MIN_BUDGET = 0.05
+
+
+def plan_embedding(ctx: AnalysisContext) -> bool:
+    """Trim ``ctx.resume_sents`` to what the embedding budget allows; False to skip the stage.
+
+    Only sentences that would actually be encoded count against the budget:
+    those in the embedding cache, or reused from a snapshot for the same JD,
+    are free.
+    """
+    if ctx.deadline is None:
+        return True
+    prev = ctx.previous
+    reused = prev.rows if prev is not None and prev.jd_sents == ctx.jd_sents else {}
+    cache, model = get_embedding_cache(), embedder_id()
+    jd_misses = len({s for s, hit in zip(ctx.jd_sents, cache.cached(ctx.jd_sents, model)) if not hit})
+    seen: set = set()
+    misses = []
+    for sentence, hit in zip(ctx.resume_sents, cache.cached(ctx.resume_sents, model)):
+        misses.append(not hit and sentence not in reused and sentence not in seen)
+        seen.add(sentence)
+    n_resume = len(ctx.resume_sents)
+    fits = embedding_cost.fit(ctx.deadline.allowance(EMBEDDING_BUDGET_SHARE)) - jd_misses
+    if fits >= sum(misses):
+        return True
+    keep = int(np.searchsorted(np.cumsum(misses), max(fits, 0), side="right"))  # longest prefix that fits
+    if keep < min(DEGRADED_MIN_SENTENCES, n_resume):
+        ctx.degraded["embedding"] = "skipped"
+        return False
+    ctx.degraded["embedding"] = f"sentences={keep}/{n_resume}"
+    ctx.resume_sents = ctx.resume_sents[:keep]
+    return True
+
+
+def _unscored_pairs(ctx: AnalysisContext, k: int) -> int:
+    """Pairs the cross-encoder would run at ``top_k=k``, less those the snapshot already scored."""
+    known = ctx.previous.pair_scores if ctx.previous is not None else {}
+    candidates = cross_encoder_candidates(ctx.similarity, k, len(ctx.resume_sents), len(ctx.jd_sents))
+    pairs = {(ctx.jd_sents[i], ctx.resume_sents[r]) for i in range(len(ctx.jd_sents)) for r in candidates[i]}
+    return sum(p not in known for p in pairs)
+
+
+def plan_cross_encoder(ctx: AnalysisContext) -> Optional[int]:
+    """Top-k that fits the cross-encoder budget, or ``None`` to skip the stage.
+
+    Pairs scored by the previous analysis of this resume are free; only the
+    rest count against the budget.
+    """
+    n_resume, n_jd = len(ctx.resume_sents), len(ctx.jd_sents)
+    k = CROSS_ENCODER_TOP_K if 0 < CROSS_ENCODER_TOP_K < n_resume else n_resume
+    if ctx.deadline is None or not n_resume or not n_jd:
+        return k
+    if ctx.degraded.get("embedding") == "skipped":
+        ctx.degraded["cross_encoder"] = "skipped"
+        return None
+    budget = cross_encoder_cost.fit(ctx.deadline.allowance(CROSS_ENCODER_BUDGET_SHARE))
+    if _unscored_pairs(ctx, k) <= budget:
+        return k
+    lo, hi = 0, k  # largest top-k in [1, k) whose unscored pairs fit; 0 if none
+    while lo + 1 < hi:
+        mid = (lo + hi) // 2
+        if _unscored_pairs(ctx, mid) <= budget:
+            lo = mid
+        else:
+            hi = mid
+    if lo < 1:
+        ctx.degraded["cross_encoder"] = "skipped"
+        return None
+    ctx.degraded["cross_encoder"] = f"top_k={lo}"
+    return lo
+
+
+def plan_grammar(ctx: AnalysisContext) -> Optional[float]:
+    """Grammar timeout bounded by the time left; 0 to skip the check."""
+    if ctx.deadline is None:
+        return None
+    timeout = min(GRAMMAR_TIMEOUT, ctx.deadline.remaining())
+    if timeout < GRAMMAR_MIN_BUDGET:
+        ctx.degraded["grammar"] = "skipped"
+        return 0
+    if timeout < GRAMMAR_TIMEOUT:
+        ctx.degraded["grammar"] = f"timeout={timeout:.2f}s"
+    return timeout
+
+
+def skill_coverage(
     job_skills: List[str],
     resume_skills: List[str],
-    resume_text: str,
     job_text: str,
-    role: Optional[str] = None,
-    seniority: Optional[str] = None,
-) -> Tuple[
-    float,
-    Dict[str, float],
-    List[str],
-    Dict[str, List[str]],
-    List[str],
-    List[str],
-    List[Tuple[str, str, float]],
-    List[Dict[str, str]],
-]:
-    """Compute overall score, breakdown, matched/missing skills and suggestions."""
-
-    jd_sents = split_sents(job_text)
-    vectorizer = TfidfVectorizer(ngram_range=(1, 2)).fit(jd_sents or [job_text])
-    tfidf_matrix = vectorizer.transform(jd_sents or [job_text])
-
-    priority = set()
-    if role:
-        priority.update(ROLE_PRIORITY.get(role.lower(), []))
-    if seniority:
-        priority.update(SENIORITY_PRIORITY.get(seniority.lower(), []))
-
-    # Skill weights via TF-IDF
-    skill_weights: Dict[str, float] = {}
-    for skill in job_skills:
-        key = skill.lower()
-        tokens = key.split()
-        weight = 0.0
-        phrase_idx = vectorizer.vocabulary_.get(key)
-        if phrase_idx is not None:
-            weight += float(tfidf_matrix[:, phrase_idx].max())
-        if phrase_idx is None or len(tokens) > 1:
-            for t in tokens:
-                idx = vectorizer.vocabulary_.get(t)
-                if idx is not None:
-                    weight += float(tfidf_matrix[:, idx].max())
-        if weight == 0.0:
-            weight = 0.1
-        if key in priority:
-            weight *= 1.3
-        skill_weights[skill] = weight
-
+    role: Optional[str],
+    seniority: Optional[str],
+    ctx: AnalysisContext,
+) -> Tuple[JDProfile, List[str], float]:
+    """Return the JD profile, matched skills and TF-IDF-weighted skill coverage (out of 50)."""
+    profile = get_jd_profile(ctx.jd_sents, job_text, role, seniority)
+    skill_weights = profile.skill_weights(job_skills)
     total_skill_weight = sum(skill_weights.values()) or 1.0
     matched = [s for s in job_skills if s in resume_skills]
     coverage = sum(skill_weights[s] for s in matched) / total_skill_weight * 50
+    return profile, matched, coverage
 
-    # Embedding-based semantic matching
-    embed = embedding_match(resume_text, job_text)
+
+def weighted_semantic(embed: Dict, profile: JDProfile) -> float:
+    """Mean best-match similarity per JD sentence, weighted by the sentences' TF-IDF mass."""
     similarities = np.array([sim for _, _, sim in embed["support"]])
-    sentence_weights = np.array(tfidf_matrix.sum(axis=1)).flatten() if jd_sents else np.array([1.0])
-    for i, jd_sentence in enumerate(jd_sents):
-        if any(p in jd_sentence.lower() for p in priority):
-            sentence_weights[i] *= 1.3
-    if sentence_weights.sum() == 0:
-        sentence_weights += 1.0
-    weighted_sem = float((similarities * sentence_weights).sum() / sentence_weights.sum()) if len(similarities) else 0.0
+    sentence_weights = profile.sentence_weights
+    return float((similarities * sentence_weights).sum() / sentence_weights.sum()) if len(similarities) else 0.0
 
-    # Cross-encoder refinement (PWC model). Fallback silently if unavailable.
-    cross_sem = 0.0
-    cross_support: List[Tuple[str, str, float]] = []
+
+def cross_refinement(
+    embed: Dict, ctx: AnalysisContext, top_k: Optional[int] = None
+) -> Tuple[float, List[Tuple[str, str, float]]]:
+    """Cross-encoder semantic score and support; ``(0.0, [])`` if the model is unavailable."""
     try:
-        cross = cross_encoder_match(resume_text, job_text)
-        cross_sem = cross["semantic"]
-        cross_support = cross["support"]
+        cross = cross_encoder_match(
+            ctx.resume_text, ctx.job_text, similarity=embed.get("similarity"), top_k=top_k, ctx=ctx
+        )
     except Exception:
-        pass
+        return 0.0, []
+    return cross["semantic"], cross["support"]
+
 
+def combine_semantic(
+    weighted_sem: float,
+    support: List[Tuple[str, str, float]],
+    cross_sem: float = 0.0,
+    cross_support: Optional[List[Tuple[str, str, float]]] = None,
+) -> Tuple[float, List[Tuple[str, str, float]]]:
+    """Average the bi- and cross-encoder scores (out of 30); cross-encoder evidence wins."""
     combined_sem = weighted_sem
-    support = embed["support"]
     if cross_sem:
         combined_sem = (weighted_sem + cross_sem) / 2
         if cross_support:
             support = cross_support
-
-    semantic_score = combined_sem * 30
-
-    # ATS analysis
-    ats_score, ats_suggestions, grammar = ats_analysis(resume_text, job_skills)
-
-    # Missing skills priority
-    missing = prioritize_missing(job_skills, resume_skills, job_text)
-
+    return combined_sem * 30, support
+
+
+def assemble_scores(
+    coverage: float,
+    semantic_score: float,
+    ats_score: float,
+    matched: List[str],
+    missing: Dict[str, List[str]],
+    ats_suggestions: List[str],
+    weak_requirements: List[str],
+    support: List[Tuple[str, str, float]],
+    grammar: List[Dict[str, str]],
+) -> Tuple:
+    """Build the :func:`calculate_scores` result tuple from the stage outputs."""
     total = coverage + semantic_score + ats_score
     breakdown = {
         "skill_match": round(coverage, 2),
@@ -398,25 +814,84 @@ def calculate_scores(
         matched,
         missing,
         suggestions,
-        embed["weak_requirements"],
+        weak_requirements,
         support,
         grammar,
     )
 
 
+def calculate_scores(
+    job_skills: List[str],
+    resume_skills: List[str],
+    resume_text: str,
+    job_text: str,
+    role: Optional[str] = None,
+    seniority: Optional[str] = None,
+    ctx: Optional[AnalysisContext] = None,
+) -> Tuple[
+    float,
+    Dict[str, float],
+    List[str],
+    Dict[str, List[str]],
+    List[str],
+    List[str],
+    List[Tuple[str, str, float]],
+    List[Dict[str, str]],
+]:
+    """Compute overall score, breakdown, matched/missing skills and suggestions."""
+
+    ctx = ctx or AnalysisContext(resume_text, job_text)
+    with ctx.timed("tfidf"):
+        # Skill weights via TF-IDF (cached per JD, role and seniority)
+        profile, matched, coverage = skill_coverage(job_skills, resume_skills, job_text, role, seniority, ctx)
+
+    # Embedding-based semantic matching (fewer resume sentences, or none, when short of time)
+    with ctx.timed("embedding"):
+        if plan_embedding(ctx):
+            embed = embedding_match(resume_text, job_text, ctx=ctx)
+        else:
+            embed = {"semantic": 0.0, "weak_requirements": [], "support": [], "similarity": None}
+        weighted_sem = weighted_semantic(embed, profile)
+
+    # Cross-encoder refinement (PWC model). Fallback silently if unavailable.
+    cross_sem, cross_support = 0.0, []
+    with ctx.timed("cross_encoder"):
+        top_k = plan_cross_encoder(ctx)
+        if top_k is not None:
+            cross_sem, cross_support = cross_refinement(embed, ctx, top_k)
+
+    semantic_score, support = combine_semantic(weighted_sem, embed["support"], cross_sem, cross_support)
+
+    # ATS analysis (grammar is also reported separately)
+    with ctx.timed("ats"):
+        ats_score, ats_suggestions, grammar = ats_analysis(resume_text, job_skills, ctx=ctx)
+
+    # Missing skills priority
+    with ctx.timed("missing"):
+        missing = prioritize_missing(job_skills, resume_skills, job_text)
+
+    return assemble_scores(
+        coverage, semantic_score, ats_score, matched, missing,
+        ats_suggestions, embed["weak_requirements"], support, grammar,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Public analysis API
 # ---------------------------------------------------------------------------
 
-async def perform_analysis(
-    resume_text: str,
-    job_description: str,
-    role: Optional[str] = None,
-    seniority: Optional[str] = None,
-) -> Dict:
-    nlp = get_nlp()  # ensure model loaded
-    job_skills = extract_skills(job_description)
-    resume_skills = extract_skills(resume_text)
+def _extract_skill_pair(job_text: str, resume_text: str) -> Tuple[List[str], List[str]]:
+    """Extract job and resume skills in one worker round-trip and one ``nlp.pipe`` call.
+
+    Takes and returns plain values only: with ``INFERENCE_PROCESSES`` it runs
+    in the process pool, where the context (trace lock, snapshot arrays)
+    must not be pickled.
+    """
+    jd_doc, resume_doc = parse_for_skills([job_text, resume_text])
+    return extract_skills(job_text, jd_doc), extract_skills(resume_text, resume_doc)
+
+
+def _result_dict(scores: Tuple, ctx: AnalysisContext) -> Dict:
     (
         score,
         breakdown,
@@ -426,14 +901,7 @@ async def perform_analysis(
         weak_requirements,
         support,
         grammar,
-    ) = calculate_scores(
-        job_skills,
-        resume_skills,
-        resume_text,
-        job_description,
-        role,
-        seniority,
-    )
+    ) = scores
     evidence = [
         {"jd": jd, "resume": r, "similarity": sim} for jd, r, sim in support
     ]
@@ -446,18 +914,278 @@ async def perform_analysis(
         "weak_requirements": weak_requirements,
         "evidence": evidence,
         "grammar": grammar,
+        "timings": {stage: round(sec * 1000, 2) for stage, sec in ctx.timings.items()},
+        "recomputed_sentences": ctx.recomputed or 0,
+        "degraded": dict(ctx.degraded),
     }
 
 
+async def perform_analysis(
+    resume_text: str,
+    job_description: str,
+    role: Optional[str] = None,
+    seniority: Optional[str] = None,
+    snapshot_key: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
+) -> Dict:
+    """Run the analysis pipeline in the inference executor.
+
+    With a ``snapshot_key`` (e.g. the user id), sentence-level results are
+    kept so the next analysis under that key only recomputes edited sentences.
+    With a ``deadline``, model stages degrade to fit it (see ``AnalysisContext``).
+    Raises ``ExecutorSaturated`` when the executor queue is full.
+    """
+    executor = get_executor()
+    ctx = AnalysisContext(resume_text, job_description, deadline=deadline, trace=start_trace("analyze"))
+    if snapshot_key is not None:
+        ctx.previous = resume_snapshots.get(snapshot_key)
+    async with executor.session():
+        with ctx.timed("skills"):
+            job_skills, resume_skills = await executor.run(
+                _extract_skill_pair, job_description, resume_text, cpu_bound=True
+            )
+        scores = await executor.run(
+            calculate_scores,
+            job_skills,
+            resume_skills,
+            resume_text,
+            job_description,
+            role,
+            seniority,
+            ctx,
+        )
+    snapshot = ctx.snapshot()
+    if snapshot_key is not None and snapshot is not None:
+        resume_snapshots.put(snapshot_key, snapshot)
+    record_degraded(ctx.degraded)
+    if ctx.trace is not None:
+        ctx.trace.finish(degraded=ctx.degraded, recomputed_sentences=ctx.recomputed)
+    return _result_dict(scores, ctx)
+
+
+def prepare_pairs(pairs: List[Tuple[str, str]]) -> List[Tuple[AnalysisContext, List[str], List[str]]]:
+    """Build a context (plus job and resume skills) for every ``(resume, jd)`` pair.
+
+    Each distinct text is split, parsed and skill-extracted once, and all
+    sentences are embedded in a single ``encode_sentences`` call. Pairs with
+    the same JD share its profile through the JD profile cache.
+    """
+    texts = list(dict.fromkeys(t for pair in pairs for t in pair))
+    sents = {t: split_sents(t) for t in texts}
+    unique = list(dict.fromkeys(s for t in texts for s in sents[t]))
+    matrix = encode_sentences(unique)
+    row = {s: i for i, s in enumerate(unique)}
+    embeddings = {t: matrix[[row[s] for s in sents[t]]] for t in texts if sents[t]}
+    docs = dict(zip(texts, parse_for_skills(texts)))
+    skills = {t: extract_skills(t, docs[t]) for t in texts}
+
+    prepared = []
+    for resume, job in pairs:
+        ctx = AnalysisContext(resume, job)
+        ctx.resume_sents, ctx.jd_sents = sents[resume], sents[job]
+        if resume in embeddings:
+            ctx.resume_emb = embeddings[resume]
+        if job in embeddings:
+            ctx.jd_emb = embeddings[job]
+        prepared.append((ctx, skills[job], skills[resume]))
+    return prepared
+
+
+def prepare_batch(
+    resume_texts: List[str], job_descriptions: List[str]
+) -> List[Tuple[AnalysisContext, List[str], List[str]]]:
+    """:func:`prepare_pairs` for every resume x JD pair, resume-major."""
+    return prepare_pairs([(r, j) for r in resume_texts for j in job_descriptions])
+
+
+def score_prepared(
+    ctx: AnalysisContext,
+    job_skills: List[str],
+    resume_skills: List[str],
+    role: Optional[str] = None,
+    seniority: Optional[str] = None,
+) -> Dict:
+    """Score one pair built by :func:`prepare_pairs`; returns what :func:`perform_analysis` does."""
+    scores = calculate_scores(
+        job_skills, resume_skills, ctx.resume_text, ctx.job_text, role, seniority, ctx
+    )
+    return _result_dict(scores, ctx)
+
+
+async def iter_batch_analysis(
+    resume_texts: List[str],
+    job_descriptions: List[str],
+    role: Optional[str] = None,
+    seniority: Optional[str] = None,
+) -> AsyncIterator[Tuple[int, Dict]]:
+    """Analyze every resume x JD pair, yielding ``(index, result)`` as each finishes.
+
+    The caller is responsible for admitting the batch with the executor.
+    """
+    executor = get_executor()
+    prepared = await executor.run(prepare_batch, resume_texts, job_descriptions)
+    limit = asyncio.Semaphore(executor.workers)
+
+    async def score(index: int, ctx: AnalysisContext, job_skills: List[str], resume_skills: List[str]):
+        async with limit:
+            return index, await executor.run(
+                score_prepared, ctx, job_skills, resume_skills, role, seniority
+            )
+
+    tasks = [asyncio.ensure_future(score(i, *item)) for i, item in enumerate(prepared)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+# Seconds each model stage of a streamed analysis may take before it is skipped.
+STREAM_STAGE_BUDGET = float(os.getenv("STREAM_STAGE_BUDGET", "1.0"))
+
+
+def _grammar_stage(ctx: AnalysisContext) -> List[Dict[str, str]]:
+    with ctx.timed("grammar"):
+        return grammar_check(ctx.resume_text)
+
+
+async def iter_staged_analysis(
+    resume_text: str,
+    job_description: str,
+    role: Optional[str] = None,
+    seniority: Optional[str] = None,
+    budget: Optional[float] = None,
+    snapshot_key: Optional[str] = None,
+) -> AsyncIterator[Dict]:
+    """Run the pipeline stage by stage, yielding each stage's partial result as it lands.
+
+    Events come in order ``skills`` (skill match and ATS rules), ``semantic``
+    (bi-encoder), ``cross_encoder`` and ``grammar``, each with the running
+    ``score``; the last event, ``result``, carries what :func:`perform_analysis`
+    returns plus ``skipped_stages``. A model stage still running after
+    ``budget`` seconds yields ``{"stage": ..., "skipped": True}`` and the
+    score is built without it (the cross-encoder is skipped with the
+    bi-encoder it refines). Grammar runs alongside the other stages from the
+    start. The caller is responsible for admitting the request with the executor.
+    """
+    executor = get_executor()
+    budget = STREAM_STAGE_BUDGET if budget is None else budget
+    ctx = AnalysisContext(resume_text, job_description, trace=start_trace("analyze_stream"))
+    if snapshot_key is not None:
+        ctx.previous = resume_snapshots.get(snapshot_key)
+    skipped: List[str] = []
+
+    async def within_budget(stage: str, fn, *args):
+        try:
+            return await asyncio.wait_for(executor.run(fn, *args), budget)
+        except asyncio.TimeoutError:
+            skipped.append(stage)
+            return None
+
+    grammar_task = asyncio.ensure_future(within_budget("grammar", _grammar_stage, ctx))
+    try:
+        with ctx.timed("skills"):
+            job_skills, resume_skills = await executor.run(
+                _extract_skill_pair, job_description, resume_text, cpu_bound=True
+            )
+
+        def rules():
+            with ctx.timed("tfidf"):
+                coverage = skill_coverage(job_skills, resume_skills, job_description, role, seniority, ctx)
+            with ctx.timed("ats"):
+                ats = ats_rules(resume_text, job_skills)
+            with ctx.timed("missing"):
+                missing = prioritize_missing(job_skills, resume_skills, job_description)
+            return coverage, ats, missing
+
+        (profile, matched, coverage), (ats_score, ats_suggestions), missing = await executor.run(rules)
+        score = coverage + ats_score
+        yield {
+            "stage": "skills",
+            "score": round(score, 2),
+            "skill_match": round(coverage, 2),
+            "ats_optimization": round(ats_score, 2),
+            "matched_skills": matched,
+            "missing_skills": missing,
+        }
+
+        def semantic():
+            with ctx.timed("embedding"):
+                embed = embedding_match(resume_text, job_description, ctx=ctx)
+                return embed, weighted_semantic(embed, profile)
+
+        embedded = await within_budget("semantic", semantic)
+        embed = {"weak_requirements": [], "support": []}
+        semantic_score, support = 0.0, []
+        if embedded is None:
+            yield {"stage": "semantic", "skipped": True}
+            skipped.append("cross_encoder")
+            yield {"stage": "cross_encoder", "skipped": True}
+        else:
+            embed, weighted_sem = embedded
+            semantic_score, support = combine_semantic(weighted_sem, embed["support"])
+            yield {
+                "stage": "semantic",
+                "score": round(score + semantic_score, 2),
+                "semantic_similarity": round(semantic_score, 2),
+                "weak_requirements": embed["weak_requirements"],
+            }
+
+            def refine():
+                with ctx.timed("cross_encoder"):
+                    return cross_refinement(embed, ctx)
+
+            refined = await within_budget("cross_encoder", refine)
+            if refined is None:
+                yield {"stage": "cross_encoder", "skipped": True}
+            else:
+                semantic_score, support = combine_semantic(weighted_sem, embed["support"], *refined)
+                yield {
+                    "stage": "cross_encoder",
+                    "score": round(score + semantic_score, 2),
+                    "semantic_similarity": round(semantic_score, 2),
+                    "evidence": [{"jd": jd, "resume": r, "similarity": sim} for jd, r, sim in support],
+                }
+
+        grammar = await grammar_task
+        if grammar is None:
+            yield {"stage": "grammar", "skipped": True}
+            grammar = []
+        else:
+            yield {"stage": "grammar", "grammar": grammar}
+    finally:
+        grammar_task.cancel()
+
+    if not skipped:
+        snapshot = ctx.snapshot()
+        if snapshot_key is not None and snapshot is not None:
+            resume_snapshots.put(snapshot_key, snapshot)
+    record_degraded(dict.fromkeys(skipped, "skipped"))
+    if ctx.trace is not None:
+        ctx.trace.finish(skipped_stages=skipped)
+    scores = assemble_scores(
+        coverage, semantic_score, ats_score, matched, missing,
+        ats_suggestions, embed["weak_requirements"], support, grammar,
+    )
+    yield {"stage": "result", **_result_dict(scores, ctx), "skipped_stages": skipped}
+
+
 async def timed_analysis(
     resume_text: str,
     job_description: str,
     role: Optional[str] = None,
     seniority: Optional[str] = None,
     timeout: float = 5.0,
+    snapshot_key: Optional[str] = None,
 ) -> Dict:
-    """Run analysis with a timeout."""
+    """Run analysis with a timeout, cancelling stages that have not started.
+
+    Model stages are budgeted against the same timeout, so an analysis short
+    of time returns a degraded result instead of timing out.
+    """
+    deadline = Deadline(timeout, ANALYSIS_RESERVE)
     return await asyncio.wait_for(
-        perform_analysis(resume_text, job_description, role, seniority),
+        perform_analysis(resume_text, job_description, role, seniority, snapshot_key, deadline),
         timeout=timeout,
     )
@@ -0,0 +1,179 @@
+"""Coalesce model inputs from concurrent requests into shared forward passes."""
+
+from __future__ import annotations
+
+import bisect
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# ----- Config -----
+# How long the first input of a batch waits for company; 0 calls the model directly.
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("MICROBATCH_MAX_WAIT_MS", "2"))
+MICROBATCH_MAX_ITEMS = int(os.getenv("MICROBATCH_MAX_ITEMS", "128"))
+# Padded tokens (batch size x longest input) per forward pass; 0 disables bucketing.
+INFERENCE_MAX_BATCH_TOKENS = int(os.getenv("INFERENCE_MAX_BATCH_TOKENS", "1024"))
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+WAIT_MS_BUCKETS = (0.1, 0.5, 1, 2, 5, 10, 25, 50, 100)
+
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(*texts: str, limit: int = 512) -> int:
+    """Rough WordPiece length of ``texts`` encoded together, with special tokens."""
+    return min(sum(len(_TOKEN.findall(t)) for t in texts) + len(texts) + 1, limit)
+
+
+def token_budget_batches(lengths: Sequence[int], max_tokens: int) -> List[List[int]]:
+    """Group indices shortest-first so each batch's padded size stays within ``max_tokens``.
+
+    An input longer than the budget gets a batch of its own.
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    longest = 0
+    for i in sorted(range(len(lengths)), key=lengths.__getitem__):
+        width = max(longest, lengths[i], 1)
+        if current and (len(current) + 1) * width > max_tokens:
+            batches.append(current)
+            current, width = [], max(lengths[i], 1)
+        current.append(i)
+        longest = width
+    if current:
+        batches.append(current)
+    return batches
+
+
+def run_bucketed(
+    fn: Callable[[List[Any]], Any], items: Sequence[Any], lengths: Sequence[int], max_tokens: int
+) -> np.ndarray:
+    """Call ``fn`` on length-sorted, token-budgeted batches and return rows in input order."""
+    if max_tokens <= 0 or len(items) <= 1:
+        return np.asarray(fn(list(items)))
+    out: Optional[np.ndarray] = None
+    for idx in token_budget_batches(lengths, max_tokens):
+        part = np.asarray(fn([items[i] for i in idx]))
+        if out is None:
+            out = np.empty((len(items),) + part.shape[1:], dtype=part.dtype)
+        out[idx] = part
+    return out
+
+
+class Histogram:
+    """Thread-safe cumulative histogram with fixed upper bounds."""
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        cumulative, running = {}, 0
+        for bound, count in zip(list(self.buckets) + ["+Inf"], counts):
+            running += count
+            cumulative[str(bound)] = running
+        return {"count": running, "sum": round(total, 3), "buckets": cumulative}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self._sum = 0.0
+
+
+class MicroBatcher:
+    """Run ``fn`` over the inputs of many callers at once.
+
+    :meth:`submit` blocks the calling worker thread. A single dispatcher
+    thread takes the oldest pending request, gathers more for up to
+    ``max_wait`` seconds after it arrived (or until ``max_items`` inputs are
+    queued), calls ``fn`` on the concatenation and hands each caller its
+    slice of the result. ``fn`` must return one row per input.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[List[Any]], Any],
+        max_items: int = 128,
+        max_wait: float = 0.002,
+    ) -> None:
+        self.fn = fn
+        self.max_items = max_items
+        self.max_wait = max_wait
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(WAIT_MS_BUCKETS)
+        self._queue: "queue.Queue[Tuple[List[Any], Future, float]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, items: Sequence[Any]) -> np.ndarray:
+        """Return ``fn(items)``, computed together with other pending calls."""
+        items = list(items)
+        if not items or self.max_wait <= 0:
+            self.batch_size.observe(len(items))
+            return np.asarray(self.fn(items))
+        future: Future = Future()
+        self._queue.put((items, future, time.perf_counter()))
+        self._ensure_thread()
+        return future.result()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="microbatch", daemon=True)
+                self._thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            pending = [self._queue.get()]
+            size = len(pending[0][0])
+            deadline = pending[0][2] + self.max_wait
+            while size < self.max_items:
+                remaining = deadline - time.perf_counter()
+                try:
+                    nxt = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                pending.append(nxt)
+                size += len(nxt[0])
+            self._dispatch(pending, size)
+
+    def _dispatch(self, pending: List[Tuple[List[Any], Future, float]], size: int) -> None:
+        now = time.perf_counter()
+        for _, _, queued in pending:
+            self.queue_wait_ms.observe((now - queued) * 1000)
+        self.batch_size.observe(size)
+        try:
+            out = np.asarray(self.fn([item for items, _, _ in pending for item in items]))
+        except BaseException as exc:
+            for _, future, _ in pending:
+                future.set_exception(exc)
+            return
+        offset = 0
+        for items, future, _ in pending:
+            future.set_result(out[offset:offset + len(items)])
+            offset += len(items)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"batch_size": self.batch_size.snapshot(), "queue_wait_ms": self.queue_wait_ms.snapshot()}
+
+    def reset_stats(self) -> None:
+        self.batch_size.reset()
+        self.queue_wait_ms.reset()
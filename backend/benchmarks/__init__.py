@@ -0,0 +1,5 @@
+"""Benchmarks and accuracy reports for the analysis pipeline.
+
+Scripts are run from the repository root, e.g.
+``python -m backend.benchmarks.cross_encoder_pruning``.
+"""
@@ -0,0 +1,142 @@
+"""Accuracy regression check of an inference backend against fp32 PyTorch.
+
+Usage::
+
+    python -m backend.benchmarks.backend_accuracy --backend torch-int8
+    python -m backend.benchmarks.backend_accuracy --backend onnx \\
+        --embedder-path models/embedder-int8 --cross-encoder-path models/cross-encoder-int8
+
+Both backends score the fixture corpus (plus optional synthetic pairs). The
+report gives embedding agreement, cross-encoder score drift, how often the
+best-supporting resume sentence changes, the largest change of the final
+0–100 score and the wall time of each backend. The exit status is 1 when the
+candidate falls outside the tolerances, so it can gate a model rollout.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .. import analyzer
+from ..inference import load_cross_encoder, load_embedder
+from .corpus import fixture_pairs, synthetic_pairs
+
+
+def _cross(model: Any, pairs: List[List[str]]) -> np.ndarray:
+    logits = np.asarray(model.predict(pairs), dtype=np.float64)
+    return 2 / (1 + np.exp(-logits)) - 1  # same [-1, 1] mapping as cross_encoder_match
+
+
+def _run(embedder: Any, cross: Any, pairs: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """Embeddings, cross scores and final scores for every pair, bypassing all caches."""
+    sentences = list(dict.fromkeys(s for pair in pairs for text in pair for s in analyzer.split_sents(text)))
+    start = time.perf_counter()
+    emb = np.asarray(embedder.encode(sentences, normalize_embeddings=True), dtype=np.float64)
+    encode_s = time.perf_counter() - start
+
+    cross_pairs = [[j, r] for resume, jd in pairs for j in analyzer.split_sents(jd) for r in analyzer.split_sents(resume)]
+    start = time.perf_counter()
+    cross_scores = _cross(cross, cross_pairs)
+    cross_s = time.perf_counter() - start
+
+    saved = analyzer.get_embedder, analyzer.get_cross_encoder, analyzer.encode_sentences
+    analyzer.get_embedder = lambda: embedder  # type: ignore[assignment]
+    analyzer.get_cross_encoder = lambda: cross  # type: ignore[assignment]
+    analyzer.encode_sentences = lambda s: embedder.encode(s, normalize_embeddings=True)  # type: ignore[assignment]
+    try:
+        scores = []
+        for resume, jd in pairs:
+            job_skills, resume_skills = analyzer.extract_skills(jd), analyzer.extract_skills(resume)
+            scores.append(analyzer.calculate_scores(job_skills, resume_skills, resume, jd)[0])
+    finally:
+        analyzer.get_embedder, analyzer.get_cross_encoder, analyzer.encode_sentences = saved
+    return {
+        "sentences": sentences,
+        "embeddings": emb,
+        "cross": cross_scores,
+        "scores": np.array(scores),
+        "encode_s": encode_s,
+        "cross_s": cross_s,
+    }
+
+
+def _best_match_agreement(ref: np.ndarray, cand: np.ndarray, pairs: List[Tuple[str, str]]) -> float:
+    agree = total = offset = 0
+    for resume, jd in pairs:
+        n_jd, n_res = len(analyzer.split_sents(jd)), len(analyzer.split_sents(resume))
+        size = n_jd * n_res
+        if size:
+            r = ref[offset:offset + size].reshape(n_jd, n_res).argmax(axis=1)
+            c = cand[offset:offset + size].reshape(n_jd, n_res).argmax(axis=1)
+            agree += int((r == c).sum())
+            total += n_jd
+        offset += size
+    return agree / (total or 1)
+
+
+def compare(
+    reference: Tuple[Any, Any],
+    candidate: Tuple[Any, Any],
+    pairs: List[Tuple[str, str]],
+    min_cosine: float = 0.98,
+    max_score_diff: float = 1.0,
+) -> Dict[str, Any]:
+    """Score ``pairs`` with both ``(embedder, cross_encoder)`` pairs and compare."""
+    ref, cand = _run(*reference, pairs), _run(*candidate, pairs)
+    cosine = (ref["embeddings"] * cand["embeddings"]).sum(axis=1)
+    score_diff = np.abs(ref["scores"] - cand["scores"])
+    report = {
+        "pairs": len(pairs),
+        "sentences": len(ref["sentences"]),
+        "embedding_min_cosine": round(float(cosine.min()), 5) if len(cosine) else 1.0,
+        "embedding_mean_cosine": round(float(cosine.mean()), 5) if len(cosine) else 1.0,
+        "cross_max_abs_diff": round(float(np.abs(ref["cross"] - cand["cross"]).max()), 5) if len(ref["cross"]) else 0.0,
+        "cross_best_match_agreement": round(_best_match_agreement(ref["cross"], cand["cross"], pairs), 4),
+        "score_max_abs_diff": round(float(score_diff.max()), 3) if len(score_diff) else 0.0,
+        "reference_seconds": {"encode": round(ref["encode_s"], 4), "cross": round(ref["cross_s"], 4)},
+        "candidate_seconds": {"encode": round(cand["encode_s"], 4), "cross": round(cand["cross_s"], 4)},
+    }
+    report["passed"] = (
+        report["embedding_min_cosine"] >= min_cosine and report["score_max_abs_diff"] <= max_score_diff
+    )
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default="torch-int8", help="candidate backend: torch-int8 or onnx")
+    parser.add_argument("--embedder-path", help="local candidate embedder directory")
+    parser.add_argument("--cross-encoder-path", help="local candidate cross-encoder directory")
+    parser.add_argument("--reference-embedder-path", help="local fp32 embedder directory (offline runs)")
+    parser.add_argument("--reference-cross-encoder-path", help="local fp32 cross-encoder directory (offline runs)")
+    parser.add_argument("--synthetic", type=int, default=0, help="also score synthetic resumes with N sentences")
+    parser.add_argument("--min-cosine", type=float, default=0.98)
+    parser.add_argument("--max-score-diff", type=float, default=1.0, help="points on the 0-100 score")
+    args = parser.parse_args()
+
+    reference = (
+        load_embedder(analyzer.EMBEDDER_MODEL, args.reference_embedder_path, "torch"),
+        load_cross_encoder(analyzer.CROSS_ENCODER_MODEL, args.reference_cross_encoder_path, "torch"),
+    )
+    candidate = (
+        load_embedder(analyzer.EMBEDDER_MODEL, args.embedder_path or args.reference_embedder_path, args.backend),
+        load_cross_encoder(
+            analyzer.CROSS_ENCODER_MODEL, args.cross_encoder_path or args.reference_cross_encoder_path, args.backend
+        ),
+    )
+    pairs = fixture_pairs()
+    if args.synthetic:
+        pairs += synthetic_pairs(args.synthetic)
+    report = compare(reference, candidate, pairs, args.min_cosine, args.max_score_diff)
+    report["backend"] = args.backend
+    print(json.dumps(report, indent=2))
+    raise SystemExit(0 if report["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
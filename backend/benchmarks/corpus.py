@@ -0,0 +1,112 @@
+"""Fixture and synthetic resume/JD corpora for benchmarks."""
+
+from __future__ import annotations
+
+import random
+from typing import List, Tuple
+
+RESUMES = [
+    """Jane Doe - Data Scientist
+Experience
+- Built churn prediction models in Python with pandas and scikit-learn, reducing churn by 12%.
+- Led a team of four analysts delivering weekly executive dashboards in SQL and Tableau.
+- Designed A/B testing framework used across three product lines.
+- Developed NLP pipeline for support ticket triage using spaCy and transformers.
+Education
+MSc Statistics, University of Colombo.
+Skills: Python, SQL, machine learning, statistics, data analysis, AWS.""",
+    """John Smith - Frontend Developer
+Experience
+- Developed a React and TypeScript design system adopted by 20 teams.
+- Created accessible UI components with HTML, CSS and JavaScript.
+- Managed migration from webpack to Vite, cutting build times by 60%.
+- Built end-to-end tests with Playwright and improved release confidence.
+Education
+BSc Computer Science.
+Skills: React, TypeScript, JavaScript, CSS, HTML, Node.js.""",
+    """Alex Perera - Backend Engineer
+Experience
+- Built REST and gRPC services in Python and FastAPI serving 2M requests per day.
+- Designed PostgreSQL schemas and tuned slow queries.
+- Led migration of services to Docker and Kubernetes on AWS.
+- Mentored junior engineers and ran architecture reviews.
+Education
+BEng Software Engineering.
+Skills: Python, SQL, Docker, AWS, node js, team leadership.""",
+]
+
+JOB_DESCRIPTIONS = [
+    """We are hiring a Senior Data Scientist.
+You will build machine learning models in Python and own experimentation.
+Strong SQL and statistics background required.
+Experience with NLP and deep learning is a plus.
+You will mentor junior team members and communicate results to leadership.""",
+    """Frontend Developer wanted.
+Must have strong React and TypeScript skills.
+Experience building component libraries and design systems.
+Good understanding of CSS, accessibility and web performance.
+Familiarity with testing frameworks such as Playwright or Cypress.""",
+    """Backend Developer (Python).
+Design and build scalable APIs using Python.
+Experience with Docker, AWS and relational databases like PostgreSQL.
+Knowledge of message queues and caching is a plus.
+Leadership experience and mentoring are valued.""",
+]
+
+_VERBS = ["Built", "Led", "Designed", "Developed", "Managed", "Created", "Improved", "Owned"]
+_OBJECTS = [
+    "a data pipeline", "REST APIs", "a React dashboard", "ML models", "CI/CD workflows",
+    "the billing service", "Docker images", "SQL reports", "an onboarding flow", "monitoring alerts",
+]
+_TAILS = [
+    "in Python", "with TypeScript", "on AWS", "using pandas and numpy", "for 3 product teams",
+    "reducing latency by 40%", "serving 1M users", "with a team of five engineers", "under tight deadlines",
+]
+_REQUIREMENTS = [
+    "Experience with {skill} is required.", "You will own {skill} projects end to end.",
+    "Strong knowledge of {skill}.", "Nice to have: {skill}.", "Must have shipped {skill} in production.",
+]
+_SKILLS = [
+    "Python", "React", "TypeScript", "machine learning", "SQL", "Docker", "AWS",
+    "data analysis", "JavaScript", "node js", "statistics", "team leadership",
+]
+
+
+def synthetic_resume(sentences: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    lines = ["Experience"]
+    for _ in range(sentences):
+        lines.append(f"- {rng.choice(_VERBS)} {rng.choice(_OBJECTS)} {rng.choice(_TAILS)}.")
+    lines.append("Education")
+    lines.append("BSc Computer Science.")
+    return "\n".join(lines)
+
+
+def varied_resume(sentences: int, seed: int = 0) -> str:
+    """A resume mixing section headings, one-line bullets and long paragraph bullets."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(sentences):
+        kind = rng.random()
+        if kind < 0.15:
+            lines.append(rng.choice(["Experience", "Projects", "Skills", "Education", "Awards"]))
+        elif kind < 0.75:
+            lines.append(f"- {rng.choice(_VERBS)} {rng.choice(_OBJECTS)} {rng.choice(_TAILS)}.")
+        else:
+            clauses = [f"{rng.choice(_VERBS).lower()} {rng.choice(_OBJECTS)} {rng.choice(_TAILS)}" for _ in range(rng.randint(3, 7))]
+            lines.append("- " + clauses[0].capitalize() + ", " + ", then ".join(clauses[1:]) + ".")
+    return "\n".join(lines)
+
+
+def synthetic_job(sentences: int, seed: int = 0) -> str:
+    rng = random.Random(seed + 10_000)
+    return "\n".join(rng.choice(_REQUIREMENTS).format(skill=rng.choice(_SKILLS)) for _ in range(sentences))
+
+
+def fixture_pairs() -> List[Tuple[str, str]]:
+    """Every fixture resume paired with every fixture JD."""
+    return [(r, j) for r in RESUMES for j in JOB_DESCRIPTIONS]
+
+
+def synthetic_pairs(sentences: int, count: int = 3) -> List[Tuple[str, str]]:
+    return [(synthetic_resume(sentences, i), synthetic_job(sentences // 2 or 1, i)) for i in range(count)]
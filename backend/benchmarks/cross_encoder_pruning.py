@@ -0,0 +1,79 @@
+"""Compare top-k pruned cross-encoder scores against exhaustive scoring.
+
+Usage::
+
+    python -m backend.benchmarks.cross_encoder_pruning --k 1 3 5 10
+    python -m backend.benchmarks.cross_encoder_pruning --stub   # no model downloads
+
+For each ``k`` the report lists how many pairs were scored and how far the
+per-requirement best scores and the overall semantic score moved compared to
+scoring every JD x resume pair.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .. import analyzer
+from .corpus import fixture_pairs, synthetic_pairs
+
+
+def deviation_report(pairs: List[Tuple[str, str]], ks: List[int]) -> Dict[str, Dict[str, float]]:
+    report: Dict[str, Dict[str, float]] = {}
+    baselines = []
+    for resume, jd in pairs:
+        embed = analyzer.embedding_match(resume, jd)
+        full = analyzer.cross_encoder_match(resume, jd, top_k=0)
+        baselines.append((resume, jd, embed["similarity"], full))
+
+    for k in ks:
+        best_err: List[float] = []
+        semantic_err: List[float] = []
+        recovered = 0
+        total_reqs = 0
+        pruned_pairs = full_pairs = 0
+        for resume, jd, sims, full in baselines:
+            pruned = analyzer.cross_encoder_match(resume, jd, similarity=sims, top_k=k)
+            full_scores = np.array([s for _, _, s in full["support"]])
+            pruned_scores = np.array([s for _, _, s in pruned["support"]])
+            best_err.extend(np.abs(full_scores - pruned_scores).tolist())
+            semantic_err.append(abs(full["semantic"] - pruned["semantic"]))
+            recovered += int(np.isclose(full_scores, pruned_scores, atol=1e-6).sum())
+            total_reqs += len(full["support"])
+            pruned_pairs += pruned["pairs_scored"]
+            full_pairs += full["pairs_scored"]
+        report[str(k)] = {
+            "pairs_scored_ratio": round(pruned_pairs / (full_pairs or 1), 4),
+            "best_score_mean_abs_error": round(float(np.mean(best_err)) if best_err else 0.0, 4),
+            "best_score_max_abs_error": round(float(np.max(best_err)) if best_err else 0.0, 4),
+            "semantic_max_abs_error": round(float(np.max(semantic_err)) if semantic_err else 0.0, 4),
+            "best_score_recovered": round(recovered / (total_reqs or 1), 4),
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5, 10])
+    parser.add_argument("--synthetic", type=int, default=0, help="also score synthetic resumes with N sentences")
+    parser.add_argument("--stub", action="store_true", help="use deterministic stub models")
+    args = parser.parse_args()
+
+    if args.stub:
+        from .stubs import StubCrossEncoder, StubEmbedder
+
+        analyzer.get_embedder = lambda: StubEmbedder()  # type: ignore[assignment]
+        analyzer.get_cross_encoder = lambda: StubCrossEncoder()  # type: ignore[assignment]
+
+    pairs = fixture_pairs()
+    if args.synthetic:
+        pairs += synthetic_pairs(args.synthetic)
+    print(json.dumps(deviation_report(pairs, args.k), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""``GET /history`` on a heavy user: full listing vs. keyset pages.
+
+Usage::
+
+    python -m backend.benchmarks.history_pagination --rows 100000 --page-size 50
+
+Seeds ``--rows`` analyses for one user (plus 10% more for other users) into
+a scratch SQLite database, then times:
+
+- ``full_list``: the previous handler, every ORM row hydrated with its JSON
+  columns, then listed
+- ``first_page`` and ``deep_page`` (cursor halfway through): the keyset handler
+- ``offset_deep_page``: the same deep page with ``OFFSET``, for comparison
+- ``filtered_page``: the first page with ``role`` and ``min_score`` filters
+
+and reports the median of ``--repeat`` runs plus SQLite's query plan for the
+deep page.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict
+
+_SCRATCH = tempfile.mkdtemp(prefix="resumeboost-history-")
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_SCRATCH, "history.db")
+os.environ.setdefault("LIBRARY_DIR", os.path.join(_SCRATCH, "library"))
+
+from sqlalchemy import insert, text  # noqa: E402
+
+from .. import main as api  # noqa: E402
+from ..database import SessionLocal, engine  # noqa: E402
+from ..models import Analysis, User  # noqa: E402
+
+ROLES = ["Backend Engineer", "Data Analyst", "Product Manager", "ML Engineer"]
+
+
+def seed(rows: int) -> User:
+    db = SessionLocal()
+    users = [User(email=f"user{i}@example.com", hashed_password="unused") for i in range(11)]
+    db.add_all(users); db.commit()
+    start = datetime(2024, 1, 1)
+    skills = ["Python", "SQL", "AWS", "React", "Docker"]
+    tips = ["Quantify the impact of your projects.", "Mention cloud certifications."]
+    for user, count in [(users[0], rows)] + [(u, rows // 100) for u in users[1:]]:
+        batch = [
+            {
+                "user_id": user.id,
+                # two analyses per second, so cursors regularly land on ties
+                "created_at": start + timedelta(seconds=i // 2),
+                "job_title": ROLES[i % len(ROLES)],
+                "score": (i * 37) % 101,
+                "matched_skills": skills,
+                "improvement_areas": tips,
+                "highlights": tips,
+                "resume_preview": "Experienced engineer building data platforms. " * 3,
+            }
+            for i in range(count)
+        ]
+        db.execute(insert(Analysis), batch)
+    db.commit()
+    db.refresh(users[0])
+    db.close()
+    return users[0]
+
+
+def _median_ms(fn: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(times), 3), "items": len(result)}
+
+
+def run(rows: int, page_size: int, repeat: int) -> Dict[str, Any]:
+    start = time.perf_counter()
+    user = seed(rows)
+    report: Dict[str, Any] = {"rows": rows, "page_size": page_size, "seed_s": round(time.perf_counter() - start, 2)}
+    db = SessionLocal()
+    try:
+        def full_list():
+            items = db.query(Analysis).filter(Analysis.user_id == user.id).order_by(Analysis.created_at.desc()).all()
+            listed = [
+                {"id": str(a.id), "createdAt": a.created_at.isoformat(), "role": a.job_title, "score": a.score}
+                for a in items
+            ]
+            db.expunge_all()
+            return listed
+
+        def page(**params):
+            return api.get_history(limit=page_size, db=db, me=user, **{
+                "cursor": None, "min_score": None, "max_score": None, "role": None, **params,
+            })["items"]
+
+        middle = db.query(Analysis.created_at, Analysis.id).filter(Analysis.user_id == user.id).order_by(
+            Analysis.created_at.desc(), Analysis.id.desc()
+        ).offset(rows // 2).first()
+        cursor = api._encode_cursor(middle.created_at, middle.id)
+
+        def offset_page():
+            return (
+                db.query(Analysis.id, Analysis.created_at, Analysis.job_title, Analysis.score)
+                .filter(Analysis.user_id == user.id)
+                .order_by(Analysis.created_at.desc(), Analysis.id.desc())
+                .offset(rows // 2).limit(page_size).all()
+            )
+
+        report["full_list"] = _median_ms(full_list, repeat)
+        report["first_page"] = _median_ms(page, repeat)
+        report["deep_page"] = _median_ms(lambda: page(cursor=cursor), repeat)
+        report["offset_deep_page"] = _median_ms(offset_page, repeat)
+        report["filtered_page"] = _median_ms(lambda: page(role=ROLES[1], min_score=80), repeat)
+
+        created_at, last_id = api._decode_cursor(cursor)
+        with engine.connect() as conn:
+            plan = conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT id, created_at, job_title, score FROM analyses "
+                "WHERE user_id = :u AND created_at <= :c AND (created_at < :c OR id < :i) "
+                "ORDER BY created_at DESC, id DESC LIMIT :n"
+            ), {"u": user.id, "c": str(created_at), "i": last_id, "n": page_size + 1}).all()
+        report["deep_page_plan"] = [row[-1] for row in plan]
+    finally:
+        db.close()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows, args.page_size, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Throughput of fixed-size batches vs. length-bucketed, token-budgeted batches.
+
+Usage::
+
+    python -m backend.benchmarks.length_bucketing --resumes 20 --max-tokens 512 1024 2048
+    python -m backend.benchmarks.length_bucketing --stub   # no model downloads
+
+"fixed" calls ``encode`` / ``predict`` once with ``batch_size=32``, as the
+analyzer did before. "bucketed" goes through ``embed_bucketed`` /
+``predict_bucketed`` with each token budget. The resumes mix headings,
+one-line bullets and long paragraph bullets. Both modes must return the same
+scores. With ``--stub`` the models do work proportional to padded tokens,
+so the padding counts are exact and the timings are indicative.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from .. import analyzer, batching
+from .corpus import JOB_DESCRIPTIONS, RESUMES, varied_resume
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> Any:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def _padded(model: Any, fn: Callable[[], Any]) -> int:
+    cost = getattr(model, "cost", None)
+    if cost is None:
+        return 0
+    before = cost.padded_tokens
+    fn()
+    return cost.padded_tokens - before
+
+
+def run(sentences: List[str], pairs: List[List[str]], budgets: List[int], repeat: int) -> Dict[str, Dict]:
+    embedder, cross = analyzer.get_embedder(), analyzer.get_cross_encoder()
+    report: Dict[str, Dict] = {"inputs": {"sentences": len(sentences), "pairs": len(pairs)}}
+
+    def fixed_embed():
+        return np.asarray(embedder.encode(sentences, normalize_embeddings=True, batch_size=32))
+
+    def fixed_predict():
+        return np.asarray(cross.predict(pairs, batch_size=32))
+
+    embed_s, embed_ref = _time(fixed_embed, repeat)
+    cross_s, cross_ref = _time(fixed_predict, repeat)
+    report["fixed"] = {
+        "embed_sentences_per_s": round(len(sentences) / embed_s, 1),
+        "cross_pairs_per_s": round(len(pairs) / cross_s, 1),
+        "embed_padded_tokens": _padded(embedder, fixed_embed),
+        "cross_padded_tokens": _padded(cross, fixed_predict),
+    }
+
+    for budget in budgets:
+        batching.INFERENCE_MAX_BATCH_TOKENS = budget
+        analyzer.INFERENCE_MAX_BATCH_TOKENS = budget
+
+        def bucketed_embed():
+            return analyzer.embed_bucketed(sentences)
+
+        def bucketed_predict():
+            return analyzer.predict_bucketed(pairs)
+
+        b_embed_s, embed_out = _time(bucketed_embed, repeat)
+        b_cross_s, cross_out = _time(bucketed_predict, repeat)
+        assert np.allclose(embed_out, embed_ref, atol=1e-5), "bucketing changed the embeddings"
+        assert np.allclose(cross_out, cross_ref, atol=1e-5), "bucketing changed the cross-encoder scores"
+        report[f"bucketed_{budget}"] = {
+            "embed_sentences_per_s": round(len(sentences) / b_embed_s, 1),
+            "cross_pairs_per_s": round(len(pairs) / b_cross_s, 1),
+            "embed_speedup": round(embed_s / b_embed_s, 2),
+            "cross_speedup": round(cross_s / b_cross_s, 2),
+            "embed_padded_tokens": _padded(embedder, bucketed_embed),
+            "cross_padded_tokens": _padded(cross, bucketed_predict),
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=20, help="varied resumes added to the fixtures")
+    parser.add_argument("--sentences", type=int, default=40, help="lines per varied resume")
+    parser.add_argument("--max-tokens", type=int, nargs="+", default=[512, 1024, 2048])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--stub", action="store_true", help="use stub models with padding-proportional cost")
+    args = parser.parse_args()
+
+    if args.stub:
+        from .stubs import PaddedStubCrossEncoder, PaddedStubEmbedder
+
+        embedder, cross = PaddedStubEmbedder(), PaddedStubCrossEncoder()
+        analyzer.get_embedder = lambda: embedder  # type: ignore[assignment]
+        analyzer.get_cross_encoder = lambda: cross  # type: ignore[assignment]
+
+    resumes = RESUMES + [varied_resume(args.sentences, seed) for seed in range(args.resumes)]
+    sentences = list(dict.fromkeys(s for r in resumes for s in analyzer.split_sents(r)))
+    pairs = [
+        [j, r]
+        for resume, jd in zip(resumes, JOB_DESCRIPTIONS * len(resumes))
+        for j in analyzer.split_sents(jd)
+        for r in analyzer.split_sents(resume)
+    ]
+    print(json.dumps(run(sentences, pairs, args.max_tokens, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
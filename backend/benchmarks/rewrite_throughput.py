@@ -0,0 +1,76 @@
+"""Paraphrasing throughput: one generate() per bullet vs. padded batches.
+
+Usage::
+
+    python -m backend.benchmarks.rewrite_throughput --bullets 40 --batch-size 4 8 16
+    python -m backend.benchmarks.rewrite_throughput --stub   # no model download
+
+"single" calls ``rewrite_bullet`` once per bullet, as ``/rewrite`` does for
+a client that posts bullets one by one. "batched_N" sends all of them to
+``rewrite_bullets`` with ``batch_size=N``, as ``/rewrite/batch`` does.
+"cached" repeats the largest batch with a warm cache. The cache is cleared
+before every other run. With ``--stub`` each decoding step pays a fixed
+overhead plus work proportional to the padded batch, so the timings are
+indicative only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from .. import rewrite
+from .corpus import synthetic_resume
+
+
+def bullets(count: int) -> List[str]:
+    lines: Dict[str, None] = {}
+    seed = 0
+    while len(lines) < count:
+        lines.update(dict.fromkeys(l for l in synthetic_resume(20, seed).splitlines() if l.startswith("- ")))
+        seed += 1
+    return list(lines)[:count]
+
+
+def _rate(fn: Callable[[], Any], count: int, clear: bool = True) -> Dict[str, float]:
+    if clear:
+        rewrite.rewrite_cache.clear()
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+    return {"seconds": round(seconds, 3), "bullets_per_s": round(count / seconds, 2)}
+
+
+def run(items: List[str], batch_sizes: List[int]) -> Dict[str, Any]:
+    report: Dict[str, Any] = {"bullets": len(items)}
+    report["single"] = _rate(lambda: [rewrite.rewrite_bullet(b) for b in items], len(items))
+    single = report["single"]["bullets_per_s"]
+    for size in batch_sizes:
+        row = _rate(lambda: rewrite.rewrite_bullets(items, batch_size=size), len(items))
+        row["speedup"] = round(row["bullets_per_s"] / single, 2)
+        report[f"batched_{size}"] = row
+    report["cached"] = _rate(lambda: rewrite.rewrite_bullets(items), len(items), clear=False)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bullets", type=int, default=40)
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--stub", action="store_true", help="use a stub seq2seq model")
+    args = parser.parse_args()
+
+    if args.stub:
+        from .stubs import StubSeq2SeqModel, StubSeq2SeqTokenizer
+
+        model = (StubSeq2SeqTokenizer(), StubSeq2SeqModel())
+        rewrite.get_model = lambda: model  # type: ignore[assignment]
+    else:
+        rewrite.get_model()
+    print(json.dumps(run(bullets(args.bullets), args.batch_size), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""Benchmark suite for the analysis pipeline with JSON output comparable across commits.
+
+Usage::
+
+    python -m backend.benchmarks.run --stub --output bench.json
+    python -m backend.benchmarks.run --stub --baseline bench.json --max-regression 1.25
+    python -m backend.benchmarks.run --sizes 20 100 --only calculate_scores api_analyze
+
+Each case is timed on the fixture corpus (3 resumes x 3 JDs) and on
+synthetic resumes of every ``--sizes`` sentence count:
+
+- ``split_sents``, ``extract_skills`` (resume and JD, as ``/analyze`` does)
+- ``embedding_match`` and ``cross_encoder_match`` (given the bi-encoder matrix)
+- ``calculate_scores`` (every stage after skill extraction)
+- ``api_analyze``: ``POST /analyze`` through an in-process ASGI client,
+  including auth, the executor, the database write and the library task
+
+The embedding, JD-profile, grammar and result caches are cleared before
+every timed run, so the numbers measure computation rather than cache hits.
+``--stub`` swaps in the deterministic stub models, which is what CI should
+compare; without it the real models are loaded once before timing starts.
+
+With ``--baseline`` the median of every case is compared against an
+earlier report. The exit status is 1 when any case is slower by more than
+``--max-regression``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# The /analyze case must not touch the developer's database or library, and
+# a shared result store would turn repeats into cache hits.
+_SCRATCH = tempfile.mkdtemp(prefix="resumeboost-bench-")
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(_SCRATCH, "bench.db"))
+os.environ.setdefault("LIBRARY_DIR", os.path.join(_SCRATCH, "library"))
+os.environ["RESULT_CACHE_STORE"] = "none"
+
+from .. import analyzer  # noqa: E402
+from ..embedding_cache import get_embedding_cache  # noqa: E402
+from ..grammar import grammar_cache  # noqa: E402
+from ..result_cache import get_result_cache  # noqa: E402
+from .corpus import JOB_DESCRIPTIONS, RESUMES, synthetic_job, synthetic_resume  # noqa: E402
+
+CASES = ("split_sents", "extract_skills", "embedding_match", "cross_encoder_match", "calculate_scores", "api_analyze")
+
+Pair = Tuple[str, str]
+
+
+def corpora(sizes: List[int]) -> Dict[str, List[Pair]]:
+    """Named lists of ``(resume, jd)`` pairs."""
+    named = {"fixture": [(r, j) for r in RESUMES for j in JOB_DESCRIPTIONS]}
+    for size in sizes:
+        named[f"synthetic_{size}"] = [
+            (synthetic_resume(size, seed), synthetic_job(max(size // 4, 3), seed)) for seed in range(3)
+        ]
+    return named
+
+
+def clear_caches() -> None:
+    get_embedding_cache().clear()
+    analyzer.jd_profile_cache.clear()
+    analyzer.resume_snapshots.clear()
+    grammar_cache.clear()
+    get_result_cache().clear()
+
+
+def measure(
+    fn: Callable[..., Any], setup: Callable[[], tuple], repeat: int, warmup: int = 1
+) -> Dict[str, float]:
+    """Time ``fn(*setup())`` ``repeat`` times after ``warmup`` untimed calls; setup is not timed."""
+    for _ in range(warmup):
+        fn(*setup())
+    samples = []
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "repeat": repeat,
+        "min_ms": round(samples[0], 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(0.95 * len(samples)))], 3),
+        "stdev_ms": round(statistics.stdev(samples), 3) if len(samples) > 1 else 0.0,
+    }
+
+
+def _over_pairs(fn: Callable[[Any], Any]) -> Callable[[List[Any]], None]:
+    def run(items: List[Any]) -> None:
+        for item in items:
+            fn(item)
+    return run
+
+
+def _cleared(make: Callable[[], Any]) -> Callable[[], tuple]:
+    def setup() -> tuple:
+        clear_caches()
+        return (make(),)
+    return setup
+
+
+def _similarity_contexts(pairs: List[Pair]) -> List[analyzer.AnalysisContext]:
+    contexts = []
+    for resume, jd in pairs:
+        ctx = analyzer.AnalysisContext(resume, jd)
+        ctx.similarity  # computed here so the cross-encoder case times only the cross-encoder
+        contexts.append(ctx)
+    return contexts
+
+
+def _scoring_inputs(pairs: List[Pair]) -> List[Tuple[List[str], List[str], Pair]]:
+    return [(analyzer.extract_skills(jd), analyzer.extract_skills(resume), (resume, jd)) for resume, jd in pairs]
+
+
+class ApiClient:
+    """``POST /analyze`` in-process, authenticated as a throwaway user."""
+
+    def __init__(self) -> None:
+        import httpx
+
+        from ..auth import get_current_user
+        from ..database import SessionLocal
+        from ..main import app
+        from ..models import User
+
+        db = SessionLocal()
+        user = User(email=f"bench-{time.time_ns()}@example.com", hashed_password="unused")
+        db.add(user); db.commit(); db.refresh(user)
+        db.close()
+        app.dependency_overrides[get_current_user] = lambda: user
+        self.loop = asyncio.new_event_loop()
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+
+    def analyze(self, pair: Pair) -> None:
+        resume, jd = pair
+        resp = self.loop.run_until_complete(
+            self.client.post("/analyze", json={"resume_text": resume, "job_description": jd})
+        )
+        resp.raise_for_status()
+
+    def close(self) -> None:
+        self.loop.run_until_complete(self.client.aclose())
+        self.loop.close()
+
+
+def run_suite(sizes: List[int], repeat: int, only: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    wanted = set(only or CASES)
+    api = ApiClient() if "api_analyze" in wanted else None
+    results = []
+    try:
+        for corpus, pairs in corpora(sizes).items():
+            cases: Dict[str, Tuple[Callable[..., Any], Callable[[], tuple]]] = {
+                "split_sents": (
+                    _over_pairs(lambda p: (analyzer.split_sents(p[0]), analyzer.split_sents(p[1]))),
+                    _cleared(lambda: pairs),
+                ),
+                "extract_skills": (
+                    _over_pairs(lambda p: analyzer.parse_for_skills(list(p))),
+                    _cleared(lambda: pairs),
+                ),
+                "embedding_match": (
+                    _over_pairs(lambda p: analyzer.embedding_match(*p)),
+                    _cleared(lambda: pairs),
+                ),
+                "cross_encoder_match": (
+                    _over_pairs(lambda c: analyzer.cross_encoder_match(
+                        c.resume_text, c.job_text, similarity=c.similarity, ctx=c
+                    )),
+                    _cleared(lambda: _similarity_contexts(pairs)),
+                ),
+                "calculate_scores": (
+                    _over_pairs(lambda item: analyzer.calculate_scores(item[0], item[1], *item[2])),
+                    _cleared(lambda: _scoring_inputs(pairs)),
+                ),
+            }
+            if api is not None:
+                cases["api_analyze"] = (_over_pairs(api.analyze), _cleared(lambda: pairs))
+            sentences = sum(len(analyzer.split_sents(r)) for r, _ in pairs)
+            for name in CASES:
+                if name not in wanted or name not in cases:
+                    continue
+                stats = measure(*cases[name], repeat=repeat)
+                results.append({"case": name, "corpus": corpus, "pairs": len(pairs),
+                                "resume_sentences": sentences, **stats})
+    finally:
+        if api is not None:
+            api.close()
+    return results
+
+
+def environment(stub: bool) -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "models": "stub" if stub else analyzer.model_fingerprint(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def compare(current: List[Dict[str, Any]], baseline: List[Dict[str, Any]], max_regression: float) -> List[Dict]:
+    """Median ratio (current / baseline) for every case present in both reports."""
+    before = {(r["case"], r["corpus"]): r["median_ms"] for r in baseline}
+    rows = []
+    for r in current:
+        old = before.get((r["case"], r["corpus"]))
+        if not old:
+            continue
+        ratio = r["median_ms"] / old
+        rows.append({"case": r["case"], "corpus": r["corpus"], "baseline_ms": old,
+                     "median_ms": r["median_ms"], "ratio": round(ratio, 3), "regressed": ratio > max_regression})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stub", action="store_true", help="use the deterministic stub models")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[20, 100], help="synthetic resume sentence counts")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", choices=CASES, help="run only these cases")
+    parser.add_argument("--output", help="write the JSON report here as well as to stdout")
+    parser.add_argument("--baseline", help="earlier JSON report to compare medians against")
+    parser.add_argument("--max-regression", type=float, default=1.25, help="allowed median ratio vs. baseline")
+    args = parser.parse_args()
+
+    if args.stub:
+        from .stubs import StubCrossEncoder, StubEmbedder
+
+        embedder, cross = StubEmbedder(), StubCrossEncoder()
+        analyzer.get_embedder = lambda: embedder  # type: ignore[assignment]
+        analyzer.get_cross_encoder = lambda: cross  # type: ignore[assignment]
+    else:
+        analyzer.get_embedder(), analyzer.get_cross_encoder()
+    analyzer.get_nlp()
+
+    report: Dict[str, Any] = {
+        "environment": environment(args.stub),
+        "results": run_suite(args.sizes, args.repeat, args.only),
+    }
+    passed = True
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["comparison"] = compare(report["results"], json.load(f)["results"], args.max_regression)
+        passed = not any(row["regressed"] for row in report["comparison"])
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    raise SystemExit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
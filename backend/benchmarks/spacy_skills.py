@@ -0,0 +1,61 @@
+"""Docs/sec for skill extraction: full spaCy pipeline vs. batched EntityRuler only.
+
+Usage::
+
+    python -m backend.benchmarks.spacy_skills --docs 200 --sentences 150 --n-process 1 2
+
+"before" runs every pipe on one text at a time, as ``extract_skills`` used
+to; "after" is ``parse_for_skills`` (``nlp.pipe`` with unused pipes disabled).
+Both must extract the same skills.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Dict, List
+
+from .. import analyzer
+from .corpus import RESUMES, synthetic_resume
+
+
+def _skills(doc) -> List[str]:
+    return analyzer.extract_skills(doc.text, doc)
+
+
+def run(texts: List[str], batch_size: int, n_process: int) -> Dict[str, float]:
+    nlp = analyzer.get_nlp()
+    start = time.perf_counter()
+    before = [_skills(nlp(t)) for t in texts]
+    before_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    after = [_skills(d) for d in analyzer.parse_for_skills(texts, batch_size=batch_size, n_process=n_process)]
+    after_sec = time.perf_counter() - start
+
+    assert before == after, "batched extraction changed the extracted skills"
+    return {
+        "pipes": ",".join(nlp.pipe_names),
+        "docs": len(texts),
+        "batch_size": batch_size,
+        "n_process": n_process,
+        "before_docs_per_sec": round(len(texts) / before_sec, 1),
+        "after_docs_per_sec": round(len(texts) / after_sec, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--sentences", type=int, default=150, help="sentences per synthetic resume")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--n-process", type=int, nargs="+", default=[1])
+    args = parser.parse_args()
+
+    texts = [synthetic_resume(args.sentences, seed=i) + "\n" + RESUMES[i % len(RESUMES)] for i in range(args.docs)]
+    print(json.dumps([run(texts, args.batch_size, n) for n in args.n_process], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Deterministic stand-ins for the transformer models.
+
+They let benchmarks run without downloads while keeping realistic array
+shapes and rankings driven by word overlap.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+from typing import List, Sequence
+
+import numpy as np
+
+_WORD = re.compile(r"\w+")
+
+
+def _tokens(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+class StubEmbedder:
+    """Hashed bag-of-words embeddings with the MiniLM output size."""
+
+    dim = 384
+
+    def encode(self, sentences: Sequence[str], normalize_embeddings: bool = True, batch_size: int = 32, **_kw) -> np.ndarray:
+        out = np.zeros((len(sentences), self.dim), dtype=np.float32)
+        for i, sentence in enumerate(sentences):
+            for tok in _tokens(sentence):
+                bucket = int(hashlib.md5(tok.encode()).hexdigest()[:8], 16) % self.dim
+                out[i, bucket] += 1.0
+        if normalize_embeddings:
+            norms = np.linalg.norm(out, axis=1, keepdims=True)
+            out /= np.where(norms == 0, 1.0, norms)
+        return out
+
+
+class StubCrossEncoder:
+    """Logits from the Jaccard overlap of the two sentences."""
+
+    def predict(self, pairs: Sequence[Sequence[str]], batch_size: int = 32, **_kw) -> np.ndarray:
+        scores = np.empty(len(pairs), dtype=np.float32)
+        for i, (a, b) in enumerate(pairs):
+            ta, tb = set(_tokens(a)), set(_tokens(b))
+            overlap = len(ta & tb) / (len(ta | tb) or 1)
+            scores[i] = 10 * overlap - 4
+        return scores
+
+
+class PaddingCost:
+    """Compute proportional to padded tokens, like a transformer forward pass."""
+
+    def __init__(self, dim: int = 256) -> None:
+        self.weights = np.random.default_rng(0).standard_normal((dim, dim)).astype(np.float32)
+        self.padded_tokens = 0
+
+    def __call__(self, texts: Sequence[str]) -> None:
+        width = max(len(_tokens(t)) + 2 for t in texts)
+        self.padded_tokens += width * len(texts)
+        np.tanh(np.ones((len(texts), width, len(self.weights)), dtype=np.float32) @ self.weights)
+
+
+class PaddedStubEmbedder(StubEmbedder):
+    """StubEmbedder that pays for padding, batching like ``SentenceTransformer.encode``
+    (sorted by length, then fixed-size chunks)."""
+
+    def __init__(self) -> None:
+        self.cost = PaddingCost()
+
+    def encode(self, sentences: Sequence[str], normalize_embeddings: bool = True, batch_size: int = 32, **_kw) -> np.ndarray:
+        order = sorted(range(len(sentences)), key=lambda i: -len(sentences[i]))
+        for start in range(0, len(order), batch_size):
+            self.cost([sentences[i] for i in order[start:start + batch_size]])
+        return super().encode(sentences, normalize_embeddings)
+
+
+class PaddedStubCrossEncoder(StubCrossEncoder):
+    """StubCrossEncoder that pays for padding, batching like ``CrossEncoder.predict``
+    (input order, fixed-size chunks)."""
+
+    def __init__(self) -> None:
+        self.cost = PaddingCost()
+
+    def predict(self, pairs: Sequence[Sequence[str]], batch_size: int = 32, **_kw) -> np.ndarray:
+        for start in range(0, len(pairs), batch_size):
+            self.cost([a + " " + b for a, b in pairs[start:start + batch_size]])
+        return super().predict(pairs)
+
+
+class StubSeq2SeqTokenizer:
+    """Word-level tokenizer with the ``__call__`` / ``batch_decode`` surface of a Hugging Face tokenizer."""
+
+    def __init__(self) -> None:
+        self.words = ["<pad>"]
+        self._ids: dict = {}
+
+    def _id(self, word: str) -> int:
+        if word not in self._ids:
+            self._ids[word] = len(self.words)
+            self.words.append(word)
+        return self._ids[word]
+
+    def __call__(self, texts: Sequence[str], padding: bool = True, **_kw) -> dict:
+        rows = [[self._id(w) for w in _tokens(t)] + [0] for t in texts]
+        width = max(len(r) for r in rows)
+        ids = np.zeros((len(rows), width), dtype=np.int64)
+        for i, row in enumerate(rows):
+            ids[i, :len(row)] = row
+        return {"input_ids": ids, "attention_mask": (ids > 0).astype(np.int64)}
+
+    def batch_decode(self, outputs: Sequence[Sequence[int]], skip_special_tokens: bool = True) -> List[str]:
+        return [" ".join(self.words[i] for i in row if i > 0) for row in outputs]
+
+
+class StubSeq2SeqModel:
+    """Beam-search stand-in: every decoding step costs a fixed overhead plus
+    work proportional to (inputs x beams x padded length), like ``generate``."""
+
+    def __init__(self, step_overhead: float = 0.0005) -> None:
+        self.cost = PaddingCost(dim=64)
+        self.step_overhead = step_overhead
+        self.calls = 0
+
+    def generate(self, input_ids: np.ndarray, attention_mask: np.ndarray, num_beams: int = 1,
+                 num_return_sequences: int = 1, max_length: int = 64, **_kw) -> List[np.ndarray]:
+        self.calls += 1
+        batch, width = input_ids.shape
+        for _ in range(min(width, max_length)):
+            time.sleep(self.step_overhead)
+            np.tanh(np.ones((batch * num_beams, width, 64), dtype=np.float32) @ self.cost.weights)
+        self.cost.padded_tokens += batch * num_beams * width
+        out = []
+        for row, mask in zip(input_ids, attention_mask):
+            words = row[mask > 0][1:]  # drop "paraphrase"
+            for r in range(num_return_sequences):
+                out.append(np.roll(words, r))
+        return out
+
+
+class StubSummarizer:
+    """Summarization-pipeline stand-in: the first ``max_length`` words of each text."""
+
+    def __call__(self, texts, max_length: int = 130, **_kw) -> List[dict]:
+        texts = [texts] if isinstance(texts, str) else texts
+        return [{"summary_text": " ".join(_tokens(t)[:max_length])} for t in texts]
+
+
+def model_weights(megabytes: float) -> np.ndarray:
+    """A written float32 buffer of the given size, so a stub's "parameters" count towards RSS."""
+    return np.ones(int(megabytes * 2**20) // 4, dtype=np.float32)
@@ -0,0 +1,153 @@
+"""Memory of N API workers with per-worker models vs. one shared model server.
+
+Usage::
+
+    python -m backend.benchmarks.worker_memory --workers 1 4
+    python -m backend.benchmarks.worker_memory --stub --stub-scale 0.25   # no model download
+
+Every worker is a separate process that imports ``backend.main`` (as a
+gunicorn worker does), loads spaCy and runs one call through the embedder,
+cross-encoder, T5 and the summarizer. In ``in_process`` mode each worker
+loads the models itself; in ``model_server`` mode one
+``backend.model_server`` process owns them and the workers get
+``MODEL_SERVER_SOCKET``. Once every process is ready, RSS and PSS are read
+from ``/proc/<pid>/smaps_rollup`` (Linux only). PSS splits shared pages
+between the processes that map them, so ``pss_mb`` sums to what the group
+really uses.
+
+With ``--stub`` the models are the deterministic stubs, each holding a
+written buffer the size of the real model's fp32 weights times
+``--stub-scale``: MiniLM 90 MB, cross-encoder 90 MB, t5-small 240 MB and
+the default BART summarizer 1200 MB.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict
+
+WEIGHTS_MB = {"embedder": 90, "cross_encoder": 90, "rewrite": 240, "summary": 1200}
+MODELS = ["spacy", "embedder", "cross_encoder", "rewrite", "summary"]
+SERVER_MODELS = [m for m in MODELS if m != "spacy"]
+
+
+def _install_stubs(scale: float) -> None:
+    from .. import analyzer, rewrite, summary
+    from .stubs import (
+        StubCrossEncoder, StubEmbedder, StubSeq2SeqModel, StubSeq2SeqTokenizer, StubSummarizer, model_weights,
+    )
+
+    def weighted(stub: Any, name: str) -> Any:
+        stub.weights = model_weights(WEIGHTS_MB[name] * scale)
+        return stub
+
+    analyzer.load_embedder = lambda *a, **k: weighted(StubEmbedder(), "embedder")
+    analyzer.load_cross_encoder = lambda *a, **k: weighted(StubCrossEncoder(), "cross_encoder")
+    rewrite._load_model = lambda: (StubSeq2SeqTokenizer(), weighted(StubSeq2SeqModel(step_overhead=0), "rewrite"))
+    summary.pipeline = lambda *a, **k: weighted(StubSummarizer(), "summary")
+
+
+def child(role: str, socket_path: str, stub: bool, scale: float) -> None:
+    """Load everything a worker (or the model server) holds, say ``ready``, then idle until stdin closes."""
+    if stub:
+        _install_stubs(scale)
+    if role == "server":
+        import threading
+
+        from ..model_server import create_server
+
+        server = create_server(socket_path, SERVER_MODELS)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    else:
+        from .. import main  # noqa: F401  - what a gunicorn worker imports
+        from ..warmup import WARMUPS
+
+        for name in MODELS:
+            WARMUPS[name]()
+    print("ready", flush=True)
+    sys.stdin.readline()
+
+
+def memory(pid: int) -> Dict[str, float]:
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as fh:
+        for line in fh:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:"):
+                fields[parts[0][:-1].lower() + "_mb"] = round(int(parts[1]) / 1024, 1)
+    return fields
+
+
+def _spawn(role: str, env: Dict[str, str], args: argparse.Namespace, socket_path: str) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "backend.benchmarks.worker_memory", "--child", role, "--socket", socket_path]
+    if args.stub:
+        cmd += ["--stub", "--stub-scale", str(args.stub_scale)]
+    return subprocess.Popen(cmd, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+
+
+def _wait_ready(proc: subprocess.Popen) -> None:
+    if proc.stdout.readline().strip() != "ready":
+        raise RuntimeError(f"worker {proc.pid} exited with {proc.wait()}")
+
+
+def measure(mode: str, workers: int, args: argparse.Namespace) -> Dict[str, Any]:
+    scratch = tempfile.mkdtemp(prefix="resumeboost-mem-")
+    socket_path = os.path.join(scratch, "models.sock")
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": "sqlite:///" + os.path.join(scratch, "bench.db"),
+        "LIBRARY_DIR": os.path.join(scratch, "library"),
+        "RESULT_CACHE_STORE": "none",
+    })
+    env.pop("MODEL_SERVER_SOCKET", None)
+    procs: Dict[str, subprocess.Popen] = {}
+    try:
+        if mode == "model_server":
+            procs["server"] = _spawn("server", env, args, socket_path)
+            _wait_ready(procs["server"])
+            env["MODEL_SERVER_SOCKET"] = socket_path
+        start = time.perf_counter()
+        for i in range(workers):  # one at a time: concurrent create_all races on SQLite
+            procs[f"worker_{i}"] = _spawn("worker", env, args, socket_path)
+            _wait_ready(procs[f"worker_{i}"])
+        ready_seconds = time.perf_counter() - start
+        per_process = {name: memory(proc.pid) for name, proc in procs.items()}
+    finally:
+        for proc in procs.values():
+            proc.stdin.close()
+        for proc in procs.values():
+            proc.wait()
+    return {
+        "mode": mode,
+        "workers": workers,
+        "workers_ready_s": round(ready_seconds, 2),
+        "rss_mb": round(sum(p["rss_mb"] for p in per_process.values()), 1),
+        "pss_mb": round(sum(p["pss_mb"] for p in per_process.values()), 1),
+        "processes": per_process,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--stub", action="store_true", help="use stub models with weight-sized buffers")
+    parser.add_argument("--stub-scale", type=float, default=1.0, help="fraction of the real weight sizes")
+    parser.add_argument("--child", choices=["worker", "server"], help=argparse.SUPPRESS)
+    parser.add_argument("--socket", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.socket, args.stub, args.stub_scale)
+        return
+    report = [measure(mode, n, args) for mode in ("in_process", "model_server") for n in args.workers]
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
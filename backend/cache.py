@@ -0,0 +1,88 @@
+"""Small in-process caches shared by the analysis pipeline."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def content_key(*parts: Optional[str]) -> str:
+    """Return a stable hash for a tuple of strings (``None`` allowed)."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(b"\x00" if part is None else part.encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+class LRUCache:
+    """Thread-safe LRU mapping with hit/miss counters and an optional size estimate."""
+
+    def __init__(self, maxsize: int, sizeof: Optional[Callable[[Any], int]] = None) -> None:
+        self.maxsize = maxsize
+        self._sizeof = sizeof
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if key in self._data:
+                self._bytes -= self._size(self._data.pop(key))
+            self._data[key] = value
+            self._bytes += self._size(value)
+            while len(self._data) > self.maxsize:
+                _, old = self._data.popitem(last=False)
+                self._bytes -= self._size(old)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            value = self._data.pop(key)
+            self._bytes -= self._size(value)
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def _size(self, value: Any) -> int:
+        return self._sizeof(value) if self._sizeof else 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._data),
+            "maxsize": self.maxsize,
+            "bytes": self._bytes,
+        }
@@ -0,0 +1,52 @@
+"""Time budgets that let the analysis pipeline degrade instead of timing out."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+
+class Deadline:
+    """Absolute point in time by which an analysis must be finished.
+
+    ``reserve`` seconds are held back for the work after the model stages
+    (result assembly, the database write), so :meth:`remaining` reaches zero
+    slightly before the caller's timeout does.
+    """
+
+    def __init__(self, seconds: float, reserve: float = 0.0) -> None:
+        self.total = seconds
+        self.expires = time.monotonic() + seconds - reserve
+
+    def remaining(self) -> float:
+        return max(self.expires - time.monotonic(), 0.0)
+
+    def allowance(self, share: float) -> float:
+        """Seconds a stage may spend: its ``share`` of the total, capped by what is left."""
+        return min(self.remaining(), share * self.total)
+
+
+class CostModel:
+    """Running estimate of one stage's seconds per item (sentence or pair).
+
+    The estimate is an exponentially weighted mean of observed calls, seeded
+    with ``per_item``, so it follows the hardware and load it runs on.
+    """
+
+    def __init__(self, per_item: float, alpha: float = 0.2) -> None:
+        self.per_item = per_item
+        self.alpha = alpha
+        self._lock = threading.Lock()
+
+    def estimate(self, items: int) -> float:
+        return items * self.per_item
+
+    def fit(self, seconds: float) -> int:
+        """Number of items that should finish within ``seconds``."""
+        return int(seconds / self.per_item) if self.per_item > 0 else 1 << 30
+
+    def observe(self, items: int, seconds: float) -> None:
+        if items <= 0:
+            return
+        with self._lock:
+            self.per_item += self.alpha * (seconds / items - self.per_item)
@@ -0,0 +1,214 @@
+"""Content-addressed sentence embedding cache with memory and disk tiers."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Set
+
+import numpy as np
+
+try:  # pragma: no cover - not available on Windows
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+from .cache import LRUCache, content_key
+
+# ----- Config -----
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "50000"))
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR") or None
+EMBEDDING_CACHE_DTYPE = os.getenv("EMBEDDING_CACHE_DTYPE", "float32")
+
+
+def normalize_sentence(sentence: str) -> str:
+    """Collapse whitespace so trivially different sentences share a key."""
+    return " ".join(sentence.split())
+
+
+def sentence_key(model_name: str, sentence: str) -> str:
+    return content_key(model_name, normalize_sentence(sentence))
+
+
+class DiskEmbeddingStore:
+    """Append-only on-disk tier: a memory-mapped matrix plus a key index.
+
+    ``vectors.bin`` holds one row per sentence in ``dtype``; ``index.tsv`` maps
+    each key to its row. Appends take an ``flock`` on the index so several
+    workers can share one directory.
+    """
+
+    def __init__(self, path: str, dtype: str = "float32") -> None:
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self._vectors_path = os.path.join(path, "vectors.bin")
+        self._index_path = os.path.join(path, "index.tsv")
+        self._meta_path = os.path.join(path, "meta.json")
+        self._index: Dict[str, int] = {}
+        self._index_offset = 0
+        self._dim: Optional[int] = None
+        self._matrix: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path) as fh:
+                meta = json.load(fh)
+            self._dim = meta["dim"]
+            self.dtype = np.dtype(meta["dtype"])
+        open(self._index_path, "a").close()
+
+    # -- index maintenance -------------------------------------------------
+    def _refresh(self) -> None:
+        """Read index lines appended by this or other processes."""
+        if os.path.getsize(self._index_path) == self._index_offset:
+            return
+        with open(self._index_path) as fh:
+            fh.seek(self._index_offset)
+            for line in fh:
+                if not line.endswith("\n"):
+                    break
+                key, row = line.rstrip("\n").split("\t")
+                self._index[key] = int(row)
+                self._index_offset += len(line.encode("utf-8"))
+        self._matrix = None
+
+    def _rows(self) -> int:
+        if self._dim is None or not os.path.exists(self._vectors_path):
+            return 0
+        return os.path.getsize(self._vectors_path) // (self._dim * self.dtype.itemsize)
+
+    def _mapped(self) -> Optional[np.memmap]:
+        rows = self._rows()
+        if rows == 0:
+            return None
+        if self._matrix is None or self._matrix.shape[0] != rows:
+            self._matrix = np.memmap(self._vectors_path, dtype=self.dtype, mode="r", shape=(rows, self._dim))
+        return self._matrix
+
+    # -- public API ----------------------------------------------------------
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        with self._lock:
+            self._refresh()
+            found = {k: self._index[k] for k in keys if k in self._index}
+            matrix = self._mapped() if found else None
+            if matrix is None:
+                return {}
+            return {k: np.asarray(matrix[row], dtype=np.float32) for k, row in found.items() if row < matrix.shape[0]}
+
+    def has_many(self, keys: Sequence[str]) -> Set[str]:
+        """The subset of ``keys`` stored on disk, without reading their vectors."""
+        with self._lock:
+            self._refresh()
+            return {k for k in keys if k in self._index}
+
+    def put_many(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        if not len(keys):
+            return
+        with self._lock, open(self._index_path, "a") as index_fh:
+            if fcntl is not None:
+                fcntl.flock(index_fh, fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                if self._dim is None:
+                    self._dim = int(vectors.shape[1])
+                    with open(self._meta_path, "w") as fh:
+                        json.dump({"dim": self._dim, "dtype": self.dtype.name}, fh)
+                fresh = [i for i, k in enumerate(keys) if k not in self._index]
+                if not fresh:
+                    return
+                start = self._rows()
+                with open(self._vectors_path, "ab") as fh:
+                    fh.write(np.ascontiguousarray(vectors[fresh], dtype=self.dtype).tobytes())
+                lines = "".join(f"{keys[i]}\t{start + n}\n" for n, i in enumerate(fresh))
+                index_fh.write(lines)
+                index_fh.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(index_fh, fcntl.LOCK_UN)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def nbytes(self) -> int:
+        return os.path.getsize(self._vectors_path) if os.path.exists(self._vectors_path) else 0
+
+
+class EmbeddingCache:
+    """Cache sentence embeddings by ``(model name, normalized sentence)`` hash."""
+
+    def __init__(self, maxsize: int, disk_dir: Optional[str] = None, disk_dtype: str = "float32") -> None:
+        self.memory = LRUCache(maxsize, sizeof=lambda a: a.nbytes)
+        self.disk = DiskEmbeddingStore(disk_dir, disk_dtype) if disk_dir else None
+        self.disk_hits = 0
+        self.misses = 0
+
+    def encode(
+        self,
+        sentences: Sequence[str],
+        model_name: str,
+        encoder: Callable[[List[str]], np.ndarray],
+    ) -> np.ndarray:
+        """Return one row per sentence, calling ``encoder`` only for cache misses."""
+        if not sentences:
+            return np.zeros((0, 0), dtype=np.float32)
+        keys = [sentence_key(model_name, s) for s in sentences]
+        found: Dict[str, np.ndarray] = {}
+        for key in keys:
+            vec = self.memory.get(key)
+            if vec is not None:
+                found[key] = vec
+
+        missing = list(dict.fromkeys(k for k in keys if k not in found))
+        if missing and self.disk is not None:
+            from_disk = self.disk.get_many(missing)
+            self.disk_hits += len(from_disk)
+            for key, vec in from_disk.items():
+                self.memory.put(key, vec)
+            found.update(from_disk)
+            missing = [k for k in missing if k not in from_disk]
+
+        if missing:
+            by_key = {k: normalize_sentence(s) for k, s in zip(keys, sentences)}
+            vectors = np.asarray(encoder([by_key[k] for k in missing]), dtype=np.float32)
+            self.misses += len(missing)
+            for key, vec in zip(missing, vectors):
+                self.memory.put(key, vec)
+                found[key] = vec
+            if self.disk is not None:
+                self.disk.put_many(missing, vectors)
+
+        return np.vstack([found[k] for k in keys])
+
+    def cached(self, sentences: Sequence[str], model_name: str) -> List[bool]:
+        """Which of ``sentences`` :meth:`encode` would not have to encode; counters are unchanged."""
+        keys = [sentence_key(model_name, s) for s in sentences]
+        hit = {k for k in keys if k in self.memory}
+        if self.disk is not None:
+            hit |= self.disk.has_many([k for k in keys if k not in hit])
+        return [k in hit for k in keys]
+
+    def clear(self) -> None:
+        """Drop the memory tier and reset counters; the disk tier is kept."""
+        self.memory.clear()
+        self.disk_hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        mem = self.memory.stats()
+        return {
+            "hits": mem["hits"],
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "entries": mem["entries"],
+            "memory_bytes": mem["bytes"],
+            "disk_entries": len(self.disk) if self.disk is not None else 0,
+            "disk_bytes": self.disk.nbytes if self.disk is not None else 0,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_embedding_cache() -> EmbeddingCache:
+    """Create and cache the process-wide embedding cache."""
+    return EmbeddingCache(EMBEDDING_CACHE_SIZE, EMBEDDING_CACHE_DIR, EMBEDDING_CACHE_DTYPE)
@@ -0,0 +1,141 @@
+"""Bounded worker pools that keep model inference off the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache, partial
+from typing import Any, AsyncIterator, Callable, Optional
+
+# ----- Config -----
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", "4"))
+INFERENCE_PROCESSES = int(os.getenv("INFERENCE_PROCESSES", "0"))
+INFERENCE_MAX_QUEUE = int(os.getenv("INFERENCE_MAX_QUEUE", "16"))
+# T5 beam search gets its own smaller pool and queue, so a large /rewrite/batch
+# cannot take every inference worker away from /analyze.
+REWRITE_THREADS = int(os.getenv("REWRITE_THREADS", "1"))
+REWRITE_MAX_QUEUE = int(os.getenv("REWRITE_MAX_QUEUE", "4"))
+
+
+class ExecutorSaturated(RuntimeError):
+    """Raised when a request arrives while ``max_queue`` requests are pending."""
+
+    def __init__(self, position: int, limit: int) -> None:
+        super().__init__(f"Inference queue is full ({limit} requests pending)")
+        self.position = position
+        self.limit = limit
+
+
+class AdmissionSlot:
+    """One slot reserved by :meth:`InferenceExecutor.slot`, released at most once.
+
+    Dropping the handle releases it too, so a streamed body that is never
+    iterated (e.g. the client left before the response started) cannot leak
+    its slot.
+    """
+
+    def __init__(self, executor: "InferenceExecutor", position: int) -> None:
+        self.position = position
+        self._executor: Optional[InferenceExecutor] = executor
+
+    def release(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.release()
+
+    def __del__(self) -> None:
+        self.release()
+
+
+class InferenceExecutor:
+    """Thread pool for model calls plus an optional process pool for CPU-bound stages.
+
+    Requests are admitted with :meth:`session`, or :meth:`admit` /
+    :meth:`release` when admission and work happen in different scopes; a
+    streaming response admits with :meth:`slot` so its body owns the release.
+    At most ``max_queue`` may be running or waiting at
+    once. Work submitted through :meth:`run` is cancelled if it has not
+    started when the awaiting coroutine is cancelled (e.g. by
+    ``asyncio.wait_for``). A stage that is already running cannot be
+    interrupted, so it keeps its slot occupied until the worker is free.
+    """
+
+    def __init__(self, threads: int = 4, processes: int = 0, max_queue: int = 16) -> None:
+        self.workers = threads
+        self.max_queue = max_queue
+        self._threads = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="inference")
+        self._processes: Optional[Executor] = None
+        if processes:
+            self._processes = ProcessPoolExecutor(
+                max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+            )
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Number of admitted requests that have not finished yet."""
+        return self._pending
+
+    def admit(self) -> int:
+        """Reserve a slot and return the queue position; raise if the queue is full."""
+        with self._lock:
+            if self._pending >= self.max_queue:
+                raise ExecutorSaturated(self._pending + 1, self.max_queue)
+            self._pending += 1
+            return self._pending
+
+    def slot(self) -> AdmissionSlot:
+        """:meth:`admit` one request and return a handle that releases it exactly once."""
+        return AdmissionSlot(self, self.admit())
+
+    def _hold(self) -> None:
+        with self._lock:
+            self._pending += 1
+
+    def release(self, *_args: Any) -> None:
+        """Free a slot reserved by :meth:`admit`."""
+        with self._lock:
+            self._pending -= 1
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[int]:
+        """Admit one request and yield its queue position."""
+        position = self.admit()
+        try:
+            yield position
+        finally:
+            self.release()
+
+    async def run(self, fn: Callable[..., Any], *args: Any, cpu_bound: bool = False, **kwargs: Any) -> Any:
+        """Run ``fn`` in a worker and await its result."""
+        pool = self._processes if cpu_bound and self._processes is not None else self._threads
+        future = pool.submit(partial(fn, *args, **kwargs))
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if not future.cancel():
+                self._hold()
+                future.add_done_callback(self.release)
+            raise
+
+    def shutdown(self) -> None:
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache(maxsize=1)
+def get_executor() -> InferenceExecutor:
+    """Create and cache the process-wide inference executor."""
+    return InferenceExecutor(INFERENCE_THREADS, INFERENCE_PROCESSES, INFERENCE_MAX_QUEUE)
+
+
+@lru_cache(maxsize=1)
+def get_rewrite_executor() -> InferenceExecutor:
+    """Create and cache the executor for ``/rewrite`` and ``/rewrite/batch``."""
+    return InferenceExecutor(REWRITE_THREADS, 0, REWRITE_MAX_QUEUE)
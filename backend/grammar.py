@@ -0,0 +1,166 @@
+"""Grammar checking through a pool of long-lived LanguageTool servers."""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+try:  # pragma: no cover - grammar checking
+    import language_tool_python
+except Exception:  # pragma: no cover
+    language_tool_python = None  # type: ignore
+
+from .cache import LRUCache, content_key
+
+# ----- Config -----
+GRAMMAR_POOL_SIZE = int(os.getenv("GRAMMAR_POOL_SIZE", "2"))
+GRAMMAR_TIMEOUT = float(os.getenv("GRAMMAR_TIMEOUT", "0.5"))
+GRAMMAR_CACHE_SIZE = int(os.getenv("GRAMMAR_CACHE_SIZE", "1024"))
+GRAMMAR_HEALTH_INTERVAL = float(os.getenv("GRAMMAR_HEALTH_INTERVAL", "300"))
+
+
+class _Checker:
+    """One LanguageTool instance, started on first use."""
+
+    def __init__(self) -> None:
+        self.tool: Any = None
+        self.last_used = time.monotonic()
+
+
+class LanguageToolPool:
+    """Lazily started pool of LanguageTool checkers.
+
+    ``check`` never waits longer than ``timeout``: if no checker is free, or
+    the check is still running when time is up, it returns ``None`` and the
+    work finishes in the background. A checker that raises is closed and
+    replaced on the next call; one idle for ``health_interval`` seconds is
+    pinged before use.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        timeout: float,
+        factory: Optional[Callable[[], Any]] = None,
+        health_interval: float = 300.0,
+    ) -> None:
+        self.size = size
+        self.timeout = timeout
+        self.health_interval = health_interval
+        self._factory = factory or (lambda: language_tool_python.LanguageTool("en-US"))
+        self._idle: "queue.Queue[_Checker]" = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._runner = ThreadPoolExecutor(max_workers=size, thread_name_prefix="grammar")
+        self.timeouts = 0
+        self.restarts = 0
+
+    def _acquire(self, timeout: float) -> Optional[_Checker]:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return _Checker()
+        try:
+            return self._idle.get(timeout=max(timeout, 0.0))
+        except queue.Empty:
+            return None
+
+    def _run(self, checker: _Checker, text: str) -> List[Any]:
+        try:
+            if checker.tool is None:
+                checker.tool = self._factory()
+            elif time.monotonic() - checker.last_used > self.health_interval:
+                checker.tool.check("Health check.")
+            matches = checker.tool.check(text)
+        except Exception:
+            self._discard(checker)
+            raise
+        checker.last_used = time.monotonic()
+        self._idle.put(checker)
+        return matches
+
+    def _discard(self, checker: _Checker) -> None:
+        try:
+            if checker.tool is not None:
+                checker.tool.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._created -= 1
+            self.restarts += 1
+
+    def check(self, text: str, timeout: Optional[float] = None) -> Optional[List[Any]]:
+        """Return LanguageTool matches, or ``None`` if the check was skipped.
+
+        ``timeout`` overrides the pool's default for this call.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        checker = self._acquire(timeout)
+        if checker is None:
+            self.timeouts += 1
+            return None
+        future = self._runner.submit(self._run, checker, text)
+        try:
+            return future.result(timeout=max(deadline - time.monotonic(), 0.0))
+        except FutureTimeout:
+            self.timeouts += 1
+            return None
+        except Exception:
+            return None
+
+    def close(self) -> None:
+        while True:
+            try:
+                checker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if checker.tool is not None:
+                checker.tool.close()
+        self._runner.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": self.size,
+            "started": self._created,
+            "idle": self._idle.qsize(),
+            "timeouts": self.timeouts,
+            "restarts": self.restarts,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_grammar_pool() -> LanguageToolPool:
+    """Create and cache the process-wide LanguageTool pool."""
+    return LanguageToolPool(GRAMMAR_POOL_SIZE, GRAMMAR_TIMEOUT, health_interval=GRAMMAR_HEALTH_INTERVAL)
+
+
+grammar_cache = LRUCache(GRAMMAR_CACHE_SIZE)
+
+
+def grammar_check(text: str, timeout: Optional[float] = None) -> List[Dict[str, str]]:
+    """Return grammar issues with suggested replacements, waiting at most ``timeout`` seconds."""
+    if language_tool_python is None:
+        return []
+    key = content_key(text)
+    cached = grammar_cache.get(key)
+    if cached is not None:
+        return cached
+    matches = get_grammar_pool().check(text, timeout)
+    if matches is None:
+        return []
+    issues: List[Dict[str, str]] = []
+    for m in matches[:5]:
+        replacement = m.replacements[0] if m.replacements else ""
+        issues.append({"issue": m.message, "replacement": replacement})
+    grammar_cache.put(key, issues)
+    return issues
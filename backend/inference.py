@@ -0,0 +1,155 @@
+"""Pluggable CPU inference backends for the embedder and cross-encoder."""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:  # pragma: no cover - optional dependency in tests
+    from sentence_transformers import CrossEncoder, SentenceTransformer
+except Exception:  # pragma: no cover
+    SentenceTransformer = None  # type: ignore
+    CrossEncoder = None  # type: ignore
+try:  # pragma: no cover - optional dependency
+    import onnxruntime
+except ImportError:  # pragma: no cover
+    onnxruntime = None  # type: ignore
+
+# ----- Config -----
+# torch: fp32 PyTorch; torch-int8: PyTorch with dynamically quantized Linear
+# layers; onnx: ONNX Runtime over an exported (optionally quantized) model.
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch")
+BACKENDS = ("torch", "torch-int8", "onnx")
+# Local model directories; when set, nothing is fetched from the network.
+EMBEDDER_PATH = os.getenv("EMBEDDER_PATH") or None
+CROSS_ENCODER_PATH = os.getenv("CROSS_ENCODER_PATH") or None
+ONNX_FILE = os.getenv("ONNX_FILE", "model.onnx")
+# Device for the torch backend, e.g. "cuda:0"; unset lets sentence-transformers pick
+# (the GPU when there is one). torch-int8 always runs on the CPU.
+INFERENCE_DEVICE = os.getenv("INFERENCE_DEVICE") or None
+# Intra-op threads per ONNX session; 0 lets ONNX Runtime decide.
+ONNX_THREADS = int(os.getenv("ONNX_THREADS", "0"))
+EMBEDDER_MAX_LENGTH = 256
+CROSS_ENCODER_MAX_LENGTH = 512
+
+
+def backend_tag(backend: Optional[str] = None) -> str:
+    """Short id of a backend for cache keys, e.g. ``onnx:model_quantized.onnx``."""
+    backend = backend or INFERENCE_BACKEND
+    return f"onnx:{ONNX_FILE}" if backend == "onnx" else backend
+
+
+class OnnxEmbedder:
+    """Mean-pooled sentence embeddings from an exported transformer encoder.
+
+    Mirrors ``SentenceTransformer.encode`` for the MiniLM models: the first
+    session output is the last hidden state, averaged over non-padding tokens.
+    """
+
+    def __init__(self, session: Any, tokenizer: Any, max_length: int = EMBEDDER_MAX_LENGTH) -> None:
+        self.session = session
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        self._inputs = {i.name for i in session.get_inputs()}
+
+    def encode(
+        self, sentences: Sequence[str], normalize_embeddings: bool = True, batch_size: int = 32, **_kw: Any
+    ) -> np.ndarray:
+        out: List[np.ndarray] = []
+        for start in range(0, len(sentences), batch_size):
+            feed = _feed(self.tokenizer(
+                list(sentences[start:start + batch_size]),
+                padding=True, truncation=True, max_length=self.max_length, return_tensors="np",
+            ), self._inputs)
+            hidden = self.session.run(None, feed)[0]
+            mask = feed["attention_mask"][..., None].astype(hidden.dtype)
+            out.append((hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None))
+        if not out:
+            return np.zeros((0, 0), dtype=np.float32)
+        emb = np.concatenate(out).astype(np.float32)
+        if normalize_embeddings:
+            emb /= np.clip(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12, None)
+        return emb
+
+
+class OnnxCrossEncoder:
+    """Single-logit relevance scores from an exported sequence classifier."""
+
+    def __init__(self, session: Any, tokenizer: Any, max_length: int = CROSS_ENCODER_MAX_LENGTH) -> None:
+        self.session = session
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        self._inputs = {i.name for i in session.get_inputs()}
+
+    def predict(self, pairs: Sequence[Sequence[str]], batch_size: int = 32, **_kw: Any) -> np.ndarray:
+        out: List[np.ndarray] = []
+        for start in range(0, len(pairs), batch_size):
+            batch = pairs[start:start + batch_size]
+            feed = _feed(self.tokenizer(
+                [a for a, _ in batch], [b for _, b in batch],
+                padding=True, truncation=True, max_length=self.max_length, return_tensors="np",
+            ), self._inputs)
+            out.append(self.session.run(None, feed)[0][:, 0])
+        return np.concatenate(out) if out else np.zeros(0, dtype=np.float32)
+
+
+def _feed(encoded: Any, inputs: set) -> Dict[str, np.ndarray]:
+    """Keep only the tensors the exported graph accepts, as int64."""
+    return {k: np.asarray(v, dtype=np.int64) for k, v in encoded.items() if k in inputs}
+
+
+def _onnx_parts(path: Optional[str]) -> tuple:
+    if onnxruntime is None:
+        raise ImportError("onnxruntime not installed")
+    if not path:
+        raise ValueError("The onnx backend needs a local model directory (EMBEDDER_PATH / CROSS_ENCODER_PATH)")
+    from transformers import AutoTokenizer
+
+    options = onnxruntime.SessionOptions()
+    if ONNX_THREADS:
+        options.intra_op_num_threads = ONNX_THREADS
+    session = onnxruntime.InferenceSession(
+        os.path.join(path, ONNX_FILE), options, providers=["CPUExecutionProvider"]
+    )
+    return session, AutoTokenizer.from_pretrained(path, local_files_only=True)
+
+
+def _quantize(module: Any) -> Any:
+    import torch
+
+    return torch.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _torch_device(backend: str) -> Optional[str]:
+    """Dynamically quantized layers only have CPU kernels; fp32 goes where it is configured."""
+    return "cpu" if backend == "torch-int8" else INFERENCE_DEVICE
+
+
+def load_embedder(name: str, path: Optional[str] = None, backend: Optional[str] = None) -> Any:
+    """Load the sentence embedder for ``backend`` (default ``INFERENCE_BACKEND``)."""
+    backend = backend or INFERENCE_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}', expected one of {BACKENDS}")
+    if backend == "onnx":
+        return OnnxEmbedder(*_onnx_parts(path))
+    if SentenceTransformer is None:  # pragma: no cover
+        raise ImportError("sentence-transformers not installed")
+    model = SentenceTransformer(path or name, device=_torch_device(backend))
+    return _quantize(model) if backend == "torch-int8" else model
+
+
+def load_cross_encoder(name: str, path: Optional[str] = None, backend: Optional[str] = None) -> Any:
+    """Load the cross-encoder for ``backend`` (default ``INFERENCE_BACKEND``)."""
+    backend = backend or INFERENCE_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}', expected one of {BACKENDS}")
+    if backend == "onnx":
+        return OnnxCrossEncoder(*_onnx_parts(path))
+    if CrossEncoder is None:  # pragma: no cover
+        raise ImportError("sentence-transformers not installed")
+    model = CrossEncoder(path or name, device=_torch_device(backend))
+    if backend == "torch-int8":
+        model.model = _quantize(model.model)
+    return model
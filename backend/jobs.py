@@ -0,0 +1,328 @@
+"""Background job queue for the heavy endpoints, backed by the ``jobs`` table.
+
+``POST /jobs`` stores a job and returns its id; workers claim queued jobs in
+priority order (then oldest first) and write the result back, and clients
+poll ``GET /jobs/{id}`` or follow ``GET /jobs/{id}/stream``. There is no
+broker: the database row is the queue, and claiming is a conditional
+``UPDATE ... WHERE status = 'queued'`` so several workers, in this process
+or in ``python -m backend.jobs``, never run the same job twice.
+
+A worker claims the highest-priority job plus up to ``JOB_BATCH_SIZE - 1``
+more queued jobs of the same kind and hands them to that kind's handler in
+one call, so e.g. queued rewrites share padded ``generate()`` batches. If a
+batch fails, its jobs are retried one by one so a single bad payload only
+fails itself. A failed job is re-queued until it has used ``max_attempts``;
+so is a job whose worker died (its lease expired), since the claim counted
+the attempt.
+
+A job's payload is cleared once it is done, failed or cancelled, and the
+finished row (with its result) is deleted ``JOB_RETENTION_SECONDS`` later,
+so resume text is not kept past what polling clients need.
+
+Cancelling a queued job removes it from the queue; a running job finishes,
+but its result is discarded and handlers use :func:`running_job_ids` to
+skip side effects such as saving history.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# ----- Config -----
+# Worker threads started with the API; 0 leaves the queue to `python -m backend.jobs`.
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "1"))
+JOB_BATCH_SIZE = int(os.getenv("JOB_BATCH_SIZE", "8"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Seconds an idle worker sleeps before looking for jobs submitted by another process.
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+# A job still "running" after this many seconds belonged to a dead worker and is re-queued
+# (or failed, once out of attempts). Workers look for such jobs every half lease.
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "600"))
+# Seconds a finished job, and its result, can still be fetched before it is deleted.
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", "86400"))
+
+TERMINAL_STATUSES = ("done", "failed", "cancelled")
+
+# Set on submit so in-process workers start at once instead of at the next poll.
+_wakeup = threading.Event()
+
+
+@dataclass
+class ClaimedJob:
+    """What a handler sees of a job: detached from the session that claimed it."""
+
+    id: str
+    user_id: int
+    kind: str
+    payload: Dict[str, Any]
+
+
+# kind -> handler taking a batch of jobs and returning one result per job, in order.
+_handlers: Dict[str, Callable[[List[ClaimedJob]], List[Any]]] = {}
+
+
+def job_handler(kind: str):
+    """Register the decorated function as the handler for jobs of ``kind``."""
+
+    def register(fn: Callable[[List[ClaimedJob]], List[Any]]):
+        _handlers[kind] = fn
+        return fn
+
+    return register
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def submit_job(
+    db: Session,
+    user_id: int,
+    kind: str,
+    payload: Dict[str, Any],
+    priority: int = 0,
+    max_attempts: Optional[int] = None,
+) -> Job:
+    """Queue a job and wake the in-process workers."""
+    job = Job(
+        id=uuid.uuid4().hex,
+        user_id=user_id,
+        kind=kind,
+        payload=payload,
+        status="queued",
+        priority=priority,
+        max_attempts=max_attempts or JOB_MAX_ATTEMPTS,
+        created_at=_now(),
+    )
+    db.add(job); db.commit(); db.refresh(job)
+    _wakeup.set()
+    return job
+
+
+def cancel_job(db: Session, job: Job) -> Job:
+    """Mark a queued or running job cancelled; finished jobs are left as they are."""
+    if job.status not in TERMINAL_STATUSES:
+        job.status = "cancelled"
+        job.payload = {}
+        job.finished_at = _now()
+        db.commit(); db.refresh(job)
+    return job
+
+
+def running_job_ids(db: Session, job_ids: List[str]) -> set:
+    """The subset of ``job_ids`` still running, i.e. not cancelled since they were claimed."""
+    return {job_id for (job_id,) in db.query(Job.id).filter(Job.id.in_(job_ids), Job.status == "running")}
+
+
+class JobWorker:
+    """Claims batches of queued jobs and runs them through the registered handlers."""
+
+    def __init__(self, name: Optional[str] = None, batch_size: int = 0, session_factory=SessionLocal):
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.batch_size = batch_size or JOB_BATCH_SIZE
+        self.session_factory = session_factory
+
+    def claim(self) -> List[ClaimedJob]:
+        """Claim the next job and up to ``batch_size - 1`` queued jobs of the same kind."""
+        db = self.session_factory()
+        try:
+            order = (Job.priority.desc(), Job.created_at, Job.id)
+            head = db.query(Job).filter(Job.status == "queued").order_by(*order).first()
+            if head is None:
+                return []
+            candidates = [head] + (
+                db.query(Job)
+                .filter(Job.status == "queued", Job.kind == head.kind, Job.id != head.id)
+                .order_by(*order)
+                .limit(self.batch_size - 1)
+                .all()
+            )
+            claimed = []
+            for job in candidates:
+                won = (
+                    db.query(Job)
+                    .filter(Job.id == job.id, Job.status == "queued")
+                    .update(
+                        {
+                            Job.status: "running",
+                            Job.worker: self.name,
+                            Job.started_at: _now(),
+                            Job.attempts: Job.attempts + 1,
+                        },
+                        synchronize_session=False,
+                    )
+                )
+                if won:
+                    claimed.append(ClaimedJob(job.id, job.user_id, job.kind, job.payload))
+            db.commit()
+            return claimed
+        finally:
+            db.close()
+
+    def _finish(self, job: ClaimedJob, result: Any = None, error: Optional[str] = None) -> None:
+        """Store the outcome unless the job was cancelled (or re-leased) meanwhile."""
+        db = self.session_factory()
+        try:
+            row = (
+                db.query(Job)
+                .filter(Job.id == job.id, Job.status == "running", Job.worker == self.name)
+                .first()
+            )
+            if row is None:
+                return
+            if error is None:
+                row.status, row.result, row.error = "done", result, None
+            elif row.attempts < row.max_attempts:
+                row.status, row.error, row.worker, row.started_at = "queued", error, None, None
+            else:
+                row.status, row.error = "failed", error
+            if row.status != "queued":
+                row.payload, row.finished_at = {}, _now()
+            db.commit()
+        finally:
+            db.close()
+
+    def _run(self, jobs: List[ClaimedJob]) -> None:
+        handler = _handlers.get(jobs[0].kind)
+        try:
+            if handler is None:
+                raise LookupError(f"No handler for job kind {jobs[0].kind!r}")
+            results = handler(jobs)
+        except Exception as exc:
+            if len(jobs) > 1:
+                logger.warning("Job batch of %d %s jobs failed; retrying one by one", len(jobs), jobs[0].kind)
+                for job in jobs:
+                    self._run([job])
+                return
+            logger.exception("Job %s failed", jobs[0].id)
+            self._finish(jobs[0], error=f"{type(exc).__name__}: {exc}")
+            return
+        for job, result in zip(jobs, results):
+            self._finish(job, result)
+
+    def run_once(self) -> int:
+        """Claim and run one batch; returns how many jobs it held (0 when the queue is empty)."""
+        jobs = self.claim()
+        if jobs:
+            self._run(jobs)
+        return len(jobs)
+
+    def requeue_stale(self) -> int:
+        """Re-queue jobs whose worker has held them longer than ``JOB_LEASE_SECONDS``.
+
+        The claim already counted the attempt, so a job that has used
+        ``max_attempts`` is failed instead of being handed to another worker.
+        """
+        db = self.session_factory()
+        try:
+            stale = db.query(Job).filter(
+                Job.status == "running", Job.started_at < _now() - timedelta(seconds=JOB_LEASE_SECONDS)
+            )
+            failed = stale.filter(Job.attempts >= Job.max_attempts).update(
+                {Job.status: "failed", Job.error: "Worker lease expired", Job.payload: {}, Job.finished_at: _now()},
+                synchronize_session=False,
+            )
+            requeued = stale.update(
+                {Job.status: "queued", Job.error: "Worker lease expired", Job.worker: None, Job.started_at: None},
+                synchronize_session=False,
+            )
+            db.commit()
+            return failed + requeued
+        finally:
+            db.close()
+
+    def purge_finished(self) -> int:
+        """Delete finished jobs older than ``JOB_RETENTION_SECONDS``, results included."""
+        db = self.session_factory()
+        try:
+            count = (
+                db.query(Job)
+                .filter(
+                    Job.status.in_(TERMINAL_STATUSES),
+                    Job.finished_at < _now() - timedelta(seconds=JOB_RETENTION_SECONDS),
+                )
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+            return count
+        finally:
+            db.close()
+
+    def run_forever(self, stop: threading.Event) -> None:
+        next_upkeep = 0.0
+        while not stop.is_set():
+            try:
+                if time.monotonic() >= next_upkeep:
+                    self.requeue_stale()
+                    self.purge_finished()
+                    next_upkeep = time.monotonic() + JOB_LEASE_SECONDS / 2
+                if self.run_once():
+                    continue
+            except Exception:
+                logger.exception("Job worker %s could not claim jobs", self.name)
+            _wakeup.wait(JOB_POLL_INTERVAL)
+            _wakeup.clear()
+
+
+class WorkerPool:
+    """``count`` worker threads sharing this process's models and micro-batchers."""
+
+    def __init__(self, count: int):
+        self.count = count
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        for i in range(self.count):
+            thread = threading.Thread(
+                target=JobWorker().run_forever, args=(self._stop,), name=f"job-worker-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        _wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run ResumeBoost job workers outside the API process.")
+    parser.add_argument("--workers", type=int, default=max(JOB_WORKERS, 1))
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    from . import main as api  # noqa: F401  - registers the job handlers
+
+    pool = WorkerPool(args.workers)
+    pool.start()
+    logger.info("Started %d job workers", args.workers)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
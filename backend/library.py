@@ -0,0 +1,418 @@
+"""Per-user resume library: float16 sentence embeddings on disk plus an IVF index."""
+
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cache import content_key
+
+try:  # pragma: no cover - not available on Windows
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+# ----- Config -----
+LIBRARY_DIR = os.getenv("LIBRARY_DIR", "./resume_library")
+# Libraries up to this many live sentences are scanned exactly.
+LIBRARY_EXACT_ROWS = int(os.getenv("LIBRARY_EXACT_ROWS", "20000"))
+LIBRARY_NPROBE = int(os.getenv("LIBRARY_NPROBE", "8"))
+# Candidates re-scored exactly per requested result.
+LIBRARY_SHORTLIST_FACTOR = 4
+
+_DTYPE = np.dtype(np.float16)
+
+
+class IVFIndex:
+    """Inverted-file index: spherical k-means centroids, each holding its nearest rows.
+
+    Each list keeps its vectors as one contiguous float32 block, so a probe
+    is a few matrix-vector products with no gathering or float16 conversion.
+    """
+
+    def __init__(self, centroids: np.ndarray) -> None:
+        self.centroids = centroids
+        self.rows: List[np.ndarray] = [np.zeros(0, dtype=np.int64) for _ in range(len(centroids))]
+        self.vectors: List[np.ndarray] = [np.zeros((0, centroids.shape[1]), dtype=np.float32) for _ in range(len(centroids))]
+
+    @classmethod
+    def train(cls, vectors: np.ndarray, nlist: int, iters: int = 8, seed: int = 0) -> "IVFIndex":
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(len(vectors), min(len(vectors), nlist * 32), replace=False)]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(iters):
+            assign = (sample @ centroids.T).argmax(axis=1)
+            counts = np.bincount(assign, minlength=nlist)
+            filled = counts > 0
+            starts = np.r_[0, np.cumsum(counts)[:-1]][filled]
+            sums = np.add.reduceat(sample[np.argsort(assign, kind="stable")], starts, axis=0)
+            centroids[filled] = sums / np.linalg.norm(sums, axis=1, keepdims=True)
+        return cls(centroids)
+
+    def add(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        if not len(vectors):
+            return
+        assign = np.concatenate([
+            (vectors[i:i + 8192] @ self.centroids.T).argmax(axis=1) for i in range(0, len(vectors), 8192)
+        ])
+        for k in np.unique(assign):
+            members = assign == k
+            self.rows[k] = np.concatenate([self.rows[k], rows[members]])
+            self.vectors[k] = np.concatenate([self.vectors[k], vectors[members]])
+
+    def probe(self, query: np.ndarray, nprobe: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows in the ``nprobe`` lists closest to ``query``, with their similarities."""
+        nprobe = min(nprobe, len(self.centroids))
+        top = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        return (
+            np.concatenate([self.rows[k] for k in top]),
+            np.concatenate([self.vectors[k] @ query for k in top]),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return sum(v.nbytes for v in self.vectors)
+
+
+def _best_per_doc(owner: np.ndarray, rows: np.ndarray, sims: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Max of ``sims`` rows grouped by document; ``rows`` must be ascending."""
+    docs = owner[rows]
+    starts = np.flatnonzero(np.r_[True, docs[1:] != docs[:-1]])
+    return docs[starts], np.maximum.reduceat(sims, starts, axis=0)
+
+
+class UserLibrary:
+    """One user's resumes as append-only files in ``path``.
+
+    ``vectors.f16`` holds unit-length sentence embeddings as float16 rows,
+    ``docs.tsv`` maps each document id to its row range and ``deleted.txt``
+    lists removed documents. Writers take an exclusive ``flock``, so several
+    workers can share the directory; each re-reads what the others appended
+    before searching. :meth:`compact` drops the rows of deleted documents.
+    """
+
+    def __init__(self, path: str, exact_rows: int = LIBRARY_EXACT_ROWS) -> None:
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.exact_rows = exact_rows
+        self._vectors_path = os.path.join(path, "vectors.f16")
+        self._docs_path = os.path.join(path, "docs.tsv")
+        self._deleted_path = os.path.join(path, "deleted.txt")
+        self._lock_path = os.path.join(path, "lock")
+        for p in (self._docs_path, self._deleted_path, self._lock_path):
+            open(p, "a").close()
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.dim: Optional[int] = None
+        self.docs: Dict[int, Tuple[int, int]] = {}
+        self.owner = np.zeros(0, dtype=np.int64)  # document id per row, -1 once deleted
+        self._offsets = [0, 0]
+        self._docs_inode: Optional[int] = None
+        self._matrix: Optional[np.memmap] = None
+        self.index: Optional[IVFIndex] = None
+        self._indexed_rows = 0
+        self._f32: Optional[np.ndarray] = None
+
+    @contextmanager
+    def _flock(self, exclusive: bool) -> Iterator[None]:
+        with open(self._lock_path) as fh:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _read_lines(path: str, offset: int) -> Tuple[List[str], int]:
+        if os.path.getsize(path) == offset:
+            return [], offset
+        lines = []
+        with open(path) as fh:
+            fh.seek(offset)
+            for line in fh:
+                if not line.endswith("\n"):
+                    break
+                lines.append(line.rstrip("\n"))
+                offset += len(line.encode("utf-8"))
+        return lines, offset
+
+    def _refresh(self) -> None:
+        """Apply documents appended or deleted by this or other workers."""
+        if os.stat(self._docs_path).st_ino != self._docs_inode:
+            self._reset()
+            self._docs_inode = os.stat(self._docs_path).st_ino
+        added, self._offsets[0] = self._read_lines(self._docs_path, self._offsets[0])
+        for line in added:
+            doc, start, count, dim = map(int, line.split("\t"))
+            self.dim = dim
+            self.docs[doc] = (start, count)
+            if len(self.owner) < start + count:
+                self.owner = np.concatenate([self.owner, np.full(start + count - len(self.owner), -1)])
+            self.owner[start:start + count] = doc
+        deleted, self._offsets[1] = self._read_lines(self._deleted_path, self._offsets[1])
+        for line in deleted:
+            start, count = self.docs.pop(int(line), (0, 0))
+            self.owner[start:start + count] = -1
+        if added:
+            self._matrix = None
+
+    def _mapped(self) -> np.ndarray:
+        rows = len(self.owner)
+        if self._matrix is None or self._matrix.shape[0] != rows:
+            self._matrix = np.memmap(self._vectors_path, dtype=_DTYPE, mode="r", shape=(rows, self.dim))
+        return self._matrix
+
+    def add(self, doc_id: int, vectors: np.ndarray) -> None:
+        """Append one document's sentence embeddings (rows must be unit length)."""
+        if not len(vectors):
+            return
+        with self._lock, self._flock(exclusive=True):
+            self._refresh()
+            if doc_id in self.docs:
+                return
+            start = os.path.getsize(self._vectors_path) // (vectors.shape[1] * _DTYPE.itemsize) if os.path.exists(self._vectors_path) else 0
+            with open(self._vectors_path, "ab") as fh:
+                fh.write(np.ascontiguousarray(vectors, dtype=_DTYPE).tobytes())
+            with open(self._docs_path, "a") as fh:
+                fh.write(f"{doc_id}\t{start}\t{len(vectors)}\t{vectors.shape[1]}\n")
+            self._refresh()
+
+    def remove(self, doc_id: int) -> bool:
+        with self._lock, self._flock(exclusive=True):
+            self._refresh()
+            if doc_id not in self.docs:
+                return False
+            with open(self._deleted_path, "a") as fh:
+                fh.write(f"{doc_id}\n")
+            self._refresh()
+            if (self.owner < 0).sum() > len(self.owner) // 2:
+                self._compact_locked()
+            return True
+
+    def compact(self) -> None:
+        with self._lock, self._flock(exclusive=True):
+            self._refresh()
+            self._compact_locked()
+
+    def _compact_locked(self) -> None:
+        matrix = self._mapped() if len(self.owner) else None
+        tmp_vectors, tmp_docs = self._vectors_path + ".tmp", self._docs_path + ".tmp"
+        start = 0
+        with open(tmp_vectors, "wb") as vec_fh, open(tmp_docs, "w") as doc_fh:
+            for doc, (s, count) in self.docs.items():
+                vec_fh.write(np.ascontiguousarray(matrix[s:s + count]).tobytes())
+                doc_fh.write(f"{doc}\t{start}\t{count}\t{self.dim}\n")
+                start += count
+        self._matrix = None
+        os.replace(tmp_vectors, self._vectors_path)
+        os.replace(tmp_docs, self._docs_path)
+        open(self._deleted_path, "w").close()
+        self._reset()
+        self._refresh()
+
+    def _dense(self, matrix: np.ndarray) -> np.ndarray:
+        """float32 copy of every row, for libraries small enough to scan exactly."""
+        have = 0 if self._f32 is None else len(self._f32)
+        if have < len(self.owner):
+            new = np.asarray(matrix[have:], dtype=np.float32)
+            self._f32 = new if self._f32 is None else np.concatenate([self._f32, new])
+        return self._f32
+
+    def _ensure_index(self, live: np.ndarray, matrix: np.ndarray) -> IVFIndex:
+        rows = len(self.owner)
+        if self.index is None or rows > 2 * max(self._indexed_rows, 1):
+            vectors = np.asarray(matrix[live], dtype=np.float32)
+            self.index = IVFIndex.train(vectors, nlist=max(int(np.sqrt(len(live))), 1))
+            self.index.add(live, vectors)
+            self._indexed_rows = rows
+        elif self._indexed_rows < rows:
+            new = np.arange(self._indexed_rows, rows)
+            self.index.add(new, np.asarray(matrix[new], dtype=np.float32))
+            self._indexed_rows = rows
+        return self.index
+
+    def warm(self) -> None:
+        """Train or extend the IVF index now, so the next search does not pay for it."""
+        with self._lock, self._flock(exclusive=False):
+            self._refresh()
+            live = np.flatnonzero(self.owner >= 0)
+            if len(live) and len(self.owner) > self.exact_rows:
+                self._ensure_index(live, self._mapped())
+
+    def search(
+        self,
+        queries: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+        top_n: int = 10,
+        nprobe: int = LIBRARY_NPROBE,
+    ) -> List[Tuple[int, float]]:
+        """Rank documents by the weighted mean over ``queries`` of their best-matching sentence.
+
+        Small libraries are scanned exactly. Larger ones probe the IVF index
+        for a shortlist, which is then re-scored exactly from the float16 rows.
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        weights = np.ones(len(queries)) if weights is None else np.asarray(weights, dtype=np.float32)
+        weights = weights / (weights.sum() or 1.0)
+        with self._lock, self._flock(exclusive=False):
+            self._refresh()
+            live = np.flatnonzero(self.owner >= 0)
+            if not len(live) or not len(queries):
+                return []
+            matrix = self._mapped()
+            if len(self.owner) <= self.exact_rows:
+                self.index = None
+                sims = (self._dense(matrix) @ queries.T)[live]
+            else:
+                self._f32 = None
+                index = self._ensure_index(live, matrix)
+                found = []
+                for q in queries:
+                    rows, sims = index.probe(q, nprobe)
+                    keep = self.owner[rows] >= 0
+                    order = np.argsort(rows[keep])
+                    found.append(_best_per_doc(self.owner, rows[keep][order], sims[keep][order]))
+                docs = np.unique(np.concatenate([d for d, _ in found]))
+                coarse = np.zeros((len(docs), len(queries)), dtype=np.float32)
+                for j, (d, best) in enumerate(found):
+                    coarse[np.searchsorted(docs, d), j] = best
+                shortlist = docs[np.argsort(-(coarse @ weights))[: top_n * LIBRARY_SHORTLIST_FACTOR]]
+                live = np.sort(np.concatenate([np.arange(*self._range(d)) for d in shortlist]))
+                sims = np.asarray(matrix[live], dtype=np.float32) @ queries.T
+            docs, best = _best_per_doc(self.owner, live, sims)
+        scores = best @ weights
+        order = np.argsort(-scores)[:top_n]
+        return [(int(docs[i]), float(scores[i])) for i in order]
+
+    def _range(self, doc: int) -> Tuple[int, int]:
+        start, count = self.docs[int(doc)]
+        return start, start + count
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self.docs)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._refresh()
+            return {
+                "documents": len(self.docs),
+                "rows": len(self.owner),
+                "deleted_rows": int((self.owner < 0).sum()),
+                "bytes": os.path.getsize(self._vectors_path) if os.path.exists(self._vectors_path) else 0,
+                "ivf_lists": len(self.index.centroids) if self.index is not None else 0,
+                "memory_bytes": self.index.nbytes if self.index is not None else (
+                    self._f32.nbytes if self._f32 is not None else 0
+                ),
+            }
+
+
+class ResumeLibrary:
+    """Directory of :class:`UserLibrary` instances, one per user id."""
+
+    def __init__(self, root: str, exact_rows: int = LIBRARY_EXACT_ROWS) -> None:
+        self.root = root
+        self.exact_rows = exact_rows
+        self._users: Dict[int, UserLibrary] = {}
+        self._lock = threading.Lock()
+
+    def user(self, user_id: int) -> UserLibrary:
+        with self._lock:
+            lib = self._users.get(user_id)
+            if lib is None:
+                lib = self._users[user_id] = UserLibrary(os.path.join(self.root, str(user_id)), self.exact_rows)
+            return lib
+
+    def add_many(self, user_id: int, docs: Sequence[Tuple[int, np.ndarray]]) -> None:
+        lib = self.user(user_id)
+        for doc_id, vectors in docs:
+            lib.add(doc_id, vectors)
+
+    def remove(self, user_id: int, doc_id: int) -> bool:
+        return self.user(user_id).remove(doc_id)
+
+    def warm(self) -> None:
+        """Build the IVF index of every library on disk that is large enough to need one."""
+        if not os.path.isdir(self.root):
+            return
+        for name in os.listdir(self.root):
+            if name.isdigit():
+                self.user(int(name)).warm()
+
+
+@lru_cache(maxsize=1)
+def get_resume_library() -> ResumeLibrary:
+    """Create and cache the process-wide resume library."""
+    return ResumeLibrary(LIBRARY_DIR)
+
+
+def index_resumes(user_id: int, items: Sequence[Tuple[int, str]]) -> None:
+    """Store ``(analysis id, resume text)`` pairs and add their sentence embeddings to the library.
+
+    A text the user's library already holds (by ``content_key``) is skipped,
+    so re-analysing a resume does not add a second copy.
+    """
+    from .analyzer import encode_sentences, split_sents
+    from .database import SessionLocal
+    from .models import LibraryResume
+
+    keyed = {}
+    for doc, text in items:
+        if split_sents(text):
+            keyed.setdefault(content_key(text), (doc, text))
+    db = SessionLocal()
+    try:
+        if keyed:
+            stored = db.query(LibraryResume.text_key).filter(
+                LibraryResume.user_id == user_id, LibraryResume.text_key.in_(list(keyed))
+            )
+            for (key,) in stored:
+                keyed.pop(key, None)
+        if not keyed:
+            return
+        db.add_all(
+            LibraryResume(analysis_id=doc, user_id=user_id, text_key=key, resume_text=text)
+            for key, (doc, text) in keyed.items()
+        )
+        db.commit()
+    finally:
+        db.close()
+    items = list(keyed.values())
+    sents = {text: split_sents(text) for _, text in items}
+    unique = list(dict.fromkeys(s for ss in sents.values() for s in ss))
+    matrix = encode_sentences(unique)
+    row = {s: i for i, s in enumerate(unique)}
+    library = get_resume_library()
+    library.add_many(user_id, [(doc, matrix[[row[s] for s in sents[text]]]) for doc, text in items])
+    library.user(user_id).warm()
+
+
+def search_library(
+    user_id: int,
+    job_text: str,
+    role: Optional[str] = None,
+    seniority: Optional[str] = None,
+    top_n: int = 10,
+) -> List[Tuple[int, float]]:
+    """Top ``top_n`` stored resumes for a JD as ``(analysis id, similarity)``.
+
+    JD sentences are weighted like ``calculate_scores`` weights them, using
+    the cached JD profile.
+    """
+    from .analyzer import encode_sentences, get_jd_profile, split_sents
+
+    jd_sents = split_sents(job_text)
+    if not jd_sents:
+        return []
+    weights = get_jd_profile(jd_sents, job_text, role, seniority).sentence_weights
+    return get_resume_library().user(user_id).search(encode_sentences(jd_sents), weights, top_n)
@@ -1,23 +1,50 @@
 from __future__ import annotations
-from typing import Optional, List
-from fastapi import FastAPI, HTTPException, Depends, status
+from datetime import datetime
+from typing import Optional, List, Tuple
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Depends, status
 from pydantic import BaseModel, EmailStr
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 import asyncio
+import base64
+import json
+import logging
 import os
+import re
+import threading
+import time
 
-from .analyzer import timed_analysis
-from .rewrite import rewrite_bullet
+from .analyzer import (
+    get_cross_batcher, get_embed_batcher, iter_batch_analysis, iter_staged_analysis, jd_profile_cache,
+    prepare_pairs, score_prepared, timed_analysis,
+)
+from .embedding_cache import get_embedding_cache
+from .executor import ExecutorSaturated, get_executor, get_rewrite_executor
+from .grammar import get_grammar_pool, grammar_cache
+from .rewrite import rewrite_bullet, rewrite_bullets, rewrite_cache
 from .database import Base, engine, SessionLocal
-from .models import User, Analysis
+from .jobs import (
+    JOB_WORKERS, TERMINAL_STATUSES, ClaimedJob, WorkerPool, cancel_job, job_handler, running_job_ids, submit_job,
+)
+from .library import get_resume_library, index_resumes, search_library
+from .metrics import (
+    METRICS_ENABLED, MetricsMiddleware, analysis_rejected, analysis_timeouts, counter_family, histogram_family,
+    observe_stage, registry,
+)
+from .models import User, Analysis, Job, LibraryResume
+from .result_cache import get_result_cache
 from .auth import (
     get_db, hash_password, verify_password,
     create_access_token, get_current_user
 )
-from .summary import summarize_text
+from .summary import summarize_text, summary_cache
+from .warmup import get_warmup
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordRequestForm
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI()
 app.add_middleware(
@@ -25,9 +52,57 @@ app.add_middleware(
     allow_origins=["http://localhost:5173","http://127.0.0.1:5173"],
     allow_credentials=True, allow_methods=["*"], allow_headers=["*"],
 )
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 Base.metadata.create_all(bind=engine)
 
+ANALYSIS_TIMEOUT = float(os.getenv("ANALYSIS_TIMEOUT", "2.0"))
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+SEARCH_MAX_RESULTS = int(os.getenv("SEARCH_MAX_RESULTS", "50"))
+REWRITE_MAX_BULLETS = int(os.getenv("REWRITE_MAX_BULLETS", "100"))
+SUMMARY_MAX_LENGTH = int(os.getenv("SUMMARY_MAX_LENGTH", "512"))
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "50"))
+HISTORY_MAX_PAGE_SIZE = int(os.getenv("HISTORY_MAX_PAGE_SIZE", "200"))
+JOB_MAX_PRIORITY = int(os.getenv("JOB_MAX_PRIORITY", "10"))
+# Seconds between status checks of a streamed job.
+JOB_STREAM_INTERVAL = float(os.getenv("JOB_STREAM_INTERVAL", "0.25"))
+
+job_workers = WorkerPool(JOB_WORKERS)
+
+
+@app.on_event("startup")
+def start_warmup():
+    get_warmup().start()
+    get_result_cache().purge_stale()
+    get_result_cache().start_pruning()
+
+
+@app.on_event("startup")
+def warm_resume_library():
+    """Build large libraries' IVF indexes off the request path."""
+    threading.Thread(target=_warm_library, name="library-warmup", daemon=True).start()
+
+
+def _warm_library() -> None:
+    try:
+        get_resume_library().warm()
+    except Exception:
+        logger.exception("Could not build the resume library indexes")
+
+
+@app.on_event("startup")
+def start_job_workers():
+    job_workers.start()
+
+
+@app.on_event("shutdown")
+def shutdown_executor():
+    job_workers.stop()
+    get_executor().shutdown()
+    get_rewrite_executor().shutdown()
+    get_grammar_pool().close()
+
 
 # ---------- Schemas ----------
 class AnalysisRequest(BaseModel):
@@ -36,6 +111,24 @@ class AnalysisRequest(BaseModel):
     role: Optional[str] = None
     seniority: Optional[str] = None
     emphasis: Optional[List[str]] = None
+    save_to_library: bool = False  # keep the resume text for /search; off by default
+
+class BatchAnalysisRequest(BaseModel):
+    """One resume against many JDs, or one JD against many resumes."""
+    resume_text: Optional[str] = None
+    job_descriptions: Optional[List[str]] = None
+    job_description: Optional[str] = None
+    resumes: Optional[List[str]] = None
+    role: Optional[str] = None
+    seniority: Optional[str] = None
+    save_to_library: bool = False
+
+class SearchRequest(BaseModel):
+    job_description: str
+    top_n: int = 10
+    rerank: bool = False
+    role: Optional[str] = None
+    seniority: Optional[str] = None
 
 class RegisterRequest(BaseModel):
     email: str
@@ -45,6 +138,9 @@ class RegisterRequest(BaseModel):
 class RewriteRequest(BaseModel):
     text: str
 
+class RewriteBatchRequest(BaseModel):
+    bullets: List[str]
+
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
@@ -52,6 +148,15 @@ class TokenResponse(BaseModel):
 
 class SummarizeRequest(BaseModel):
     text: str
+    max_length: int = 130
+    min_length: int = 30
+
+class JobRequest(BaseModel):
+    """``payload`` is the body the synchronous endpoint for ``kind`` takes."""
+    kind: str
+    payload: dict
+    priority: int = 0
+    max_attempts: Optional[int] = None
 
 # ---------- Health ----------
 @app.get("/")
@@ -59,6 +164,13 @@ def root():
     return {"message": "ResumeBoost backend is running"}
 
 
+@app.get("/ready")
+def ready():
+    """Readiness probe: 200 once every warmup model is loaded and has run one inference."""
+    report = get_warmup().report()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+
 @app.get("/favicon.ico", include_in_schema=False)
 async def favicon() -> FileResponse:
     """Serve the favicon for Vercel deployments."""
@@ -66,19 +178,108 @@ async def favicon() -> FileResponse:
     return FileResponse(file_path)
 
 
+@app.get("/stats")
+def cache_stats():
+    """Cache hit/miss counters, memory footprint and batching histograms for capacity planning."""
+    return {
+        "embedding_cache": get_embedding_cache().stats(),
+        "jd_profile_cache": jd_profile_cache.stats(),
+        "result_cache": get_result_cache().stats(),
+        "grammar_cache": grammar_cache.stats(),
+        "rewrite_cache": rewrite_cache.stats(),
+        "summary_cache": summary_cache.stats(),
+        "grammar_pool": get_grammar_pool().stats(),
+        "embed_batcher": get_embed_batcher().stats(),
+        "cross_batcher": get_cross_batcher().stats(),
+    }
+
+
+@registry.collector
+def _component_metrics():
+    """Counters and histograms kept by the caches, batchers, grammar pool and executor."""
+    embedding = get_embedding_cache().stats()
+    result = get_result_cache().stats()
+    caches = {
+        "embedding": (embedding["hits"] + embedding["disk_hits"], embedding["misses"]),
+        "jd_profile": (jd_profile_cache.hits, jd_profile_cache.misses),
+        "grammar": (grammar_cache.hits, grammar_cache.misses),
+        "rewrite": (rewrite_cache.hits, rewrite_cache.misses),
+        "summary": (summary_cache.hits, summary_cache.misses),
+        "result": (result["memory_hits"] + result["shared_hits"] + result["coalesced"], result["misses"]),
+    }
+    batchers = {"embedder": get_embed_batcher().stats(), "cross_encoder": get_cross_batcher().stats()}
+    return [
+        counter_family("resumeboost_cache_hits_total", "Cache lookups answered from the cache", "cache",
+                       {name: hits for name, (hits, _) in caches.items()}),
+        counter_family("resumeboost_cache_misses_total", "Cache lookups that had to compute", "cache",
+                       {name: misses for name, (_, misses) in caches.items()}),
+        histogram_family("resumeboost_model_batch_size", "Inputs per model forward pass", "model",
+                         {name: stats["batch_size"] for name, stats in batchers.items()}),
+        histogram_family("resumeboost_model_queue_wait_ms", "Milliseconds inputs waited for a batch", "model",
+                         {name: stats["queue_wait_ms"] for name, stats in batchers.items()}),
+        counter_family("resumeboost_grammar_timeouts_total", "Grammar checks skipped for time", "pool",
+                       {"languagetool": get_grammar_pool().timeouts}),
+        ("resumeboost_executor_pending", "gauge", "Analyses admitted and not finished", [({}, get_executor().pending)]),
+    ]
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint."""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
 # ---------- Paraphrasing and Rewrite ----------
 @app.post("/rewrite")
 async def rewrite_endpoint(req: RewriteRequest):
     if not req.text.strip():
         raise HTTPException(status_code=400, detail="Text is required")
-    return {"alternatives": rewrite_bullet(req.text)}
+    executor = get_rewrite_executor()
+    try:
+        async with executor.session():
+            alternatives = await executor.run(rewrite_bullet, req.text)
+    except ExecutorSaturated as exc:
+        raise _queue_full(exc, "Rewrite queue is full")
+    return {"alternatives": alternatives}
+
+def _check_rewrite_batch(req: RewriteBatchRequest) -> None:
+    if not req.bullets or any(not b.strip() for b in req.bullets):
+        raise HTTPException(status_code=400, detail="Bullets must not be empty")
+    if len(req.bullets) > REWRITE_MAX_BULLETS:
+        raise HTTPException(status_code=400, detail=f"At most {REWRITE_MAX_BULLETS} bullets per request")
+
+@app.post("/rewrite/batch")
+async def rewrite_batch(req: RewriteBatchRequest):
+    """Alternatives for many bullets at once, in request order, generated in padded batches."""
+    _check_rewrite_batch(req)
+    executor = get_rewrite_executor()
+    try:
+        async with executor.session():
+            alternatives = await executor.run(rewrite_bullets, req.bullets)
+    except ExecutorSaturated as exc:
+        raise _queue_full(exc, "Rewrite queue is full")
+    return {"alternatives": alternatives}
 
 # ---------- Summarization ----------
-@app.post("/summarize")
-def summarize(data: SummarizeRequest):
+def _check_summary(data: SummarizeRequest) -> None:
     if not data.text.strip():
         raise HTTPException(status_code=400, detail="Text is required")
-    summary = summarize_text(data.text)
+    if not 0 < data.min_length <= data.max_length <= SUMMARY_MAX_LENGTH:
+        raise HTTPException(
+            status_code=400, detail=f"Need 0 < min_length <= max_length <= {SUMMARY_MAX_LENGTH}"
+        )
+
+@app.post("/summarize")
+async def summarize(data: SummarizeRequest):
+    _check_summary(data)
+    executor = get_executor()
+    try:
+        async with executor.session():
+            summary = await executor.run(summarize_text, data.text, data.max_length, data.min_length)
+    except ExecutorSaturated as exc:
+        raise _queue_full(exc, "Summary queue is full")
     return {"summary": summary}
 
 
@@ -105,33 +306,23 @@ def verify_token(me: User = Depends(get_current_user)):
     return {"email": me.email}
 
 # ---------- Business endpoints (protected) ----------
-@app.post("/analyze")
-async def analyze_resume(req: AnalysisRequest, db: Session = Depends(get_db), me: User = Depends(get_current_user)):
-    if not req.resume_text.strip() or not req.job_description.strip():
-        raise HTTPException(status_code=400, detail="Resume text and job description are required")
+def _preview(resume_text: str) -> str:
+    return (resume_text[:100] + "...") if len(resume_text) > 100 else resume_text
 
-    try:
-        result = await timed_analysis(
-            req.resume_text,
-            req.job_description,
-            req.role,
-            req.seniority,
-            timeout=2.0,
-        )
-    except asyncio.TimeoutError:
-        raise HTTPException(status_code=503, detail="Analysis timed out")
 
-    analysis = Analysis(
+def _new_analysis(req: AnalysisRequest, result: dict, user_id: int) -> Analysis:
+    return Analysis(
         job_title=(req.role or "Target Position"),
         score=int(result["score"]),
         matched_skills=result["matched_skills"],
         improvement_areas=result["suggestions"],
         highlights=result["suggestions"],
-        resume_preview=(req.resume_text[:100] + "...") if len(req.resume_text) > 100 else req.resume_text,
-        user_id=me.id,
+        resume_preview=_preview(req.resume_text),
+        user_id=user_id,
     )
-    db.add(analysis); db.commit(); db.refresh(analysis)
 
+
+def _analysis_response(analysis: Analysis, result: dict) -> dict:
     return {
         "id": str(analysis.id),
         "createdAt": analysis.created_at.isoformat(),
@@ -145,20 +336,434 @@ async def analyze_resume(req: AnalysisRequest, db: Session = Depends(get_db), me
         "weakRequirements": result.get("weak_requirements"),
         "evidence": result.get("evidence"),
         "grammarSuggestions": result.get("grammar"),
+        "timingsMs": result.get("timings"),
+    }
+
+
+def _check_analysis(req: AnalysisRequest) -> None:
+    if not req.resume_text.strip() or not req.job_description.strip():
+        raise HTTPException(status_code=400, detail="Resume text and job description are required")
+
+
+def _index_library(user_id: int, items: List[tuple]) -> None:
+    """Add analysed resumes to the search library; a failure must not fail the analysis."""
+    try:
+        index_resumes(user_id, items)
+    except Exception:
+        logger.exception("Could not add resumes to the library")
+
+
+def _queue_full(exc: ExecutorSaturated, message: str = "Analysis queue is full") -> HTTPException:
+    analysis_rejected.inc()
+    return HTTPException(
+        status_code=503,
+        detail={"message": message, "queue_position": exc.position, "queue_limit": exc.limit},
+        headers={"Retry-After": "1"},
+    )
+
+@app.post("/analyze")
+async def analyze_resume(
+    req: AnalysisRequest,
+    background: BackgroundTasks,
+    db: Session = Depends(get_db),
+    me: User = Depends(get_current_user),
+):
+    _check_analysis(req)
+
+    try:
+        result, cached = await get_result_cache().get_or_compute(
+            (req.resume_text, req.job_description, req.role, req.seniority),
+            lambda: timed_analysis(
+                req.resume_text,
+                req.job_description,
+                req.role,
+                req.seniority,
+                timeout=ANALYSIS_TIMEOUT,
+                snapshot_key=str(me.id),
+            ),
+            cacheable=lambda r: not r.get("degraded"),
+        )
+    except asyncio.TimeoutError:
+        analysis_timeouts.inc()
+        raise HTTPException(status_code=503, detail="Analysis timed out")
+    except ExecutorSaturated as exc:
+        raise _queue_full(exc)
+
+    start = time.perf_counter()
+    analysis = _new_analysis(req, result, me.id)
+    db.add(analysis); db.commit(); db.refresh(analysis)
+    observe_stage("db_commit", time.perf_counter() - start)
+    if req.save_to_library:
+        background.add_task(_index_library, me.id, [(analysis.id, req.resume_text)])
+
+    return {
+        **_analysis_response(analysis, result),
+        "cached": cached,
+        "recomputedSentences": 0 if cached else result.get("recomputed_sentences"),
+        "degradedStages": result.get("degraded") or {},
     }
 
+def _save_batch(analyses: List[Analysis]) -> List[int]:
+    db = SessionLocal()
+    try:
+        db.add_all(analyses); db.commit()
+        return [a.id for a in analyses]
+    finally:
+        db.close()
+
+
+@app.post("/analyze/batch")
+async def analyze_batch(req: BatchAnalysisRequest, me: User = Depends(get_current_user)):
+    """Stream NDJSON results as pairs finish, then a ranking line once all rows are saved."""
+    if req.resume_text and req.job_descriptions and not (req.job_description or req.resumes):
+        resumes, jobs = [req.resume_text], req.job_descriptions
+    elif req.job_description and req.resumes and not (req.resume_text or req.job_descriptions):
+        resumes, jobs = req.resumes, [req.job_description]
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail="Provide resume_text with job_descriptions, or job_description with resumes",
+        )
+    if any(not t.strip() for t in resumes + jobs):
+        raise HTTPException(status_code=400, detail="Resume text and job descriptions must not be empty")
+    if max(len(resumes), len(jobs)) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_ITEMS} items per batch")
+
+    try:
+        slot = get_executor().slot()  # released by stream(), or when an unstarted stream is dropped
+    except ExecutorSaturated as exc:
+        raise _queue_full(exc)
+
+    async def stream():
+        analyses: List[Optional[Analysis]] = [None] * (len(resumes) * len(jobs))
+        try:
+            async for index, result in iter_batch_analysis(resumes, jobs, req.role, req.seniority):
+                resume = resumes[index // len(jobs)]
+                analyses[index] = Analysis(
+                    job_title=(req.role or "Target Position"),
+                    score=int(result["score"]),
+                    matched_skills=result["matched_skills"],
+                    improvement_areas=result["suggestions"],
+                    highlights=result["suggestions"],
+                    resume_preview=_preview(resume),
+                    user_id=me.id,
+                )
+                yield json.dumps({
+                    "index": index,
+                    "score": result["score"],
+                    "breakdown": result["breakdown"],
+                    "matchedSkills": result["matched_skills"],
+                    "missingSkills": result["missing_skills"],
+                    "improvementAreas": result["suggestions"],
+                    "weakRequirements": result["weak_requirements"],
+                }) + "\n"
+        finally:
+            slot.release()
+        ids = await run_in_threadpool(_save_batch, analyses)
+        if req.save_to_library:
+            items = [(ids[i * len(jobs)], resume) for i, resume in enumerate(resumes)]
+            await run_in_threadpool(_index_library, me.id, items)
+        ranking = sorted(
+            ({"index": i, "id": str(ids[i]), "score": a.score} for i, a in enumerate(analyses)),
+            key=lambda r: r["score"],
+            reverse=True,
+        )
+        yield json.dumps({"done": True, "ranking": ranking}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+def _save_analysis(analysis: Analysis) -> Analysis:
+    db = SessionLocal()
+    try:
+        db.add(analysis); db.commit(); db.refresh(analysis)
+        return analysis
+    finally:
+        db.close()
+
+
+def _camel(key: str) -> str:
+    return re.sub(r"_([a-z])", lambda m: m.group(1).upper(), key)
+
+
+@app.post("/analyze/stream")
+async def analyze_stream(req: AnalysisRequest, me: User = Depends(get_current_user)):
+    """Stream NDJSON stage results (skills, semantic, cross_encoder, grammar), then the saved analysis."""
+    _check_analysis(req)
+
+    try:
+        slot = get_executor().slot()  # released by stream(), or when an unstarted stream is dropped
+    except ExecutorSaturated as exc:
+        raise _queue_full(exc)
+
+    async def stream():
+        result = None
+        try:
+            async for event in iter_staged_analysis(
+                req.resume_text, req.job_description, req.role, req.seniority, snapshot_key=str(me.id)
+            ):
+                if event["stage"] == "result":
+                    result = event
+                else:
+                    yield json.dumps({_camel(k): v for k, v in event.items()}) + "\n"
+        finally:
+            slot.release()
+        analysis = await run_in_threadpool(_save_analysis, _new_analysis(req, result, me.id))
+        if req.save_to_library:
+            await run_in_threadpool(_index_library, me.id, [(analysis.id, req.resume_text)])
+        yield json.dumps({
+            "stage": "done",
+            **_analysis_response(analysis, result),
+            "skippedStages": result["skipped_stages"],
+        }) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+# ---------- Background jobs ----------
+# kind -> (payload schema, the synchronous endpoint's validation)
+JOB_KINDS = {
+    "analyze": (AnalysisRequest, _check_analysis),
+    "rewrite": (RewriteBatchRequest, _check_rewrite_batch),
+    "summarize": (SummarizeRequest, _check_summary),
+}
+
+
+@job_handler("analyze")
+def _analyze_jobs(jobs: List[ClaimedJob]) -> List[dict]:
+    """Full-quality analyses (no deadline); all texts are parsed and embedded together."""
+    reqs = [AnalysisRequest(**job.payload) for job in jobs]
+    prepared = prepare_pairs([(r.resume_text, r.job_description) for r in reqs])
+    results = [score_prepared(*item, r.role, r.seniority) for item, r in zip(prepared, reqs)]
+    analyses = [_new_analysis(r, result, job.user_id) for r, result, job in zip(reqs, results, jobs)]
+    db = SessionLocal()
+    try:
+        live = running_job_ids(db, [job.id for job in jobs])  # nothing is saved for cancelled jobs
+        kept = [(job, r, a) for job, r, a in zip(jobs, reqs, analyses) if job.id in live]
+        db.add_all(a for _, _, a in kept); db.commit()
+        for _, _, analysis in kept:
+            db.refresh(analysis)
+    finally:
+        db.close()
+    by_user: dict = {}
+    for _, r, analysis in kept:
+        if r.save_to_library:
+            by_user.setdefault(analysis.user_id, []).append((analysis.id, r.resume_text))
+    for user_id, items in by_user.items():
+        _index_library(user_id, items)
+    return [
+        _analysis_response(a, result) if job.id in live else None
+        for job, a, result in zip(jobs, analyses, results)
+    ]
+
+
+@job_handler("rewrite")
+def _rewrite_jobs(jobs: List[ClaimedJob]) -> List[dict]:
+    """Every queued job's bullets go through one ``rewrite_bullets`` call."""
+    groups = [job.payload["bullets"] for job in jobs]
+    alternatives = rewrite_bullets([b for group in groups for b in group])
+    results, start = [], 0
+    for group in groups:
+        results.append({"alternatives": alternatives[start:start + len(group)]})
+        start += len(group)
+    return results
+
+
+@job_handler("summarize")
+def _summarize_jobs(jobs: List[ClaimedJob]) -> List[dict]:
+    return [
+        {"summary": summarize_text(job.payload["text"], job.payload["max_length"], job.payload["min_length"])}
+        for job in jobs
+    ]
+
+
+def _job_response(job: Job) -> dict:
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "priority": job.priority,
+        "attempts": job.attempts,
+        "maxAttempts": job.max_attempts,
+        "error": job.error,
+        "createdAt": job.created_at.isoformat() if job.created_at else None,
+        "startedAt": job.started_at.isoformat() if job.started_at else None,
+        "finishedAt": job.finished_at.isoformat() if job.finished_at else None,
+        "result": job.result,
+    }
+
+
+def _own_job(db: Session, job_id: str, user_id: int) -> Job:
+    job = db.query(Job).filter(Job.id == job_id, Job.user_id == user_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.post("/jobs", status_code=202)
+def submit(req: JobRequest, db: Session = Depends(get_db), me: User = Depends(get_current_user)):
+    """Queue an analyze, rewrite or summarize request; poll ``/jobs/{id}`` for the result."""
+    if req.kind not in JOB_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of {sorted(JOB_KINDS)}")
+    if abs(req.priority) > JOB_MAX_PRIORITY:
+        raise HTTPException(status_code=400, detail=f"priority must be within ±{JOB_MAX_PRIORITY}")
+    if req.max_attempts is not None and not 1 <= req.max_attempts <= 10:
+        raise HTTPException(status_code=400, detail="max_attempts must be between 1 and 10")
+    schema, check = JOB_KINDS[req.kind]
+    try:
+        payload = schema(**req.payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    check(payload)
+    job = submit_job(db, me.id, req.kind, payload.model_dump(), req.priority, req.max_attempts)
+    return _job_response(job)
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str, db: Session = Depends(get_db), me: User = Depends(get_current_user)):
+    return _job_response(_own_job(db, job_id, me.id))
+
+
+@app.post("/jobs/{job_id}/cancel")
+def cancel(job_id: str, db: Session = Depends(get_db), me: User = Depends(get_current_user)):
+    return _job_response(cancel_job(db, _own_job(db, job_id, me.id)))
+
+
+def _job_snapshot(job_id: str, user_id: int) -> Optional[dict]:
+    db = SessionLocal()
+    try:
+        job = db.query(Job).filter(Job.id == job_id, Job.user_id == user_id).first()
+        return _job_response(job) if job else None
+    finally:
+        db.close()
+
+
+@app.get("/jobs/{job_id}/stream")
+async def stream_job(job_id: str, me: User = Depends(get_current_user)):
+    """Stream an NDJSON line per status change; the last one is the finished job."""
+    first = await run_in_threadpool(_job_snapshot, job_id, me.id)
+    if first is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def stream():
+        snapshot, last = first, None
+        while snapshot is not None:
+            if (snapshot["status"], snapshot["attempts"]) != last:
+                last = (snapshot["status"], snapshot["attempts"])
+                yield json.dumps(snapshot) + "\n"
+            if snapshot["status"] in TERMINAL_STATUSES:
+                return
+            await asyncio.sleep(JOB_STREAM_INTERVAL)
+            snapshot = await run_in_threadpool(_job_snapshot, job_id, me.id)
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.post("/search")
+async def search_resumes(req: SearchRequest, db: Session = Depends(get_db), me: User = Depends(get_current_user)):
+    """Rank the caller's stored resumes against a JD, optionally re-scored with the full analysis."""
+    if not req.job_description.strip():
+        raise HTTPException(status_code=400, detail="Job description is required")
+    if not 1 <= req.top_n <= SEARCH_MAX_RESULTS:
+        raise HTTPException(status_code=400, detail=f"top_n must be between 1 and {SEARCH_MAX_RESULTS}")
+
+    executor = get_executor()
+    start = time.perf_counter()
+    try:
+        async with executor.session():
+            hits = await executor.run(
+                search_library, me.id, req.job_description, req.role, req.seniority, req.top_n,
+            )
+    except ExecutorSaturated as exc:
+        raise _queue_full(exc)
+    search_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    rows = {
+        r.analysis_id: r
+        for r in db.query(LibraryResume).filter(
+            LibraryResume.user_id == me.id, LibraryResume.analysis_id.in_([doc for doc, _ in hits])
+        )
+    }
+    results = []
+    for doc, similarity in hits:
+        row = rows.get(doc)
+        if row is None:
+            continue
+        results.append({"id": str(doc), "similarity": round(similarity, 4), "resumeText": row.resume_text})
+
+    if req.rerank and results:
+        try:
+            executor.admit()
+        except ExecutorSaturated as exc:
+            raise _queue_full(exc)
+        try:
+            async for index, result in iter_batch_analysis(
+                [r["resumeText"] for r in results], [req.job_description], req.role, req.seniority
+            ):
+                results[index].update(score=result["score"], breakdown=result["breakdown"])
+        finally:
+            executor.release()
+        results.sort(key=lambda r: r["score"], reverse=True)
+
+    for r in results:
+        r["resumePreview"] = _preview(r.pop("resumeText"))
+    return {"results": results, "searchMs": search_ms, "reranked": bool(req.rerank and results)}
+
+def _encode_cursor(created_at: datetime, analysis_id: int) -> str:
+    raw = f"{created_at.isoformat()},{analysis_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, analysis_id = raw.rsplit(",", 1)
+        return datetime.fromisoformat(created_at), int(analysis_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @app.get("/history")
-def get_history(db: Session = Depends(get_db), me: User = Depends(get_current_user)):
-    items = (
-        db.query(Analysis)
+def get_history(
+    limit: int = HISTORY_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    min_score: Optional[int] = None,
+    max_score: Optional[int] = None,
+    role: Optional[str] = None,
+    db: Session = Depends(get_db),
+    me: User = Depends(get_current_user),
+):
+    """Newest-first page of the caller's analyses; pass ``nextCursor`` back as ``cursor`` for the next one.
+
+    Pages are keyset-paginated on ``(created_at, id)`` along
+    ``ix_analyses_user_created``, so a deep page costs the same as the first,
+    and only the listed columns are read.
+    """
+    if not 1 <= limit <= HISTORY_MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {HISTORY_MAX_PAGE_SIZE}")
+    query = (
+        db.query(Analysis.id, Analysis.created_at, Analysis.job_title, Analysis.score)
           .filter(Analysis.user_id == me.id)
-          .order_by(Analysis.created_at.desc())
-          .all()
     )
-    return {"items": [
-        {"id": str(a.id), "createdAt": a.created_at.isoformat(), "role": a.job_title, "score": a.score}
-        for a in items
-    ]}
+    if role is not None:
+        query = query.filter(Analysis.job_title == role)
+    if min_score is not None:
+        query = query.filter(Analysis.score >= min_score)
+    if max_score is not None:
+        query = query.filter(Analysis.score <= max_score)
+    if cursor:
+        created_at, last_id = _decode_cursor(cursor)
+        # The first condition bounds the index range; the second only breaks same-timestamp ties.
+        query = query.filter(
+            Analysis.created_at <= created_at,
+            or_(Analysis.created_at < created_at, Analysis.id < last_id),
+        )
+    rows = query.order_by(Analysis.created_at.desc(), Analysis.id.desc()).limit(limit + 1).all()
+    next_cursor = _encode_cursor(rows[limit - 1].created_at, rows[limit - 1].id) if len(rows) > limit else None
+    return {
+        "items": [
+            {"id": str(r.id), "createdAt": r.created_at.isoformat(), "role": r.job_title, "score": r.score}
+            for r in rows[:limit]
+        ],
+        "nextCursor": next_cursor,
+    }
 
 @app.get("/history/{analysis_id}")
 def get_history_item(analysis_id: int, db: Session = Depends(get_db), me: User = Depends(get_current_user)):
@@ -181,5 +786,7 @@ def delete_history_item(analysis_id: int, db: Session = Depends(get_db), me: Use
     a = db.query(Analysis).filter(Analysis.id == analysis_id, Analysis.user_id == me.id).first()
     if not a:
         raise HTTPException(status_code=404, detail="Analysis not found")
+    db.query(LibraryResume).filter(LibraryResume.analysis_id == a.id).delete()
     db.delete(a); db.commit()
+    get_resume_library().remove(me.id, a.id)
     return {"status": "deleted"}
@@ -0,0 +1,249 @@
+"""Prometheus text-format metrics and optional per-request trace spans."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .batching import Histogram
+
+# ----- Config -----
+# 0 turns every recording call into an early return and hides /metrics.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+# 1 logs one JSON line of stage spans per analysis on the "resumeboost.trace" logger.
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", "0") == "1"
+
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10)
+
+trace_logger = logging.getLogger("resumeboost.trace")
+
+Labels = Tuple[str, ...]
+# (name, type, help, [(labels, value or Histogram.snapshot())])
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], Any]]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Dict[str, str], extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(labels.items()) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in items) + "}"
+
+
+def _format(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Labelled:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str]) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _labeldict(self, key: Labels) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+
+class Counter(_Labelled):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        if not METRICS_ENABLED:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> List[Tuple[Dict[str, str], Any]]:
+        with self._lock:
+            return [(self._labeldict(k), v) for k, v in self._values.items()]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class LabelledHistogram(_Labelled):
+    """One :class:`~backend.batching.Histogram` per label combination."""
+
+    type = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = SECONDS_BUCKETS
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[Labels, Histogram] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        if not METRICS_ENABLED:
+            return
+        histogram = self._histograms.get(labels)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(labels, Histogram(self.buckets))
+        histogram.observe(value)
+
+    def samples(self) -> List[Tuple[Dict[str, str], Any]]:
+        with self._lock:
+            items = list(self._histograms.items())
+        return [(self._labeldict(k), h.snapshot()) for k, h in items]
+
+
+class Registry:
+    """Metrics owned by this module plus collectors that read other components' stats at scrape time."""
+
+    def __init__(self) -> None:
+        self._metrics: List[_Labelled] = []
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labelnames))
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = SECONDS_BUCKETS
+    ) -> LabelledHistogram:
+        return self._add(LabelledHistogram(name, help, labelnames, buckets))
+
+    def _add(self, metric: Any) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, fn: Callable[[], Iterable[Family]]) -> Callable[[], Iterable[Family]]:
+        """Register ``fn``; it returns metric families computed when scraped."""
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        """Prometheus text exposition format, version 0.0.4."""
+        families: List[Family] = [(m.name, m.type, m.help, m.samples()) for m in self._metrics]
+        for collect in self._collectors:
+            families.extend(collect())
+        lines: List[str] = []
+        for name, kind, help, samples in families:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                if kind != "histogram":
+                    lines.append(f"{name}{_labels(labels)} {_format(value)}")
+                    continue
+                for bound, count in value["buckets"].items():
+                    lines.append(f"{name}_bucket{_labels(labels, ('le', bound))} {count}")
+                lines.append(f"{name}_sum{_labels(labels)} {_format(float(value['sum']))}")
+                lines.append(f"{name}_count{_labels(labels)} {value['count']}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+request_seconds = registry.histogram(
+    "resumeboost_http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status")
+)
+requests_in_flight = registry.gauge("resumeboost_http_requests_in_flight", "HTTP requests being served")
+stage_seconds = registry.histogram(
+    "resumeboost_analysis_stage_duration_seconds", "Time spent per analysis stage", ("stage",)
+)
+analysis_timeouts = registry.counter("resumeboost_analysis_timeouts_total", "Analyses that hit ANALYSIS_TIMEOUT")
+analysis_rejected = registry.counter("resumeboost_analysis_rejected_total", "Requests refused by a full queue")
+degraded_stages = registry.counter(
+    "resumeboost_analysis_degraded_total", "Stages run reduced or skipped to meet a deadline", ("stage", "mode")
+)
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    stage_seconds.observe(seconds, stage)
+
+
+def record_degraded(degraded: Dict[str, str]) -> None:
+    for stage, mode in degraded.items():
+        degraded_stages.inc(stage, "skipped" if mode == "skipped" else "reduced")
+
+
+def counter_family(name: str, help: str, label: str, values: Dict[str, float]) -> Family:
+    return (name, "counter", help, [({label: k}, v) for k, v in values.items()])
+
+
+def histogram_family(name: str, help: str, label: str, snapshots: Dict[str, Dict]) -> Family:
+    return (name, "histogram", help, [({label: k}, v) for k, v in snapshots.items()])
+
+
+class Trace:
+    """Stage spans of one request, logged as a single JSON line when finished."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.start = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def span(self, stage: str, started: float, seconds: float) -> None:
+        with self._lock:
+            self.spans.append({
+                "stage": stage,
+                "start_ms": round((started - self.start) * 1000, 3),
+                "duration_ms": round(seconds * 1000, 3),
+                "thread": threading.current_thread().name,
+            })
+
+    def finish(self, **fields: Any) -> None:
+        trace_logger.info(json.dumps({
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "total_ms": round((time.perf_counter() - self.start) * 1000, 3),
+            "spans": self.spans,
+            **fields,
+        }))
+
+
+def start_trace(name: str) -> Optional[Trace]:
+    return Trace(name) if TRACE_ENABLED else None
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request by its route template (e.g. ``/history/{analysis_id}``)."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        start = time.perf_counter()
+
+        async def send_status(message: Dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            requests_in_flight.dec()
+            route = getattr(scope.get("route"), "path", "unmatched")
+            request_seconds.observe(time.perf_counter() - start, scope["method"], route, str(status))
@@ -0,0 +1,270 @@
+"""One process owns the transformer models; API workers call it over a Unix socket.
+
+With ``MODEL_SERVER_SOCKET`` unset every worker loads its own models, as
+before. When it is set, ``get_embedder``, ``get_cross_encoder``,
+``get_summarizer`` and T5 generation in ``rewrite`` return proxies that
+forward calls to ``python -m backend.model_server``. That process loads
+each model once for any number of gunicorn/uvicorn workers. spaCy stays in
+the workers: skill extraction needs the ``Doc`` objects locally, and the
+pipeline is small next to the transformers.
+
+Frames are a 4-byte big-endian length followed by JSON. An array reply is a
+JSON header with ``dtype`` and ``shape`` followed by the raw bytes: the
+server sends straight from the array's buffer, and the client allocates the
+result array and ``recv_into``-s it, so embeddings are never pickled,
+base64-encoded or copied through an intermediate ``bytes``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# ----- Config -----
+# Path of the model server's socket; unset loads models in every worker process.
+MODEL_SERVER_SOCKET = os.getenv("MODEL_SERVER_SOCKET") or None
+MODEL_SERVER_TIMEOUT = float(os.getenv("MODEL_SERVER_TIMEOUT", "60"))
+DEFAULT_SOCKET = "/tmp/resumeboost-models.sock"
+
+_LENGTH = struct.Struct("!I")
+
+
+class RemoteModelError(RuntimeError):
+    """The model server raised while handling a call."""
+
+
+def _send_json(sock: socket.socket, obj: Any) -> None:
+    data = json.dumps(obj).encode()
+    sock.sendall(_LENGTH.pack(len(data)) + data)
+
+
+def _recv_into(sock: socket.socket, view: memoryview) -> None:
+    while view:
+        received = sock.recv_into(view)
+        if not received:
+            raise ConnectionError("model server connection closed")
+        view = view[received:]
+
+
+def _recv_json(sock: socket.socket) -> Any:
+    head = bytearray(_LENGTH.size)
+    _recv_into(sock, memoryview(head))
+    body = bytearray(_LENGTH.unpack(head)[0])
+    _recv_into(sock, memoryview(body))
+    return json.loads(body)
+
+
+# ---------------------------------------------------------------------------
+# Client side
+# ---------------------------------------------------------------------------
+
+
+class ModelClient:
+    """Calls the model server; each thread keeps its own connection."""
+
+    def __init__(self, path: str, timeout: float = MODEL_SERVER_TIMEOUT) -> None:
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+            self._local.sock = sock
+        return sock
+
+    def close(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Run ``method`` on the server; a connection dropped by a server restart is retried once."""
+        for attempt in range(2):
+            try:
+                return self._call(method, args, kwargs)
+            except (ConnectionError, BrokenPipeError):
+                self.close()
+                if attempt:
+                    raise
+            except OSError:
+                self.close()
+                raise
+
+    def _call(self, method: str, args: Sequence[Any], kwargs: Dict[str, Any]) -> Any:
+        sock = self._connection()
+        _send_json(sock, {"method": method, "args": list(args), "kwargs": kwargs})
+        header = _recv_json(sock)
+        if "error" in header:
+            raise RemoteModelError(header["error"])
+        if "array" in header:
+            out = np.empty(header["array"]["shape"], dtype=np.dtype(header["array"]["dtype"]))
+            if out.nbytes:
+                _recv_into(sock, memoryview(out).cast("B"))
+            return out
+        return header["result"]
+
+
+@lru_cache(maxsize=1)
+def get_client() -> Optional[ModelClient]:
+    """Client for the model server, or ``None`` when this process loads the models itself."""
+    return ModelClient(MODEL_SERVER_SOCKET) if MODEL_SERVER_SOCKET else None
+
+
+class RemoteEmbedder:
+    """``SentenceTransformer.encode`` served by the model server."""
+
+    def __init__(self, client: ModelClient) -> None:
+        self.client = client
+
+    def encode(
+        self, sentences: Sequence[str], normalize_embeddings: bool = True, batch_size: int = 32, **_kw: Any
+    ) -> np.ndarray:
+        return self.client.call(
+            "encode", list(sentences), normalize_embeddings=normalize_embeddings, batch_size=batch_size
+        )
+
+
+class RemoteCrossEncoder:
+    """``CrossEncoder.predict`` served by the model server."""
+
+    def __init__(self, client: ModelClient) -> None:
+        self.client = client
+
+    def predict(self, pairs: Sequence[Sequence[str]], batch_size: int = 32, **_kw: Any) -> np.ndarray:
+        return self.client.call("predict", [list(p) for p in pairs], batch_size=batch_size)
+
+
+class RemoteSummarizer:
+    """The summarization pipeline served by the model server."""
+
+    def __init__(self, client: ModelClient) -> None:
+        self.client = client
+
+    def __call__(self, texts: Any, **kwargs: Any) -> List[Dict[str, str]]:
+        return self.client.call("summarize", texts, **kwargs)
+
+
+# ---------------------------------------------------------------------------
+# Server side
+# ---------------------------------------------------------------------------
+
+
+def _encode(sentences: List[str], normalize_embeddings: bool = True, batch_size: int = 32) -> np.ndarray:
+    from .analyzer import get_embedder
+
+    return np.asarray(get_embedder().encode(sentences, normalize_embeddings=normalize_embeddings, batch_size=batch_size))
+
+
+def _predict(pairs: List[List[str]], batch_size: int = 32) -> np.ndarray:
+    from .analyzer import get_cross_encoder
+
+    return np.asarray(get_cross_encoder().predict(pairs, batch_size=batch_size))
+
+
+def _generate(bullets: List[str]) -> List[List[str]]:
+    from .rewrite import _generate as generate
+
+    return generate(bullets)
+
+
+def _summarize(texts: Any, **kwargs: Any) -> List[Dict[str, str]]:
+    from .summary import get_summarizer
+
+    return get_summarizer()(texts, **kwargs)
+
+
+METHODS: Dict[str, Callable[..., Any]] = {
+    "encode": _encode,
+    "predict": _predict,
+    "generate": _generate,
+    "summarize": _summarize,
+}
+# One forward pass per model at a time: torch already spreads each one over the cores.
+_locks = {name: threading.Lock() for name in METHODS}
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        sock = self.request
+        while True:
+            try:
+                request = _recv_json(sock)
+            except ConnectionError:
+                return
+            method = request.get("method")
+            try:
+                if method not in METHODS:
+                    raise LookupError(f"unknown method {method!r}")
+                with _locks[method]:
+                    result = METHODS[method](*request.get("args", []), **request.get("kwargs", {}))
+            except Exception as exc:
+                logger.exception("Model server call %s failed", method)
+                _send_json(sock, {"error": f"{type(exc).__name__}: {exc}"})
+                continue
+            if isinstance(result, np.ndarray):
+                array = np.ascontiguousarray(result)
+                _send_json(sock, {"array": {"dtype": array.dtype.str, "shape": list(array.shape)}})
+                if array.nbytes:
+                    sock.sendall(memoryview(array).cast("B"))
+            else:
+                _send_json(sock, {"result": result})
+
+
+class ModelServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def create_server(path: str, models: Sequence[str] = ()) -> ModelServer:
+    """Load ``models`` (warmup names) in this process and bind the socket at ``path``."""
+    global MODEL_SERVER_SOCKET
+    MODEL_SERVER_SOCKET = None  # this process owns the models; never proxy to itself
+    get_client.cache_clear()
+
+    from .warmup import WARMUPS
+
+    for name in models:
+        WARMUPS[name]()
+    if os.path.exists(path):
+        os.unlink(path)
+    server = ModelServer(path, _Handler)
+    os.chmod(path, 0o600)
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the ResumeBoost models to API workers over a Unix socket.")
+    parser.add_argument("--socket", default=MODEL_SERVER_SOCKET or DEFAULT_SOCKET)
+    parser.add_argument("--models", default="embedder,cross_encoder,rewrite,summary")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    server = create_server(args.socket, [m.strip() for m in args.models.split(",") if m.strip()])
+    logger.info("Model server listening on %s", args.socket)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,17 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, ForeignKey, Index
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
 from .database import Base
 
+# SQLite keeps server-default timestamps as "YYYY-MM-DD HH:MM:SS" text. Binding values in the
+# same form keeps comparisons against stored rows exact, which the /history cursor relies on.
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite",
+)
+
 class User(Base):
     __tablename__ = "users"
     id = Column(Integer, primary_key=True, index=True)
@@ -16,7 +24,7 @@ class User(Base):
 class Analysis(Base):
     __tablename__ = "analyses"
     id = Column(Integer, primary_key=True, index=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    created_at = Column(Timestamp, server_default=func.now(), index=True)
     job_title = Column(String, index=True)
     score = Column(Integer, nullable=False)
     matched_skills = Column(JSON, nullable=False)
@@ -28,3 +36,42 @@ class Analysis(Base):
     user = relationship("User", back_populates="analyses")
 
 Index("ix_analyses_user_created", Analysis.user_id, Analysis.created_at.desc())
+
+class CachedAnalysis(Base):
+    """Shared tier of the /analyze result cache (see result_cache.py)."""
+    __tablename__ = "analysis_cache"
+    key = Column(String(64), primary_key=True)
+    model_version = Column(String, nullable=False, index=True)
+    result = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+class LibraryResume(Base):
+    """Full text behind a resume-library entry; its vectors live in library.py's store."""
+    __tablename__ = "library_resumes"
+    analysis_id = Column(Integer, ForeignKey("analyses.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    text_key = Column(String(64), nullable=False)
+    resume_text = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+Index("ix_library_resumes_user_text", LibraryResume.user_id, LibraryResume.text_key)
+
+class Job(Base):
+    """Queued model work run by the job worker (see jobs.py)."""
+    __tablename__ = "jobs"
+    id = Column(String(32), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    kind = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String, nullable=False, default="queued")  # queued | running | done | failed | cancelled
+    priority = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    worker = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+Index("ix_jobs_queue", Job.status, Job.priority.desc(), Job.created_at)
@@ -0,0 +1,260 @@
+"""Whole-analysis result cache with a shared tier and single-flight de-duplication."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from .analyzer import model_fingerprint
+from .cache import LRUCache, content_key
+from .database import engine
+from .models import CachedAnalysis
+
+logger = logging.getLogger(__name__)
+
+# ----- Config -----
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "512"))
+# "sql" shares results between workers through the app database; "memory"
+# keeps a process-local stand-in; "none" disables the shared tier.
+RESULT_CACHE_STORE = os.getenv("RESULT_CACHE_STORE", "sql")
+# Shared entries hold resume evidence, so they expire: seconds after which a
+# stored result is ignored and deleted (0 keeps them), and the most rows kept.
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "86400"))
+RESULT_CACHE_MAX_ROWS = int(os.getenv("RESULT_CACHE_MAX_ROWS", "10000"))
+# Seconds between background prunes of the shared tier; reads ignore expired rows meanwhile.
+RESULT_CACHE_PRUNE_INTERVAL = float(os.getenv("RESULT_CACHE_PRUNE_INTERVAL", "300"))
+
+
+class MemoryResultStore:
+    """Process-local stand-in for the shared tier."""
+
+    def __init__(self) -> None:
+        self._data: Dict[str, Tuple[str, Dict]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict]:
+        entry = self._data.get(key)
+        return entry[1] if entry else None
+
+    def put(self, key: str, model_version: str, result: Dict) -> None:
+        with self._lock:
+            self._data[key] = (model_version, result)
+
+    def purge(self, model_version: str) -> int:
+        with self._lock:
+            stale = [k for k, (v, _) in self._data.items() if v != model_version]
+            for k in stale:
+                del self._data[k]
+        return len(stale)
+
+
+class SqlResultStore:
+    """Shared tier in the ``analysis_cache`` table, visible to every worker.
+
+    :meth:`prune` deletes rows older than ``ttl`` seconds and, past
+    ``max_rows``, the oldest rows. It runs on a timer (see
+    :meth:`ResultCache.start_pruning`), not on inserts, so requests never wait
+    for it; :meth:`get` ignores expired rows in between.
+    """
+
+    def __init__(
+        self, bind: Engine, ttl: float = RESULT_CACHE_TTL, max_rows: int = RESULT_CACHE_MAX_ROWS
+    ) -> None:
+        self._session = sessionmaker(bind=bind)
+        self.ttl = ttl
+        self.max_rows = max_rows
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+
+    def _expired(self, row: CachedAnalysis) -> bool:
+        return bool(self.ttl) and row.created_at is not None and (
+            row.created_at.replace(tzinfo=None) < self._now() - timedelta(seconds=self.ttl)
+        )
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._session() as db:
+            row = db.get(CachedAnalysis, key)
+            return row.result if row is not None and not self._expired(row) else None
+
+    def put(self, key: str, model_version: str, result: Dict) -> None:
+        with self._session() as db:
+            db.query(CachedAnalysis).filter(CachedAnalysis.key == key).delete()  # an expired copy
+            db.add(CachedAnalysis(key=key, model_version=model_version, result=result, created_at=self._now()))
+            try:
+                db.commit()
+            except IntegrityError:  # another worker stored it first
+                db.rollback()
+
+    def prune(self) -> int:
+        """Delete expired rows and the oldest rows beyond ``max_rows``."""
+        with self._session() as db:
+            return self._prune(db)
+
+    def _prune(self, db: Session) -> int:
+        count = 0
+        if self.ttl:
+            cutoff = self._now() - timedelta(seconds=self.ttl)
+            count += db.query(CachedAnalysis).filter(CachedAnalysis.created_at < cutoff).delete()
+        if self.max_rows:
+            excess = db.query(func.count(CachedAnalysis.key)).scalar() - self.max_rows
+            if excess > 0:
+                oldest = (
+                    db.query(CachedAnalysis.key).order_by(CachedAnalysis.created_at, CachedAnalysis.key).limit(excess)
+                )
+                count += (
+                    db.query(CachedAnalysis)
+                    .filter(CachedAnalysis.key.in_(oldest.scalar_subquery()))
+                    .delete(synchronize_session=False)
+                )
+        db.commit()
+        return count
+
+    def purge(self, model_version: str) -> int:
+        with self._session() as db:
+            count = db.query(CachedAnalysis).filter(CachedAnalysis.model_version != model_version).delete()
+            db.commit()
+            return count
+
+
+class ResultCache:
+    """In-memory LRU in front of an optional shared store.
+
+    Concurrent calls for the same key in one process share a single
+    computation. Keys include the model fingerprint, so changing a model
+    name makes old entries unreachable; :meth:`purge_stale` deletes them
+    from the shared tier.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        store: Optional[Any] = None,
+        version: Callable[[], str] = model_fingerprint,
+    ) -> None:
+        self.memory = LRUCache(maxsize)
+        self.store = store
+        self.version = version
+        self._inflight: Dict[str, "asyncio.Future[Dict]"] = {}
+        self._pruner: Optional[threading.Thread] = None
+        self.shared_hits = 0
+        self.coalesced = 0
+        self.misses = 0
+
+    def key(self, parts: Sequence[Optional[str]]) -> str:
+        return content_key(*parts, self.version())
+
+    async def get_or_compute(
+        self,
+        parts: Sequence[Optional[str]],
+        compute: Callable[[], Awaitable[Dict]],
+        cacheable: Callable[[Dict], bool] = lambda result: True,
+    ) -> Tuple[Dict, bool]:
+        """Return ``(result, cached)``, running ``compute`` only on a miss.
+
+        A result for which ``cacheable`` is false (e.g. one degraded to meet a
+        deadline) is shared with concurrent callers but not stored.
+        """
+        key = self.key(parts)
+        result = self.memory.get(key)
+        if result is not None:
+            return result, True
+        if self.store is not None:
+            result = await run_in_threadpool(self.store.get, key)
+            if result is not None:
+                self.shared_hits += 1
+                self.memory.put(key, result)
+                return result, True
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending), True
+
+        self.misses += 1
+        future: "asyncio.Future[Dict]" = asyncio.get_running_loop().create_future()
+        future.add_done_callback(lambda f: f.exception())  # waiters are optional
+        self._inflight[key] = future
+        try:
+            result = await compute()
+        except asyncio.CancelledError:
+            # The leader timed out; followers see the same outcome.
+            future.set_exception(asyncio.TimeoutError())
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        future.set_result(result)
+        if not cacheable(result):
+            return result, False
+        self.memory.put(key, result)
+        if self.store is not None:
+            await run_in_threadpool(self.store.put, key, self.version(), result)
+        return result, False
+
+    def purge_stale(self) -> int:
+        """Delete shared entries written under a different model fingerprint, or expired."""
+        if self.store is None:
+            return 0
+        return self.store.purge(self.version()) + self.prune()
+
+    def prune(self) -> int:
+        """Delete expired and surplus shared entries; 0 when the store does not bound itself."""
+        prune = getattr(self.store, "prune", None)
+        return prune() if prune is not None else 0
+
+    def start_pruning(self, interval: float = RESULT_CACHE_PRUNE_INTERVAL) -> None:
+        """Call :meth:`prune` every ``interval`` seconds in a daemon thread (once per cache)."""
+        if self._pruner is not None or getattr(self.store, "prune", None) is None:
+            return
+
+        def loop() -> None:
+            while True:
+                time.sleep(interval)
+                try:
+                    self.prune()
+                except Exception:
+                    logger.exception("Could not prune the result cache")
+
+        self._pruner = threading.Thread(target=loop, name="result-cache-prune", daemon=True)
+        self._pruner.start()
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self.shared_hits = self.coalesced = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        mem = self.memory.stats()
+        return {
+            "memory_hits": mem["hits"],
+            "shared_hits": self.shared_hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "entries": mem["entries"],
+        }
+
+
+@lru_cache(maxsize=1)
+def get_result_cache() -> ResultCache:
+    """Create and cache the process-wide result cache."""
+    store: Any = None
+    if RESULT_CACHE_STORE == "sql":
+        store = SqlResultStore(engine)
+    elif RESULT_CACHE_STORE == "memory":
+        store = MemoryResultStore()
+    return ResultCache(RESULT_CACHE_SIZE, store)
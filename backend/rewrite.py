@@ -1,12 +1,34 @@
 from __future__ import annotations
+import os
+import re
+from contextlib import nullcontext
 from functools import lru_cache
-from typing import List
+from typing import Dict, List, Sequence
+
+try:  # pragma: no cover - optional dependency in tests
+    import torch
+except ImportError:  # pragma: no cover
+    torch = None  # type: ignore
+
+from .cache import LRUCache, content_key
+from .model_server import get_client
+
+# ----- Config -----
+REWRITE_CACHE_SIZE = int(os.getenv("REWRITE_CACHE_SIZE", "4096"))
+# Bullets per generate() call; each one expands to NUM_BEAMS beams.
+REWRITE_BATCH_SIZE = int(os.getenv("REWRITE_BATCH_SIZE", "8"))
+NUM_BEAMS = 5
+NUM_ALTERNATIVES = 3
+MAX_LENGTH = 64
+
+_BULLET = re.compile(r"^[\s\-•*·–]+")
 
 
 def _load_model():
     from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
     tokenizer = AutoTokenizer.from_pretrained("t5-small")
     model = AutoModelForSeq2SeqLM.from_pretrained("t5-small")
+    model.eval()
     return tokenizer, model
 
 
@@ -15,14 +37,57 @@ def get_model():
     return _load_model()
 
 
-def rewrite_bullet(text: str) -> List[str]:
-    """Generate alternative phrasings for a resume bullet."""
+rewrite_cache = LRUCache(REWRITE_CACHE_SIZE)
+
+
+def normalize_bullet(text: str) -> str:
+    """Drop the leading bullet marker and collapse whitespace, so the same bullet shares a cache entry."""
+    return " ".join(_BULLET.sub("", text).split())
+
+
+def _generate(bullets: List[str]) -> List[List[str]]:
+    """Paraphrase ``bullets`` with one padded, batched beam search."""
+    client = get_client()
+    if client is not None:
+        return client.call("generate", bullets)
     tokenizer, model = get_model()
-    inputs = tokenizer(
-        f"paraphrase: {text}", return_tensors="pt", truncation=True
-    )
-    outputs = model.generate(
-        **inputs, num_beams=5, num_return_sequences=3, max_length=64
-    )
-    return [tokenizer.decode(o, skip_special_tokens=True) for o in outputs]
+    with torch.inference_mode() if torch is not None else nullcontext():
+        inputs = tokenizer(
+            [f"paraphrase: {b}" for b in bullets], return_tensors="pt", padding=True, truncation=True
+        )
+        outputs = model.generate(
+            **inputs, num_beams=NUM_BEAMS, num_return_sequences=NUM_ALTERNATIVES, max_length=MAX_LENGTH
+        )
+    decoded = tokenizer.batch_decode(outputs, skip_special_tokens=True)
+    return [decoded[i * NUM_ALTERNATIVES:(i + 1) * NUM_ALTERNATIVES] for i in range(len(bullets))]
+
+
+def rewrite_bullets(texts: Sequence[str], batch_size: int = 0) -> List[List[str]]:
+    """Alternative phrasings for each of ``texts``.
 
+    Cached bullets are answered from the LRU cache; the rest are generated
+    shortest-first in batches of ``batch_size`` (default
+    ``REWRITE_BATCH_SIZE``), which keeps padding inside each batch small.
+    """
+    bullets = [normalize_bullet(t) for t in texts]
+    found: Dict[str, List[str]] = {}
+    todo = []
+    for bullet in dict.fromkeys(bullets):
+        cached = rewrite_cache.get(content_key(bullet))
+        if cached is None:
+            todo.append(bullet)
+        else:
+            found[bullet] = cached
+    todo.sort(key=len)
+    size = batch_size or REWRITE_BATCH_SIZE
+    for start in range(0, len(todo), size):
+        chunk = todo[start:start + size]
+        for bullet, alternatives in zip(chunk, _generate(chunk)):
+            rewrite_cache.put(content_key(bullet), alternatives)
+            found[bullet] = alternatives
+    return [list(found[b]) for b in bullets]
+
+
+def rewrite_bullet(text: str) -> List[str]:
+    """Generate alternative phrasings for a resume bullet."""
+    return rewrite_bullets([text])[0]
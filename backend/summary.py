@@ -2,29 +2,141 @@
 
 from __future__ import annotations
 
+import os
+import re
+import threading
+from typing import List, Tuple
+
 try:
     from transformers import pipeline
 except Exception:  # pragma: no cover - library may be missing in some environments
     pipeline = None  # type: ignore
 
+from .batching import estimate_tokens
+from .cache import LRUCache, content_key
+from .model_server import RemoteSummarizer, get_client
 
-_summarizer = None
+# ----- Config -----
+# Unset uses the transformers default summarization model.
+SUMMARY_MODEL = os.getenv("SUMMARY_MODEL") or None
+# Estimated tokens per chunk; kept well under the model's 1024-token input limit.
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "512"))
+SUMMARY_BATCH_SIZE = int(os.getenv("SUMMARY_BATCH_SIZE", "4"))
+SUMMARY_CACHE_SIZE = int(os.getenv("SUMMARY_CACHE_SIZE", "1024"))
+# Rounds of re-summarizing partial summaries before the last input is truncated.
+MAX_REDUCE_ROUNDS = 3
 
+_summarizer = None
+_lock = threading.Lock()
 
-def summarize_text(text: str) -> str:
-    """Return a summary for the given ``text``.
+summary_cache = LRUCache(SUMMARY_CACHE_SIZE)
 
-    The underlying summarization pipeline is initialized lazily on the first
-    call to avoid the overhead during application start-up and testing.
-    """
 
+def get_summarizer():
+    """Return the summarization pipeline, loading it on first use."""
+    client = get_client()
+    if client is not None:
+        return RemoteSummarizer(client)
     if pipeline is None:  # pragma: no cover
         raise RuntimeError("transformers library is required for summarization")
 
     global _summarizer
-    if _summarizer is None:
-        _summarizer = pipeline("summarization")
+    with _lock:
+        if _summarizer is None:
+            _summarizer = pipeline("summarization", model=SUMMARY_MODEL)
+    return _summarizer
 
-    result = _summarizer(text, max_length=130, min_length=30, do_sample=False)
-    return result[0]["summary_text"]
 
+# Where a chunk may end: after sentence punctuation, or at a line break (bullets, headings).
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+|\s*[\r\n]+\s*")
+
+
+def _sentence_spans(text: str) -> List[Tuple[int, int]]:
+    spans, start = [], 0
+    for match in _SENTENCE_BREAK.finditer(text):
+        if text[start:match.start()].strip():
+            spans.append((start, match.start()))
+        start = match.end()
+    if text[start:].strip():
+        spans.append((start, len(text)))
+    return spans
+
+
+def chunk_text(text: str, max_tokens: int = 0) -> List[str]:
+    """Cut ``text`` into chunks of at most ``max_tokens`` estimated tokens.
+
+    Chunks are slices of the original text ending at sentence or line
+    boundaries, so hyphens, bullets and line breaks reach the model as
+    written. Text within the budget is returned unchanged as one chunk, and a
+    sentence longer than the budget becomes a chunk of its own.
+    """
+    budget = max_tokens or SUMMARY_CHUNK_TOKENS
+    if not text.strip():
+        return []
+    if estimate_tokens(text, limit=1 << 30) <= budget:
+        return [text]
+    chunks: List[str] = []
+    first = last = None
+    used = 0
+    for start, end in _sentence_spans(text):
+        tokens = estimate_tokens(text[start:end], limit=1 << 30)
+        if first is not None and used + tokens > budget:
+            chunks.append(text[first:last])
+            first, used = None, 0
+        if first is None:
+            first = start
+        last = end
+        used += tokens
+    if first is not None:
+        chunks.append(text[first:last])
+    return chunks
+
+
+def summarize_chunks(chunks: List[str], max_length: int, min_length: int) -> List[str]:
+    """Summaries of ``chunks`` in order; cache misses are summarized in batches."""
+    keys = [content_key(c, str(max_length), str(min_length), SUMMARY_MODEL) for c in chunks]
+    found = {key: summary_cache.get(key) for key in keys}
+    todo = {key: chunk for key, chunk in zip(keys, chunks) if found[key] is None}
+    if todo:
+        results = get_summarizer()(
+            list(todo.values()),
+            max_length=max_length,
+            min_length=min_length,
+            do_sample=False,
+            truncation=True,
+            batch_size=SUMMARY_BATCH_SIZE,
+        )
+        for key, result in zip(todo, results):
+            found[key] = result["summary_text"]
+            summary_cache.put(key, found[key])
+    return [found[k] for k in keys]
+
+
+def _partial_lengths(chunk: str, max_length: int, min_length: int) -> Tuple[int, int]:
+    """Length bounds for a chunk's partial summary: at most half the chunk, at most the final budget."""
+    tokens = estimate_tokens(chunk, limit=1 << 30)
+    cap = max(min(max_length, tokens // 2), 16)
+    return cap, min(min_length, cap // 2)
+
+
+def summarize_text(text: str, max_length: int = 130, min_length: int = 30) -> str:
+    """Return a summary for the given ``text``.
+
+    Text that fits one chunk is summarized directly. Longer text is
+    map-reduced: its sentence chunks are summarized in batches, the partial
+    summaries are joined, and the result is summarized again (chunking the
+    join once more while it is still too long). Chunk summaries are cached,
+    so re-summarizing a document with one edited section only redoes that
+    section's chunk.
+
+    The underlying summarization pipeline is initialized lazily on the first
+    call (or by the startup warmup) to avoid the overhead during testing.
+    """
+    chunks = chunk_text(text)
+    for _ in range(MAX_REDUCE_ROUNDS):
+        if len(chunks) <= 1:
+            break
+        lengths = _partial_lengths(max(chunks, key=len), max_length, min_length)
+        partials = summarize_chunks(chunks, *lengths)
+        chunks = chunk_text("\n".join(partials))
+    return summarize_chunks([" ".join(chunks)], max_length, min_length)[0]
@@ -0,0 +1,91 @@
+import os
+import pathlib
+import sys
+import tempfile
+import time
+import uuid
+
+import numpy as np
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+# Keep the API tests away from the developer's ./resumeboost.db
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db"))
+os.environ.setdefault("LIBRARY_DIR", os.path.join(tempfile.mkdtemp(), "library"))
+
+
+@pytest.fixture
+def api_user():
+    """Yield the FastAPI app and a persisted user that every request is authenticated as."""
+    from backend.auth import get_current_user
+    from backend.database import SessionLocal
+    from backend.main import app
+    from backend.models import User
+
+    db = SessionLocal()
+    user = User(email=f"{uuid.uuid4().hex}@example.com", hashed_password="unused")
+    db.add(user); db.commit(); db.refresh(user)
+    db.close()
+
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield app, user
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+class DummyEmbedder:
+    """Cheap deterministic sentence vectors; counts calls and records what it encoded."""
+
+    def __init__(self):
+        self.calls = 0
+        self.encoded = []
+
+    def encode(self, sentences, normalize_embeddings=True, **_kw):
+        self.calls += 1
+        self.encoded.extend(sentences)
+        arr = np.array([[len(s) % 7 + 1.0, 1.0, float("python" in s.lower())] for s in sentences])
+        return arr / np.linalg.norm(arr, axis=1, keepdims=True)
+
+
+class DummyCrossEncoder:
+    """Scores every pair with ``score`` after sleeping ``delay`` seconds; records the pairs."""
+
+    def __init__(self, score=0.0, delay=0.0):
+        self.score = score
+        self.delay = delay
+        self.pairs = []
+
+    def predict(self, pairs, **_kw):
+        time.sleep(self.delay)
+        self.pairs.extend(pairs)
+        return np.full(len(pairs), self.score)
+
+
+@pytest.fixture
+def dummy_models(monkeypatch):
+    """Swap the sentence models for the stubs above and yield ``(embedder, cross_encoder)``."""
+    import backend.analyzer as analyzer
+
+    embedder, cross_encoder = DummyEmbedder(), DummyCrossEncoder()
+    monkeypatch.setattr(analyzer, "get_embedder", lambda: embedder)
+    monkeypatch.setattr(analyzer, "get_cross_encoder", lambda: cross_encoder)
+    yield embedder, cross_encoder
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """Tests swap in dummy models, so cached outputs must not leak between them."""
+    from backend.analyzer import jd_profile_cache, resume_snapshots
+    from backend.embedding_cache import get_embedding_cache
+    from backend.grammar import grammar_cache
+    from backend.result_cache import get_result_cache
+    from backend.rewrite import rewrite_cache
+    from backend.summary import summary_cache
+
+    get_embedding_cache().clear()
+    grammar_cache.clear()
+    jd_profile_cache.clear()
+    resume_snapshots.clear()
+    get_result_cache().clear()
+    rewrite_cache.clear()
+    summary_cache.clear()
+    yield
@@ -0,0 +1,38 @@
+import numpy as np
+
+import backend.analyzer as analyzer
+
+
+def test_calculate_scores_builds_each_artifact_once(monkeypatch):
+    calls = []
+    real_split = analyzer.split_sents
+
+    def counting_split(text):
+        calls.append(text)
+        return real_split(text)
+
+    class DummyEmbedder:
+        def __init__(self):
+            self.batches = 0
+
+        def encode(self, sentences, normalize_embeddings=True, **_kw):
+            self.batches += 1
+            return np.ones((len(sentences), 2)) / np.sqrt(2)
+
+    class DummyCrossEncoder:
+        def predict(self, pairs, **_kw):
+            return np.zeros(len(pairs))
+
+    embedder = DummyEmbedder()
+    monkeypatch.setattr(analyzer, "split_sents", counting_split)
+    monkeypatch.setattr(analyzer, "get_embedder", lambda: embedder)
+    monkeypatch.setattr(analyzer, "get_cross_encoder", lambda: DummyCrossEncoder())
+
+    resume = "Built Python APIs. Led a team."
+    job = "Python developer needed. Must lead a team."
+    ctx = analyzer.AnalysisContext(resume, job)
+    analyzer.calculate_scores(["Python"], ["Python"], resume, job, ctx=ctx)
+
+    assert sorted(calls) == sorted([resume, job])
+    assert embedder.batches == 2
+    assert {"tfidf", "embedding", "cross_encoder", "ats", "grammar"} <= set(ctx.timings)
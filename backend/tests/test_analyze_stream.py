@@ -0,0 +1,73 @@
+import asyncio
+import json
+
+import httpx
+
+import backend.analyzer as analyzer
+import backend.main as main
+from backend.database import SessionLocal
+from backend.executor import InferenceExecutor
+from backend.models import Analysis
+
+PAYLOAD = {
+    "resume_text": "Experience\nBuilt Python APIs.\nLed team of four.\nEducation",
+    "job_description": "Python developer.\nMust know React.",
+}
+
+
+async def _post(app, payload):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post("/analyze/stream", json=payload)
+
+
+def _events(dummy_models, app, delay):
+    _, cross_encoder = dummy_models
+    cross_encoder.score, cross_encoder.delay = 1.0, delay
+    resp = asyncio.run(_post(app, PAYLOAD))
+    assert resp.status_code == 200
+    return [json.loads(line) for line in resp.text.splitlines()]
+
+
+def test_stream_emits_stages_in_order_and_saves_analysis(api_user, dummy_models):
+    app, user = api_user
+    events = _events(dummy_models, app, delay=0)
+
+    assert [e["stage"] for e in events] == ["skills", "semantic", "cross_encoder", "grammar", "done"]
+    skills, semantic, cross, _, done = events
+    assert skills["matchedSkills"] == ["Python"]
+    assert abs(semantic["score"] - skills["score"] - semantic["semanticSimilarity"]) < 0.02
+    assert cross["evidence"]
+    assert done["skippedStages"] == []
+
+    # Same result as the non-streaming pipeline.
+    full = asyncio.run(analyzer.perform_analysis(PAYLOAD["resume_text"], PAYLOAD["job_description"]))
+    assert done["breakdown"] == full["breakdown"]
+
+    db = SessionLocal()
+    saved = db.query(Analysis).filter(Analysis.id == int(done["id"]), Analysis.user_id == user.id).one()
+    assert saved.score == int(full["score"])
+    db.close()
+
+
+def test_slow_cross_encoder_is_skipped_not_fatal(monkeypatch, api_user, dummy_models):
+    app, _ = api_user
+    monkeypatch.setattr(analyzer, "STREAM_STAGE_BUDGET", 0.1)
+    events = _events(dummy_models, app, delay=0.5)
+
+    stages = {e["stage"]: e for e in events}
+    assert stages["cross_encoder"] == {"stage": "cross_encoder", "skipped": True}
+    assert stages["done"]["skippedStages"] == ["cross_encoder"]
+    # The score falls back to the bi-encoder alone.
+    assert stages["done"]["breakdown"]["semantic_similarity"] == stages["semantic"]["semanticSimilarity"]
+
+
+def test_unread_stream_response_returns_its_queue_slot(monkeypatch, api_user):
+    _, user = api_user
+    executor = InferenceExecutor(threads=1, max_queue=1)
+    monkeypatch.setattr(main, "get_executor", lambda: executor)
+
+    response = asyncio.run(main.analyze_stream(main.AnalysisRequest(**PAYLOAD), me=user))
+    assert executor.pending == 1
+    del response  # e.g. the client disconnected before the body was sent
+    assert executor.pending == 0
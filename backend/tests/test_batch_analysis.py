@@ -0,0 +1,63 @@
+import asyncio
+import json
+
+import httpx
+
+import backend.main as main
+from backend.database import SessionLocal
+from backend.executor import InferenceExecutor
+from backend.models import Analysis
+
+
+async def _post(app, payload):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post("/analyze/batch", json=payload)
+
+
+def test_batch_streams_ranked_results_and_bulk_inserts(api_user, dummy_models):
+    app, user = api_user
+    embedder, _ = dummy_models
+
+    payload = {
+        "resume_text": "Experience\nBuilt Python APIs.\nLed team of four.\nEducation",
+        "job_descriptions": [
+            "Python developer. Must know React.",
+            "Machine learning engineer with Python.",
+            "Accountant with Excel.",
+        ],
+    }
+    resp = asyncio.run(_post(app, payload))
+    assert resp.status_code == 200
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+
+    results, done = lines[:-1], lines[-1]
+    assert sorted(r["index"] for r in results) == [0, 1, 2]
+    assert done["done"] is True
+    scores = [r["score"] for r in done["ranking"]]
+    assert scores == sorted(scores, reverse=True)
+    assert embedder.calls == 1
+
+    db = SessionLocal()
+    ids = {int(r["id"]) for r in done["ranking"]}
+    assert db.query(Analysis).filter(Analysis.user_id == user.id, Analysis.id.in_(ids)).count() == 3
+    db.close()
+
+
+def test_batch_requires_exactly_one_shared_side(api_user):
+    app, _ = api_user
+    resp = asyncio.run(_post(app, {"resume_text": "x", "resumes": ["y"]}))
+    assert resp.status_code == 400
+
+
+def test_unread_batch_response_returns_its_queue_slot(monkeypatch, api_user):
+    _, user = api_user
+    executor = InferenceExecutor(threads=1, max_queue=1)
+    monkeypatch.setattr(main, "get_executor", lambda: executor)
+    req = main.BatchAnalysisRequest(resume_text="Built Python APIs.", job_descriptions=["Python developer."])
+
+    response = asyncio.run(main.analyze_batch(req, me=user))
+    assert executor.pending == 1
+    del response  # e.g. the client disconnected before the body was sent
+    assert executor.pending == 0
+    assert asyncio.run(main.analyze_batch(req, me=user)).status_code == 200  # the slot is free again
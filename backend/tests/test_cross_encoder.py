@@ -5,7 +5,7 @@ from backend import analyzer
 
 def test_cross_encoder_match_bounds(monkeypatch):
     class DummyCrossEncoder:
-        def predict(self, pairs):
+        def predict(self, pairs, **_kw):
             return np.array([-2.0, -3.0, -3.0, 5.0])
 
     monkeypatch.setattr(analyzer, "get_cross_encoder", lambda: DummyCrossEncoder())
@@ -19,3 +19,28 @@ def test_cross_encoder_match_bounds(monkeypatch):
         assert -1.0 <= sim <= 1.0
     assert any(sim < 0 for _, _, sim in result["support"])
     assert -1.0 <= result["semantic"] <= 1.0
+
+
+def test_cross_encoder_top_k_pruning(monkeypatch):
+    class PairRecorder:
+        def __init__(self):
+            self.pairs = []
+
+        def predict(self, pairs, **_kw):
+            self.pairs.extend(pairs)
+            return np.array([5.0 if r == "B." else -5.0 for _, r in pairs])
+
+    model = PairRecorder()
+    monkeypatch.setattr(analyzer, "get_cross_encoder", lambda: model)
+
+    resume = "A. B. C."
+    jd = "X. Y."
+    # Bi-encoder similarity (resume x JD) ranks B then C for both requirements.
+    sims = np.array([[0.1, 0.1], [0.9, 0.8], [0.5, 0.6]])
+    pruned = analyzer.cross_encoder_match(resume, jd, similarity=sims, top_k=2)
+
+    assert pruned["pairs_scored"] == 4
+    assert {r for _, r in model.pairs} == {"B.", "C."}
+    full = analyzer.cross_encoder_match(resume, jd, similarity=sims, top_k=0)
+    assert full["pairs_scored"] == 6
+    assert pruned["support"] == full["support"]
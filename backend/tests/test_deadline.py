@@ -0,0 +1,66 @@
+import asyncio
+
+import backend.analyzer as analyzer
+from backend.deadline import CostModel, Deadline
+from backend.embedding_cache import get_embedding_cache
+
+JOB = "Python developer needed.\nMust lead a team.\nExperience with SQL."
+RESUME = "\n".join(f"Built service number {i} in Python." for i in range(8))
+
+
+def _run(monkeypatch, dummy_models, embed_cost, cross_cost, seconds=1.0, snapshot_key=None, cold=True):
+    if cold:
+        get_embedding_cache().clear()
+    _, cross = dummy_models
+    cross.score = 1.0
+    cross.pairs.clear()
+    monkeypatch.setattr(analyzer, "embedding_cost", CostModel(embed_cost, alpha=0))
+    monkeypatch.setattr(analyzer, "cross_encoder_cost", CostModel(cross_cost, alpha=0))
+    result = asyncio.run(
+        analyzer.perform_analysis(RESUME, JOB, snapshot_key=snapshot_key, deadline=Deadline(seconds))
+    )
+    return result, cross
+
+
+def test_ample_budget_runs_everything(monkeypatch, dummy_models):
+    result, cross = _run(monkeypatch, dummy_models, 0.0001, 0.0001)
+    assert result["degraded"] == {}
+    assert len(cross.pairs) == 3 * analyzer.CROSS_ENCODER_TOP_K
+
+
+def test_expensive_cross_encoder_runs_with_smaller_top_k(monkeypatch, dummy_models):
+    # 0.35 s allowance / 0.05 s per pair = 7 pairs, i.e. 2 per JD sentence.
+    result, cross = _run(monkeypatch, dummy_models, 0.0001, 0.05)
+    assert result["degraded"] == {"cross_encoder": "top_k=2"}
+    assert len(cross.pairs) == 6
+    assert result["breakdown"]["semantic_similarity"] > 0
+
+
+def test_expensive_embedder_trims_then_skips(monkeypatch, dummy_models):
+    # 0.35 s / 0.032 s = 10 sentences: 3 JD + 7 resume.
+    result, _ = _run(monkeypatch, dummy_models, 0.032, 0.0001)
+    assert result["degraded"]["embedding"] == "sentences=7/8"
+
+    result, cross = _run(monkeypatch, dummy_models, 1.0, 0.0001)
+    assert result["degraded"] == {"embedding": "skipped", "cross_encoder": "skipped"}
+    assert result["breakdown"]["semantic_similarity"] == 0
+    assert cross.pairs == []
+    assert result["score"] > 0
+
+
+def test_warm_repeat_is_not_degraded(monkeypatch, dummy_models):
+    # Costs that would trim both stages cold: only cache misses and unscored pairs count.
+    first, _ = _run(monkeypatch, dummy_models, 0.0001, 0.0001, snapshot_key="warm")
+    assert first["degraded"] == {}
+    for _ in range(3):
+        again, cross = _run(monkeypatch, dummy_models, 0.032, 0.05, snapshot_key="warm", cold=False)
+        assert again["degraded"] == {}
+        assert cross.pairs == []
+        assert again["score"] == first["score"]
+
+
+def test_cost_model_follows_observations():
+    cost = CostModel(0.01, alpha=0.5)
+    cost.observe(10, 1.0)
+    assert abs(cost.per_item - 0.055) < 1e-9
+    assert cost.fit(0.55) == 10
@@ -6,7 +6,7 @@ from backend import analyzer
 
 def test_embedding_match(monkeypatch):
     class DummyEmbedder:
-        def encode(self, sentences, normalize_embeddings=True):
+        def encode(self, sentences, normalize_embeddings=True, **_kw):
             mapping = {
                 "I know Python.": np.array([1.0, 0.0, 0.0]),
                 "I have data": np.array([0.0, 1.0, 0.0]),
@@ -0,0 +1,47 @@
+import numpy as np
+
+from backend.embedding_cache import EmbeddingCache
+
+
+class CountingEncoder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, sentences):
+        self.calls.append(list(sentences))
+        return np.array([[float(len(s)), 1.0] for s in sentences])
+
+
+def test_only_misses_are_encoded():
+    cache = EmbeddingCache(maxsize=100)
+    encoder = CountingEncoder()
+
+    first = cache.encode(["Built APIs.", "Led a team."], "m", encoder)
+    second = cache.encode(["Led  a team.", "Wrote tests."], "m", encoder)
+
+    assert encoder.calls == [["Built APIs.", "Led a team."], ["Wrote tests."]]
+    np.testing.assert_array_equal(second[0], first[1])
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 3
+    assert stats["memory_bytes"] == 3 * 2 * 4
+
+
+def test_model_name_is_part_of_the_key():
+    cache = EmbeddingCache(maxsize=100)
+    encoder = CountingEncoder()
+    cache.encode(["Same sentence."], "model-a", encoder)
+    cache.encode(["Same sentence."], "model-b", encoder)
+    assert len(encoder.calls) == 2
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    encoder = CountingEncoder()
+    EmbeddingCache(maxsize=10, disk_dir=str(tmp_path), disk_dtype="float16").encode(["Shipped v2."], "m", encoder)
+
+    reopened = EmbeddingCache(maxsize=10, disk_dir=str(tmp_path))
+    vec = reopened.encode(["Shipped v2."], "m", encoder)
+
+    assert len(encoder.calls) == 1
+    assert vec.dtype == np.float32
+    np.testing.assert_allclose(vec[0], [11.0, 1.0])
+    assert reopened.stats()["disk_hits"] == 1
@@ -0,0 +1,93 @@
+import asyncio
+import time
+import uuid
+
+import httpx
+
+import backend.analyzer as analyzer
+import backend.metrics as metrics
+from backend.executor import InferenceExecutor
+
+def _payload():
+    # Unique texts, so the result cache never answers for the executor.
+    return {
+        "resume_text": f"Built Python services {uuid.uuid4().hex}.",
+        "job_description": "Looking for a Python developer.",
+    }
+
+
+def _slow_scores(*_args, **_kwargs):
+    time.sleep(0.4)  # blocking, like a real model forward pass
+    return 50.0, {}, [], {"high_priority": [], "medium_priority": []}, [], [], [], []
+
+
+def _stub_pipeline(monkeypatch, executor):
+    monkeypatch.setattr(analyzer, "get_executor", lambda: executor)
+    monkeypatch.setattr(analyzer, "parse_for_skills", lambda texts: [None] * len(texts))
+    monkeypatch.setattr(analyzer, "extract_skills", lambda *_args: ["Python"])
+    monkeypatch.setattr(analyzer, "calculate_scores", _slow_scores)
+
+
+def test_history_latency_flat_under_analyze_load(monkeypatch, api_user):
+    app, _ = api_user
+    _stub_pipeline(monkeypatch, InferenceExecutor(threads=4, max_queue=16))
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            idle = time.perf_counter()
+            await client.get("/history")
+            idle = time.perf_counter() - idle
+
+            load = [asyncio.create_task(client.post("/analyze", json=_payload())) for _ in range(8)]
+            await asyncio.sleep(0.05)
+            latencies = []
+            while not all(t.done() for t in load):
+                start = time.perf_counter()
+                resp = await client.get("/history")
+                latencies.append(time.perf_counter() - start)
+                assert resp.status_code == 200
+                await asyncio.sleep(0.02)
+            statuses = [t.result().status_code for t in load]
+            return idle, latencies, statuses
+
+    idle, latencies, statuses = asyncio.run(scenario())
+    assert statuses == [200] * 8
+    assert len(latencies) >= 5
+    # A blocked event loop would push /history past the 0.4s scoring stage.
+    assert max(latencies) < max(0.2, idle * 10)
+
+
+def test_saturated_queue_returns_503_with_position(monkeypatch, api_user):
+    app, _ = api_user
+    _stub_pipeline(monkeypatch, InferenceExecutor(threads=1, max_queue=1))
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.post("/analyze", json=_payload()) for _ in range(2)))
+
+    responses = asyncio.run(scenario())
+    rejected = [r for r in responses if r.status_code == 503]
+    assert len(rejected) == 1
+    assert rejected[0].json()["detail"]["queue_position"] == 2
+    assert rejected[0].headers["Retry-After"] == "1"
+
+
+def test_skill_extraction_in_process_pool_with_tracing(monkeypatch, dummy_models):
+    monkeypatch.setattr(metrics, "TRACE_ENABLED", True)
+    resume = "Built Python APIs and SQL reports."
+    jd = "Python developer with SQL experience."
+    expected = asyncio.run(analyzer.perform_analysis(resume, jd))
+
+    executor = InferenceExecutor(threads=2, processes=1)
+    monkeypatch.setattr(analyzer, "get_executor", lambda: executor)
+    try:
+        analyzer.resume_snapshots.clear()
+        result = asyncio.run(analyzer.perform_analysis(resume, jd, snapshot_key="pool"))
+        again = asyncio.run(analyzer.perform_analysis(resume + " Led a team.", jd, snapshot_key="pool"))
+    finally:
+        executor.shutdown()
+    assert result["matched_skills"] == expected["matched_skills"] != []
+    assert result["score"] == expected["score"]
+    assert again["recomputed_sentences"] == 1
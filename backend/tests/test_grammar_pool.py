@@ -0,0 +1,74 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import backend.grammar as grammar
+from backend.grammar import LanguageToolPool
+
+
+class FakeTool:
+    instances = 0
+
+    def __init__(self, delay=0.0, fail=False):
+        FakeTool.instances += 1
+        self.delay = delay
+        self.fail = fail
+        self.closed = False
+
+    def check(self, text):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("java server died")
+        return [SimpleNamespace(message=f"issue in {text}", replacements=["fix"])]
+
+    def close(self):
+        self.closed = True
+
+
+def test_pool_reuses_started_checker():
+    FakeTool.instances = 0
+    pool = LanguageToolPool(size=2, timeout=1.0, factory=FakeTool)
+    for _ in range(5):
+        assert pool.check("Text.")
+    assert FakeTool.instances == 1
+    assert pool.stats()["started"] == 1
+
+
+def test_slow_check_times_out_and_releases_checker_later():
+    release = threading.Event()
+
+    class SlowOnce(FakeTool):
+        def check(self, text):
+            if not release.is_set():
+                release.set()
+                time.sleep(0.3)
+            return super().check(text)
+
+    pool = LanguageToolPool(size=1, timeout=0.05, factory=SlowOnce)
+    assert pool.check("Slow.") is None
+    assert pool.stats()["timeouts"] == 1
+    time.sleep(0.35)
+    pool.timeout = 1.0
+    assert pool.check("Fast.")
+
+
+def test_failed_checker_is_restarted():
+    tools = iter([FakeTool(fail=True), FakeTool()])
+    pool = LanguageToolPool(size=1, timeout=1.0, factory=lambda: next(tools))
+    assert pool.check("Boom.") is None
+    assert pool.check("Works.")
+    assert pool.stats()["restarts"] == 1
+
+
+def test_grammar_results_cached_per_text(monkeypatch):
+    pool = LanguageToolPool(size=1, timeout=1.0, factory=FakeTool)
+    calls = []
+    real_check = pool.check
+    monkeypatch.setattr(pool, "check", lambda text, timeout=None: calls.append(text) or real_check(text, timeout))
+    monkeypatch.setattr(grammar, "get_grammar_pool", lambda: pool)
+    monkeypatch.setattr(grammar, "language_tool_python", object())
+
+    first = grammar.grammar_check("Same resume.")
+    second = grammar.grammar_check("Same resume.")
+    assert first == second == [{"issue": "issue in Same resume.", "replacement": "fix"}]
+    assert calls == ["Same resume."]
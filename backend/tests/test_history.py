@@ -0,0 +1,70 @@
+import asyncio
+import datetime
+import uuid
+
+import httpx
+
+from backend.database import SessionLocal
+from backend.models import Analysis, User
+
+
+def _seed(user_id, rows):
+    db = SessionLocal()
+    analyses = [
+        Analysis(
+            job_title=role, score=score, matched_skills=[], improvement_areas=[], highlights=[],
+            user_id=user_id, created_at=created_at,
+        )
+        for created_at, role, score in rows
+    ]
+    db.add_all(analyses); db.commit()
+    ids = [a.id for a in analyses]
+    db.close()
+    return ids
+
+
+async def _pages(app, **params):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        pages, cursor = [], None
+        while True:
+            resp = await client.get("/history", params={**params, **({"cursor": cursor} if cursor else {})})
+            assert resp.status_code == 200
+            body = resp.json()
+            pages.append([item["id"] for item in body["items"]])
+            cursor = body["nextCursor"]
+            if cursor is None:
+                return pages
+
+
+def test_keyset_pages_cover_every_row_once_across_timestamp_ties(api_user):
+    app, user = api_user
+    base = datetime.datetime(2025, 1, 1, 12, 0, 0)
+    rows = [(base + datetime.timedelta(seconds=i // 3), "Engineer" if i % 2 else "Analyst", 50 + i) for i in range(10)]
+    ids = _seed(user.id, rows)
+    db = SessionLocal()
+    other = User(email=f"{uuid.uuid4().hex}@example.com", hashed_password="unused")
+    db.add(other); db.commit()
+    _seed(other.id, rows[:2])
+    db.close()
+
+    newest_first = [str(i) for _, i in sorted(zip(rows, ids), key=lambda r: (r[0][0], r[1]), reverse=True)]
+    pages = asyncio.run(_pages(app, limit=3))
+    assert [len(p) for p in pages] == [3, 3, 3, 1]
+    assert [i for p in pages for i in p] == newest_first
+
+    engineers = asyncio.run(_pages(app, limit=2, role="Engineer", min_score=53, max_score=58))
+    assert [i for p in engineers for i in p] == [str(ids[i]) for i in (7, 5, 3)]
+
+
+def test_history_rejects_bad_cursor_and_limit(api_user):
+    app, _ = api_user
+
+    async def get(params):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/history", params=params)
+
+    assert asyncio.run(get({"cursor": "not-a-cursor"})).status_code == 400
+    assert asyncio.run(get({"limit": 0})).status_code == 400
+    assert asyncio.run(get({})).json() == {"items": [], "nextCursor": None}
@@ -0,0 +1,42 @@
+import asyncio
+
+import backend.analyzer as analyzer
+
+JOB = "Python developer needed.\nMust lead a team.\nExperience with SQL."
+RESUME = "Built Python APIs.\nLed a team of five.\nWrote SQL reports."
+
+
+def _analyze(resume, key):
+    return asyncio.run(analyzer.perform_analysis(resume, JOB, snapshot_key=key))
+
+
+def test_edit_recomputes_only_changed_sentences(dummy_models):
+    embedder, cross = dummy_models
+
+    first = _analyze(RESUME, "user-1")
+    assert first["recomputed_sentences"] == 3
+
+    edited = RESUME.replace("Wrote SQL reports.", "Tuned SQL queries.")
+    analyzer.get_embedding_cache().clear()
+    embedder.encoded.clear()
+    cross.pairs.clear()
+    second = _analyze(edited, "user-1")
+
+    assert second["recomputed_sentences"] == 1
+    resume_side = {s for s in embedder.encoded if s not in analyzer.split_sents(JOB)}
+    assert resume_side == {"Tuned SQL queries."}
+    assert {r for _, r in cross.pairs} == {"Tuned SQL queries."}
+
+    # Same output as analysing the edited resume from scratch.
+    analyzer.get_embedding_cache().clear()
+    fresh = _analyze(edited, None)
+    assert fresh["recomputed_sentences"] == 3
+    assert second["score"] == fresh["score"]
+    assert second["evidence"] == fresh["evidence"]
+
+
+def test_new_job_description_recomputes_everything(dummy_models):
+
+    _analyze(RESUME, "user-2")
+    other = asyncio.run(analyzer.perform_analysis(RESUME, JOB + "\nDocker.", snapshot_key="user-2"))
+    assert other["recomputed_sentences"] == 3
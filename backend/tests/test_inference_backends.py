@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+import backend.analyzer as analyzer
+import backend.inference as inference
+from backend.benchmarks import backend_accuracy
+from backend.benchmarks.stubs import StubCrossEncoder, StubEmbedder
+
+
+class FakeInput:
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeSession:
+    """Returns each token id as a one-hot hidden state, like a trivial encoder."""
+
+    def get_inputs(self):
+        return [FakeInput("input_ids"), FakeInput("attention_mask")]
+
+    def run(self, _outputs, feed):
+        return [np.eye(4, dtype=np.float32)[feed["input_ids"]]]
+
+
+def fake_tokenizer(texts, *_args, **_kw):
+    ids = [[1 + len(t) % 3] * (1 + len(t) % 2) for t in texts]
+    width = max(map(len, ids))
+    return {
+        "input_ids": np.array([row + [0] * (width - len(row)) for row in ids]),
+        "attention_mask": np.array([[1] * len(row) + [0] * (width - len(row)) for row in ids]),
+        "token_type_ids": np.zeros((len(ids), width), dtype=int),
+    }
+
+
+def test_onnx_embedder_mean_pools_over_real_tokens():
+    embedder = inference.OnnxEmbedder(FakeSession(), fake_tokenizer)
+    sentences = ["a", "bb", "ccc", "dddd", "e"]
+    out = embedder.encode(sentences, batch_size=2)
+
+    expected = np.eye(4)[[1 + len(s) % 3 for s in sentences]]
+    assert out.shape == (5, 4)
+    assert np.allclose(out, expected)
+
+
+def test_unknown_or_pathless_backend_is_rejected(monkeypatch):
+    with pytest.raises(ValueError):
+        inference.load_embedder("m", backend="tensorrt")
+    monkeypatch.setattr(inference, "onnxruntime", object())
+    with pytest.raises(ValueError):
+        inference.load_cross_encoder("m", path=None, backend="onnx")
+
+
+def test_only_int8_is_pinned_to_the_cpu(monkeypatch):
+    class Recorder:
+        def __init__(self, name, device=None):
+            self.device, self.model = device, None
+
+    monkeypatch.setattr(inference, "SentenceTransformer", Recorder)
+    monkeypatch.setattr(inference, "CrossEncoder", Recorder)
+    monkeypatch.setattr(inference, "_quantize", lambda module: module)
+
+    assert inference.load_embedder("m", backend="torch").device is None  # GPU when there is one
+    assert inference.load_cross_encoder("m", backend="torch-int8").device == "cpu"
+    monkeypatch.setattr(inference, "INFERENCE_DEVICE", "cuda:1")
+    assert inference.load_cross_encoder("m", backend="torch").device == "cuda:1"
+    assert inference.load_embedder("m", backend="torch-int8").device == "cpu"
+
+
+def test_backend_changes_cache_namespace_and_fingerprint(monkeypatch):
+    assert analyzer.embedder_id() == analyzer.EMBEDDER_MODEL
+    before = analyzer.model_fingerprint()
+    monkeypatch.setattr(inference, "INFERENCE_BACKEND", "onnx")
+    monkeypatch.setattr(inference, "ONNX_FILE", "model_quantized.onnx")
+    analyzer.model_fingerprint.cache_clear()
+    try:
+        assert analyzer.embedder_id() == f"{analyzer.EMBEDDER_MODEL}@onnx:model_quantized.onnx"
+        assert analyzer.model_fingerprint() != before
+    finally:
+        analyzer.model_fingerprint.cache_clear()
+
+
+def test_accuracy_check_flags_a_drifting_backend():
+    class NoisyEmbedder(StubEmbedder):
+        def encode(self, sentences, normalize_embeddings=True, **kw):
+            out = super().encode(sentences, normalize_embeddings=False) + 0.5
+            return out / np.linalg.norm(out, axis=1, keepdims=True)
+
+    pairs = backend_accuracy.fixture_pairs()[:2]
+    same = backend_accuracy.compare((StubEmbedder(), StubCrossEncoder()), (StubEmbedder(), StubCrossEncoder()), pairs)
+    assert same["passed"] and same["embedding_min_cosine"] > 0.999 and same["score_max_abs_diff"] == 0
+    drift = backend_accuracy.compare((StubEmbedder(), StubCrossEncoder()), (NoisyEmbedder(), StubCrossEncoder()), pairs)
+    assert not drift["passed"]
@@ -0,0 +1,57 @@
+import backend.analyzer as analyzer
+
+JD = """Senior Python developer wanted.
+Machine learning experience with Python and SQL.
+   Leadership and mentoring of the team.
+"""
+
+
+def _loop_weights(job_skills, job_text, role=None, seniority=None):
+    """The per-column loop calculate_scores used before JD profiles."""
+    vectorizer, matrix = analyzer.fit_tfidf(analyzer.split_sents(job_text), job_text)
+    priority = analyzer._priority_terms(role, seniority)
+    weights = {}
+    for skill in job_skills:
+        key = skill.lower()
+        tokens = key.split()
+        weight = 0.0
+        phrase_idx = vectorizer.vocabulary_.get(key)
+        if phrase_idx is not None:
+            weight += float(matrix[:, phrase_idx].max())
+        if phrase_idx is None or len(tokens) > 1:
+            for t in tokens:
+                idx = vectorizer.vocabulary_.get(t)
+                if idx is not None:
+                    weight += float(matrix[:, idx].max())
+        if weight == 0.0:
+            weight = 0.1
+        if key in priority:
+            weight *= 1.3
+        weights[skill] = weight
+    return weights
+
+
+def test_skill_weights_match_column_loop():
+    skills = ["Python", "Machine Learning", "Leadership", "Docker"]
+    profile = analyzer.get_jd_profile(analyzer.split_sents(JD), JD, "data scientist", "senior")
+    expected = _loop_weights(skills, JD, "data scientist", "senior")
+    for skill in skills:
+        assert abs(profile.skill_weights(skills)[skill] - expected[skill]) < 1e-12
+
+
+def test_profile_cached_by_normalized_jd_role_and_seniority():
+    first = analyzer.get_jd_profile(analyzer.split_sents(JD), JD, "Data Scientist")
+    reformatted = "\n\n" + "\n".join(line.strip() for line in JD.splitlines()) + "\n"
+    assert analyzer.get_jd_profile(analyzer.split_sents(reformatted), reformatted, "data scientist") is first
+    assert analyzer.get_jd_profile(analyzer.split_sents(JD), JD, "backend developer") is not first
+    stats = analyzer.jd_profile_cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+
+
+def test_profile_weights_line_up_with_sentences_across_layouts():
+    # splitlines() breaks on a form feed but split_sents does not, so these
+    # two JDs have different sentences and must not share one profile.
+    jds = ["Python developer.\x0cSQL expert.\nLeads a team.", "Python developer.\nSQL expert.\nLeads a team."]
+    for jd in jds:
+        sents = analyzer.split_sents(jd)
+        assert len(analyzer.get_jd_profile(sents, jd).sentence_weights) == len(sents)
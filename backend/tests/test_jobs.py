@@ -0,0 +1,193 @@
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+import backend.analyzer as analyzer
+import backend.jobs as jobs
+import backend.rewrite as rewrite
+from backend.benchmarks.stubs import StubSeq2SeqModel, StubSeq2SeqTokenizer
+from backend.database import SessionLocal
+from backend.models import Analysis, Job, LibraryResume
+
+
+@pytest.fixture(autouse=True)
+def empty_queue():
+    """Jobs left queued by another test would be claimed first."""
+    import backend.main  # noqa: F401  - creates the tables
+
+    db = SessionLocal()
+    db.query(Job).filter(Job.status.in_(["queued", "running"])).update({Job.status: "cancelled"})
+    db.commit(); db.close()
+
+
+async def _call(app, method, url, **kwargs):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.request(method, url, **kwargs)
+
+
+def _drain(worker):
+    batches = []
+    while True:
+        claimed = worker.claim()
+        if not claimed:
+            return batches
+        batches.append([job.id for job in claimed])
+        worker._run(claimed)
+
+
+def test_same_kind_jobs_run_as_one_batch_in_priority_order(monkeypatch, api_user):
+    app, _ = api_user
+    model = StubSeq2SeqModel(step_overhead=0)
+    pair = (StubSeq2SeqTokenizer(), model)
+    monkeypatch.setattr(rewrite, "get_model", lambda: pair)
+
+    def submit(body):
+        resp = asyncio.run(_call(app, "POST", "/jobs", json=body))
+        assert resp.status_code == 202
+        return resp.json()["id"]
+
+    low = submit({"kind": "rewrite", "payload": {"bullets": ["Built Python APIs."]}})
+    summary = submit({"kind": "summarize", "payload": {"text": "Short text."}, "priority": 1})
+    high = submit({"kind": "rewrite", "payload": {"bullets": ["Led a team.", "Ran SQL."]}, "priority": 5})
+    monkeypatch.setattr("backend.main.summarize_text", lambda text, *_: text.upper())
+
+    batches = _drain(jobs.JobWorker(batch_size=4))
+    assert batches == [[high, low], [summary]]
+    assert model.calls == 1  # both rewrite jobs shared one generate() call
+
+    done = asyncio.run(_call(app, "GET", f"/jobs/{high}")).json()
+    assert done["status"] == "done" and done["attempts"] == 1
+    rewrite.rewrite_cache.clear()
+    assert done["result"]["alternatives"] == rewrite.rewrite_bullets(["Led a team.", "Ran SQL."])
+    assert asyncio.run(_call(app, "GET", f"/jobs/{summary}")).json()["result"] == {"summary": "SHORT TEXT."}
+
+
+def test_failed_jobs_retry_alone_until_max_attempts(monkeypatch, api_user):
+    _, user = api_user
+    runs = []
+
+    def flaky(batch):
+        runs.append([job.payload["n"] for job in batch])
+        if any(job.payload["n"] < 0 for job in batch):
+            raise ValueError("bad payload")
+        return [{"n": job.payload["n"]} for job in batch]
+
+    monkeypatch.setitem(jobs._handlers, "flaky", flaky)
+    db = SessionLocal()
+    good = jobs.submit_job(db, user.id, "flaky", {"n": 1}).id
+    bad = jobs.submit_job(db, user.id, "flaky", {"n": -1}, max_attempts=2).id
+    db.close()
+
+    _drain(jobs.JobWorker())
+    assert runs == [[1, -1], [1], [-1], [-1]]
+    db = SessionLocal()
+    assert db.get(Job, good).result == {"n": 1}
+    failed = db.get(Job, bad)
+    assert (failed.status, failed.attempts, failed.error) == ("failed", 2, "ValueError: bad payload")
+    db.close()
+
+
+def test_cancelled_job_is_never_run_and_stream_ends(api_user):
+    app, _ = api_user
+    job_id = asyncio.run(
+        _call(app, "POST", "/jobs", json={"kind": "summarize", "payload": {"text": "Text."}})
+    ).json()["id"]
+    assert asyncio.run(_call(app, "POST", f"/jobs/{job_id}/cancel")).json()["status"] == "cancelled"
+    assert jobs.JobWorker().run_once() == 0
+
+    resp = asyncio.run(_call(app, "GET", f"/jobs/{job_id}/stream"))
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [line["status"] for line in lines] == ["cancelled"]
+
+
+def test_analyze_job_saves_history_and_validates_payload(api_user, dummy_models):
+    app, _ = api_user
+    payload = {"resume_text": "Built Python APIs.\nUsed SQL daily.", "job_description": "Python developer with SQL."}
+
+    bad = asyncio.run(_call(app, "POST", "/jobs", json={"kind": "analyze", "payload": {**payload, "resume_text": " "}}))
+    assert bad.status_code == 400
+    assert asyncio.run(_call(app, "POST", "/jobs", json={"kind": "train", "payload": {}})).status_code == 400
+
+    job_id = asyncio.run(_call(app, "POST", "/jobs", json={"kind": "analyze", "payload": payload})).json()["id"]
+    assert jobs.JobWorker().run_once() == 1
+    result = asyncio.run(_call(app, "GET", f"/jobs/{job_id}")).json()["result"]
+    expected = asyncio.run(analyzer.perform_analysis(payload["resume_text"], payload["job_description"]))
+    assert result["score"] == int(expected["score"])
+    assert asyncio.run(_call(app, "GET", f"/history/{result['id']}")).status_code == 200
+
+
+def test_expired_leases_are_requeued_while_running_and_fail_past_max_attempts(monkeypatch, api_user):
+    _, user = api_user
+    monkeypatch.setattr(jobs, "JOB_LEASE_SECONDS", 0.2)
+    monkeypatch.setattr(jobs, "JOB_POLL_INTERVAL", 0.02)
+    monkeypatch.setitem(jobs._handlers, "echo", lambda batch: [job.payload for job in batch])
+    stop = threading.Event()
+    worker = threading.Thread(target=jobs.JobWorker().run_forever, args=(stop,), daemon=True)
+    worker.start()
+
+    # Claimed after the worker started by workers that then died: only a periodic check finds them.
+    db = SessionLocal()
+    now = jobs._now()
+    retry = Job(id="lease-retry", user_id=user.id, kind="echo", payload={"n": 1}, status="running",
+                attempts=1, max_attempts=2, worker="dead", started_at=now, created_at=now)
+    spent = Job(id="lease-spent", user_id=user.id, kind="echo", payload={"n": 2}, status="running",
+                attempts=2, max_attempts=2, worker="dead", started_at=now, created_at=now)
+    db.add_all([retry, spent]); db.commit(); db.close()
+    try:
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            db = SessionLocal()
+            statuses = [db.get(Job, job_id) for job_id in ("lease-retry", "lease-spent")]
+            done = [(j.status, j.attempts, j.result, j.error) for j in statuses]
+            db.close()
+            if all(status in jobs.TERMINAL_STATUSES for status, *_ in done):
+                break
+            time.sleep(0.05)
+    finally:
+        stop.set(); jobs._wakeup.set()
+        worker.join(2)
+    assert done == [("done", 2, {"n": 1}, None), ("failed", 2, None, "Worker lease expired")]
+
+
+def test_analyze_job_cancelled_while_running_saves_nothing(api_user, dummy_models):
+    app, user = api_user
+    payload = {"resume_text": "Built Python APIs.", "job_description": "Python developer.", "save_to_library": True}
+    job_id = asyncio.run(_call(app, "POST", "/jobs", json={"kind": "analyze", "payload": payload})).json()["id"]
+
+    worker = jobs.JobWorker()
+    claimed = worker.claim()
+    assert asyncio.run(_call(app, "POST", f"/jobs/{job_id}/cancel")).json()["status"] == "cancelled"
+    worker._run(claimed)
+
+    db = SessionLocal()
+    assert db.query(Analysis).filter(Analysis.user_id == user.id).count() == 0
+    assert db.query(LibraryResume).filter(LibraryResume.user_id == user.id).count() == 0
+    assert db.get(Job, job_id).result is None
+    db.close()
+
+
+def test_finished_jobs_drop_their_payload_and_are_purged_after_retention(monkeypatch, api_user):
+    _, user = api_user
+    monkeypatch.setitem(jobs._handlers, "echo", lambda batch: [{"ok": True} for _ in batch])
+    db = SessionLocal()
+    done = jobs.submit_job(db, user.id, "echo", {"resume_text": "Built Python APIs."}).id
+    cancelled = jobs.cancel_job(db, jobs.submit_job(db, user.id, "echo", {"resume_text": "Led a team."})).id
+    db.close()
+    worker = jobs.JobWorker()
+    worker.run_once()
+
+    db = SessionLocal()
+    assert [db.get(Job, job_id).payload for job_id in (done, cancelled)] == [{}, {}]
+    db.close()
+    assert worker.purge_finished() == 0  # still within JOB_RETENTION_SECONDS
+
+    monkeypatch.setattr(jobs, "JOB_RETENTION_SECONDS", -1)
+    assert worker.purge_finished() >= 2
+    db = SessionLocal()
+    assert db.get(Job, done) is None and db.get(Job, cancelled) is None
+    db.close()
@@ -0,0 +1,32 @@
+import random
+
+from backend import analyzer
+from backend.keywords import KeywordMatcher, compile_keywords
+
+
+def test_counts_match_str_count_and_find():
+    rng = random.Random(0)
+    patterns = ["ab", "aba", "b", "python", "py", "node js"]
+    automaton = KeywordMatcher(patterns)
+    for _ in range(200):
+        text = "".join(rng.choice("abpy thon\nodejs") for _ in range(60))
+        scan = automaton.scan(text)
+        for p in patterns:
+            assert scan.counts.get(p, 0) == text.count(p)
+            assert scan.first.get(p, -1) == text.find(p)
+
+
+def test_whole_words_are_leftmost_longest():
+    scan = KeywordMatcher(["node", "node js", "js"]).scan("Node JS and js, not jsx or node.")
+    assert scan.words == {"node js": 1, "js": 1, "node": 1}
+
+
+def test_matcher_is_cached_per_skill_set():
+    assert analyzer.skill_matcher(["Python", "React"]) is analyzer.skill_matcher(["React", "Python"])
+    assert compile_keywords.cache_info().hits >= 1
+
+
+def test_ats_density_counts_synonyms():
+    resume = "Experience\nEducation\nBuilt js widgets and JavaScript apps in js"
+    score, suggestions, _ = analyzer.ats_analysis(resume, ["JavaScript"])
+    assert "Increase keyword density for job-specific terms" not in suggestions
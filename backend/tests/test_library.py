@@ -0,0 +1,102 @@
+import asyncio
+
+import httpx
+import numpy as np
+
+import backend.analyzer as analyzer
+from backend.benchmarks.stubs import StubCrossEncoder, StubEmbedder
+from backend.library import UserLibrary
+
+
+def _unit(rng, n, dim=32):
+    v = rng.standard_normal((n, dim)).astype(np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+def _fill(lib, rng, docs=300, rows=20):
+    data = {doc: _unit(rng, rows) for doc in range(1, docs + 1)}
+    for doc, vectors in data.items():
+        lib.add(doc, vectors)
+    return data
+
+
+def test_ivf_search_agrees_with_exact_scan(tmp_path):
+    rng = np.random.default_rng(0)
+    ivf = UserLibrary(str(tmp_path / "ivf"), exact_rows=1000)
+    exact = UserLibrary(str(tmp_path / "exact"), exact_rows=10**9)
+    data = _fill(ivf, rng)
+    for doc, vectors in data.items():
+        exact.add(doc, vectors)
+
+    queries = data[17][:5] + 0.05 * _unit(rng, 5)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    got = ivf.search(queries, top_n=10, nprobe=16)
+    want = exact.search(queries, top_n=10)
+
+    assert got[0][0] == want[0][0] == 17
+    assert abs(got[0][1] - want[0][1]) < 1e-3
+    assert ivf.stats()["ivf_lists"] > 1
+
+
+def test_warm_builds_the_index_before_the_first_search(tmp_path):
+    lib = UserLibrary(str(tmp_path), exact_rows=1000)
+    data = _fill(lib, np.random.default_rng(2), docs=60)
+    assert lib.stats()["ivf_lists"] == 0
+    lib.warm()
+    index = lib.index
+    assert lib.stats()["ivf_lists"] > 1
+    assert lib.search(data[5][:2], top_n=1)[0][0] == 5
+    assert lib.index is index  # search reused it instead of training again
+
+
+def test_deletes_survive_compaction_and_reload(tmp_path):
+    rng = np.random.default_rng(1)
+    lib = UserLibrary(str(tmp_path), exact_rows=1000)
+    data = _fill(lib, rng, docs=40)
+    for doc in range(1, 31):
+        assert lib.remove(doc)
+    stats = lib.stats()
+    assert stats["documents"] == 10
+    assert stats["rows"] < 40 * 20  # compacted once most rows were dead
+
+    reopened = UserLibrary(str(tmp_path))
+    assert len(reopened) == 10
+    hits = reopened.search(data[35][:3], top_n=3)
+    assert hits[0][0] == 35
+    assert all(doc > 30 for doc, _ in hits)
+
+
+def test_search_endpoint_ranks_and_forgets_deleted(monkeypatch, api_user):
+    app, _ = api_user
+    monkeypatch.setattr(analyzer, "get_embedder", lambda: StubEmbedder())
+    monkeypatch.setattr(analyzer, "get_cross_encoder", lambda: StubCrossEncoder())
+    resumes = [
+        "Built React and TypeScript design systems.\nCreated accessible CSS components.",
+        "Trained machine learning models in Python.\nWrote SQL for statistics reports.",
+        "Managed payroll and accounts in Excel.",
+    ]
+    jd = "Machine learning engineer with Python.\nStrong SQL and statistics."
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            async def analyze(text, save):
+                body = {"resume_text": text, "job_description": "Any role.", "save_to_library": save}
+                return (await client.post("/analyze", json=body)).json()["id"]
+
+            await analyze("Trained machine learning models in Python with SQL statistics.", False)
+            ids = [await analyze(text, True) for text in resumes]
+            await analyze(resumes[1], True)  # already in the library: not stored twice
+            plain = (await client.post("/search", json={"job_description": jd, "top_n": 2})).json()
+            reranked = (await client.post("/search", json={"job_description": jd, "top_n": 3, "rerank": True})).json()
+            await client.delete(f"/history/{ids[1]}")
+            after = (await client.post("/search", json={"job_description": jd, "top_n": 3})).json()
+            return ids, plain, reranked, after
+
+    ids, plain, reranked, after = asyncio.run(scenario())
+    assert len(reranked["results"]) == 3
+    assert [r["id"] for r in plain["results"]][0] == ids[1]
+    assert len(plain["results"]) == 2
+    assert reranked["reranked"] and reranked["results"][0]["id"] == ids[1]
+    assert "score" in reranked["results"][0]
+    assert ids[1] not in {r["id"] for r in after["results"]}
@@ -0,0 +1,54 @@
+import asyncio
+import json
+import logging
+
+import httpx
+
+import backend.analyzer as analyzer
+import backend.metrics as metrics
+
+PAYLOAD = {
+    "resume_text": "Experience\nBuilt Python APIs.\nEducation",
+    "job_description": "Python developer.\nMust know SQL.",
+}
+
+
+async def _analyze_then_scrape(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.post("/analyze", json=PAYLOAD)
+        assert resp.status_code == 200
+        return await client.get("/metrics")
+
+
+def test_metrics_expose_routes_stages_and_caches(api_user, dummy_models):
+    app, _ = api_user
+
+    resp = asyncio.run(_analyze_then_scrape(app))
+    assert resp.status_code == 200
+    text = resp.text
+    assert "# TYPE resumeboost_http_request_duration_seconds histogram" in text
+    assert 'resumeboost_http_request_duration_seconds_count{method="POST",route="/analyze",status="200"}' in text
+    for stage in ("skills", "embedding", "cross_encoder", "db_commit"):
+        assert f'resumeboost_analysis_stage_duration_seconds_count{{stage="{stage}"}}' in text
+    assert 'resumeboost_cache_misses_total{cache="embedding"}' in text
+    assert 'resumeboost_model_batch_size_bucket{model="embedder",le="+Inf"}' in text
+    assert "resumeboost_http_requests_in_flight 1" in text  # the scrape itself
+
+
+def test_trace_logs_stage_spans(monkeypatch, caplog, dummy_models):
+    monkeypatch.setattr(metrics, "TRACE_ENABLED", True)
+
+    with caplog.at_level(logging.INFO, logger="resumeboost.trace"):
+        asyncio.run(analyzer.perform_analysis(PAYLOAD["resume_text"], PAYLOAD["job_description"]))
+    trace = json.loads(caplog.records[-1].getMessage())
+    assert trace["name"] == "analyze"
+    assert {"skills", "tfidf", "embedding", "cross_encoder", "ats"} <= {s["stage"] for s in trace["spans"]}
+    assert all(s["duration_ms"] >= 0 for s in trace["spans"])
+
+
+def test_disabled_metrics_record_nothing(monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_ENABLED", False)
+    counter = metrics.Registry().counter("c_total", "help")
+    counter.inc()
+    assert counter.value() == 0
@@ -0,0 +1,68 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from backend.batching import MicroBatcher, run_bucketed, token_budget_batches
+
+
+def test_concurrent_submissions_share_one_call():
+    calls = []
+
+    def model(items):
+        calls.append(len(items))
+        time.sleep(0.01)
+        return np.array([[x, x * 2] for x in items])
+
+    batcher = MicroBatcher(model, max_items=64, max_wait=0.05)
+    start = threading.Barrier(8)
+    results = {}
+
+    def worker(i):
+        start.wait()
+        results[i] = batcher.submit([i * 10, i * 10 + 1])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sum(calls) == 16 and len(calls) < 8
+    for i, out in results.items():
+        assert out.tolist() == [[i * 10, i * 20], [i * 10 + 1, i * 20 + 2]]
+    stats = batcher.stats()
+    assert stats["batch_size"]["count"] == len(calls)
+    assert stats["queue_wait_ms"]["count"] == 8
+
+
+def test_max_items_closes_the_batch_early():
+    calls = []
+    batcher = MicroBatcher(lambda items: calls.append(len(items)) or np.zeros(len(items)), max_items=2, max_wait=5.0)
+    started = time.perf_counter()
+    batcher.submit([1, 2])
+    assert time.perf_counter() - started < 1.0
+    assert calls == [2]
+
+
+def test_model_errors_reach_every_caller():
+    def broken(items):
+        raise RuntimeError("boom")
+
+    batcher = MicroBatcher(broken, max_wait=0.001)
+    with pytest.raises(RuntimeError):
+        batcher.submit(["a"])
+
+
+def test_bucketing_respects_token_budget_and_restores_order():
+    lengths = [30, 3, 12, 4, 30, 100, 5]
+    batches = token_budget_batches(lengths, max_tokens=40)
+    assert sorted(i for b in batches for i in b) == list(range(len(lengths)))
+    for batch in batches:
+        assert len(batch) == 1 or len(batch) * max(lengths[i] for i in batch) <= 40
+
+    seen = []
+    out = run_bucketed(lambda items: seen.append(items) or np.array(items) * 2, list(range(7)), lengths, 40)
+    assert out.tolist() == [0, 2, 4, 6, 8, 10, 12]
+    assert len(seen) == len(batches)
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pytest
+
+import backend.analyzer as analyzer
+import backend.model_server as model_server
+import backend.rewrite as rewrite
+import backend.summary as summary
+from backend.benchmarks.stubs import (
+    StubCrossEncoder, StubEmbedder, StubSeq2SeqModel, StubSeq2SeqTokenizer, StubSummarizer,
+)
+
+SENTENCES = ["Built Python APIs.", "Led a team of five engineers.", "Ran SQL reports."]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """A model server with stub models on a private socket, and a client for it."""
+    monkeypatch.setattr(analyzer, "get_embedder", lambda: StubEmbedder())
+    monkeypatch.setattr(analyzer, "get_cross_encoder", lambda: StubCrossEncoder())
+    pair = (StubSeq2SeqTokenizer(), StubSeq2SeqModel(step_overhead=0))
+    monkeypatch.setattr(rewrite, "get_model", lambda: pair)
+    monkeypatch.setattr(summary, "pipeline", lambda *a, **k: StubSummarizer())
+    monkeypatch.setattr(summary, "_summarizer", None)
+
+    path = os.path.join(tempfile.mkdtemp(), "models.sock")
+    server = model_server.create_server(path)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = model_server.ModelClient(path)
+    yield client
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_arrays_round_trip_unchanged(client):
+    local = StubEmbedder().encode(SENTENCES)
+    remote = model_server.RemoteEmbedder(client).encode(SENTENCES)
+    assert remote.dtype == local.dtype and remote.shape == local.shape
+    np.testing.assert_array_equal(remote, local)
+    assert model_server.RemoteEmbedder(client).encode([]).shape == (0, StubEmbedder.dim)
+
+    pairs = [[SENTENCES[0], s] for s in SENTENCES]
+    np.testing.assert_array_equal(
+        model_server.RemoteCrossEncoder(client).predict(pairs), StubCrossEncoder().predict(pairs)
+    )
+
+
+def test_errors_are_raised_and_the_connection_survives(client):
+    with pytest.raises(model_server.RemoteModelError, match="unknown method"):
+        client.call("train")
+    assert client.call("encode", SENTENCES[:1]).shape == (1, StubEmbedder.dim)
+
+
+class RecordingClient:
+    def __init__(self):
+        self.calls = []
+
+    def call(self, method, *args, **kwargs):
+        self.calls.append(method)
+        return [["alt"] * rewrite.NUM_ALTERNATIVES for _ in args[0]]
+
+
+def test_loaders_proxy_when_a_server_is_configured(monkeypatch):
+    fake = RecordingClient()
+    for module in (analyzer, rewrite, summary):
+        monkeypatch.setattr(module, "get_client", lambda: fake)
+    monkeypatch.setattr(rewrite, "get_model", lambda: pytest.fail("T5 loaded in the worker"))
+
+    assert isinstance(analyzer.get_embedder.__wrapped__(), model_server.RemoteEmbedder)
+    assert isinstance(analyzer.get_cross_encoder.__wrapped__(), model_server.RemoteCrossEncoder)
+    assert isinstance(summary.get_summarizer(), model_server.RemoteSummarizer)
+    assert rewrite.rewrite_bullets(SENTENCES) == [["alt"] * rewrite.NUM_ALTERNATIVES] * 3
+    assert fake.calls == ["generate"]
@@ -0,0 +1,102 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+
+from backend.database import Base
+from backend.result_cache import MemoryResultStore, ResultCache, SqlResultStore
+
+PARTS = ("Python developer", "Need Python", None, None)
+
+
+def test_concurrent_identical_requests_compute_once():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"score": 80}
+
+    async def main():
+        cache = ResultCache(8, MemoryResultStore(), version=lambda: "v1")
+        results = await asyncio.gather(*(cache.get_or_compute(PARTS, compute) for _ in range(5)))
+        return cache, results
+
+    cache, results = asyncio.run(main())
+    assert len(calls) == 1
+    assert [r for r, _ in results] == [{"score": 80}] * 5
+    assert sorted(hit for _, hit in results) == [False, True, True, True, True]
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_sql_store_is_shared_and_purged_on_version_change(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    Base.metadata.create_all(bind=engine)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {"score": 70}
+
+    first = ResultCache(8, SqlResultStore(engine), version=lambda: "v1")
+    second = ResultCache(8, SqlResultStore(engine), version=lambda: "v1")
+    assert asyncio.run(first.get_or_compute(PARTS, compute)) == ({"score": 70}, False)
+    assert asyncio.run(second.get_or_compute(PARTS, compute)) == ({"score": 70}, True)
+    assert second.stats()["shared_hits"] == 1
+    assert len(calls) == 1
+
+    upgraded = ResultCache(8, SqlResultStore(engine), version=lambda: "v2")
+    assert upgraded.purge_stale() == 1
+    assert asyncio.run(upgraded.get_or_compute(PARTS, compute)) == ({"score": 70}, False)
+    assert len(calls) == 2
+
+
+def test_sql_store_evicts_expired_and_oldest_rows(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    Base.metadata.create_all(bind=engine)
+    clock = [datetime(2026, 1, 1)]
+    monkeypatch.setattr(SqlResultStore, "_now", staticmethod(lambda: clock[0]))
+    store = SqlResultStore(engine, ttl=3600, max_rows=3)
+
+    for i in range(5):
+        store.put(f"k{i}", "v1", {"score": i})
+        clock[0] += timedelta(seconds=1)
+    assert store.get("k0") == {"score": 0}  # inserts never prune
+    assert store.prune() == 2
+    assert [store.get(f"k{i}") for i in range(5)] == [None, None, {"score": 2}, {"score": 3}, {"score": 4}]
+
+    clock[0] += timedelta(seconds=3599)  # k2 and k3 are now past the TTL
+    assert store.get("k2") is None and store.get("k4") == {"score": 4}  # expired but not yet pruned
+    assert store.prune() == 2
+    store.put("k2", "v1", {"score": 20})  # an expired key is stored again
+    assert store.get("k2") == {"score": 20}
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT key FROM analysis_cache ORDER BY key")).scalars().all() == ["k2", "k4"]
+
+
+def test_pruning_runs_on_a_timer(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    Base.metadata.create_all(bind=engine)
+    cache = ResultCache(8, SqlResultStore(engine, ttl=0, max_rows=1), version=lambda: "v1")
+    for i in range(3):
+        cache.store.put(f"k{i}", "v1", {"score": i})
+    cache.start_pruning(interval=0.01)
+    deadline = time.monotonic() + 2
+    while cache.store.get("k0") is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [cache.store.get(f"k{i}") is None for i in range(3)] == [True, True, False]
+
+
+def test_uncacheable_results_are_recomputed():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {"score": 60, "degraded": {"grammar": "skipped"}}
+
+    cache = ResultCache(8, MemoryResultStore(), version=lambda: "v1")
+    skip = lambda r: not r["degraded"]
+    assert asyncio.run(cache.get_or_compute(PARTS, compute, skip))[1] is False
+    assert asyncio.run(cache.get_or_compute(PARTS, compute, skip))[1] is False
+    assert len(calls) == 2
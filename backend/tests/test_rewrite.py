@@ -0,0 +1,78 @@
+import asyncio
+
+import httpx
+
+import backend.rewrite as rewrite
+from backend.benchmarks.stubs import StubSeq2SeqModel, StubSeq2SeqTokenizer
+from backend.executor import InferenceExecutor
+
+BULLETS = [
+    "- Built Python APIs for billing.",
+    "Led a team of five engineers.",
+    "•  Built   Python APIs for billing.",
+    "Designed monitoring alerts on AWS with Grafana dashboards.",
+]
+
+
+def _stub(monkeypatch):
+    model = StubSeq2SeqModel(step_overhead=0)
+    pair = (StubSeq2SeqTokenizer(), model)
+    monkeypatch.setattr(rewrite, "get_model", lambda: pair)
+    return model
+
+
+def test_batched_matches_single_and_caches_normalized_bullets(monkeypatch):
+    model = _stub(monkeypatch)
+    single = [rewrite.rewrite_bullet(b) for b in BULLETS]
+    assert single[0] == single[2]
+    assert model.calls == 3  # the reformatted duplicate is a cache hit
+
+    rewrite.rewrite_cache.clear()
+    model.calls = 0
+    batched = rewrite.rewrite_bullets(BULLETS, batch_size=8)
+    assert batched == single
+    assert model.calls == 1
+    assert all(len(alts) == rewrite.NUM_ALTERNATIVES for alts in batched)
+
+
+def test_batch_endpoint_keeps_request_order(monkeypatch):
+    from backend.main import app
+
+    _stub(monkeypatch)
+
+    async def post(payload):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/rewrite/batch", json=payload)
+
+    resp = asyncio.run(post({"bullets": BULLETS}))
+    assert resp.status_code == 200
+    assert resp.json()["alternatives"] == [rewrite.rewrite_bullet(b) for b in BULLETS]
+    assert asyncio.run(post({"bullets": ["ok", " "]})).status_code == 400
+
+
+def test_rewrite_has_its_own_queue(monkeypatch):
+    import backend.main as main
+
+    _stub(monkeypatch)
+    free = InferenceExecutor(threads=1, max_queue=4)
+
+    def full():
+        return InferenceExecutor(threads=1, max_queue=0)
+
+    async def post(url, payload):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(url, json=payload)
+
+    # A full analysis queue does not hold rewrites back...
+    monkeypatch.setattr(main, "get_executor", full)
+    monkeypatch.setattr(main, "get_rewrite_executor", lambda: free)
+    assert asyncio.run(post("/rewrite/batch", {"bullets": BULLETS})).status_code == 200
+
+    # ...and a full rewrite queue is reported as such.
+    monkeypatch.setattr(main, "get_rewrite_executor", full)
+    for url, payload in [("/rewrite", {"text": BULLETS[1]}), ("/rewrite/batch", {"bullets": BULLETS})]:
+        resp = asyncio.run(post(url, payload))
+        assert resp.status_code == 503
+        assert resp.json()["detail"]["message"] == "Rewrite queue is full"
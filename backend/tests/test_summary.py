@@ -0,0 +1,83 @@
+import asyncio
+import re
+
+import httpx
+
+import backend.summary as summary
+from backend.batching import estimate_tokens
+from backend.executor import InferenceExecutor
+
+
+class FakeSummarizer:
+    """Keeps the first sentence of each input and records every call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, max_length, min_length, **_kw):
+        self.calls.append((list(texts), max_length, min_length))
+        return [{"summary_text": re.split(r"\.\s", t)[0].rstrip(".") + "."} for t in texts]
+
+
+def _document(sections):
+    return "\n".join(
+        f"Section {i} covers topic {i} in depth. " + " ".join(f"Detail {i}.{j} is explained here." for j in range(40))
+        for i in range(sections)
+    )
+
+
+def test_chunks_respect_token_budget():
+    chunks = summary.chunk_text(_document(6), max_tokens=120)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(c, limit=1 << 30) <= 120 + 10 for c in chunks)
+    assert "Detail 5.39" in chunks[-1]  # nothing past 200 sentences is lost
+
+
+def test_chunks_are_slices_of_the_original_text():
+    text = "Senior full-stack engineer, 2019-2021.\nBuilt e-commerce APIs - scaled to 1M users."
+    assert summary.chunk_text(text) == [text]
+    assert summary.chunk_text(text, max_tokens=12) == [
+        "Senior full-stack engineer, 2019-2021.",
+        "Built e-commerce APIs - scaled to 1M users.",
+    ]
+    doc = _document(6)
+    assert all(chunk in doc for chunk in summary.chunk_text(doc, max_tokens=120))
+
+
+def test_long_text_is_map_reduced_with_cached_chunks(monkeypatch):
+    fake = FakeSummarizer()
+    monkeypatch.setattr(summary, "get_summarizer", lambda: fake)
+    monkeypatch.setattr(summary, "SUMMARY_CHUNK_TOKENS", 120)
+
+    doc = _document(6)
+    result = summary.summarize_text(doc, max_length=60, min_length=10)
+    assert result == "Section 0 covers topic 0 in depth."
+    mapped, max_length, _ = fake.calls[0]
+    assert len(mapped) > 1 and max_length <= 60  # every chunk in one batched call
+    assert fake.calls[-1][1:] == (60, 10)  # the final pass gets the caller's budget
+
+    fake.calls.clear()
+    summary.summarize_text(doc.replace("Detail 5.39", "Detail 5.x"), max_length=60, min_length=10)
+    assert len(fake.calls[0][0]) == 1  # only the edited chunk is summarized again
+
+
+def test_route_runs_off_loop_with_length_budget(monkeypatch):
+    from backend.main import app
+
+    fake = FakeSummarizer()
+    monkeypatch.setattr(summary, "get_summarizer", lambda: fake)
+
+    async def post(payload):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/summarize", json=payload)
+
+    resp = asyncio.run(post({"text": "Short resume. Built APIs.", "max_length": 40, "min_length": 5}))
+    assert resp.status_code == 200
+    assert resp.json()["summary"] == "Short resume."
+    assert fake.calls[-1][1:] == (40, 5)
+    assert asyncio.run(post({"text": "x", "max_length": 5, "min_length": 10})).status_code == 400
+
+    monkeypatch.setattr("backend.main.get_executor", lambda: InferenceExecutor(threads=1, max_queue=0))
+    full = asyncio.run(post({"text": "Short resume."}))
+    assert full.status_code == 503 and full.json()["detail"]["message"] == "Summary queue is full"
@@ -0,0 +1,53 @@
+import asyncio
+import time
+
+import httpx
+
+import backend.main as main
+import backend.warmup as warmup
+
+
+def _get_ready(app):
+    async def go():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/ready")
+    return asyncio.run(go())
+
+
+def test_ready_only_after_warmup(monkeypatch):
+    calls = []
+    monkeypatch.setitem(warmup.WARMUPS, "fake", lambda: calls.append("fake") or time.sleep(0.05))
+    probe = warmup.Warmup(["fake"])
+    monkeypatch.setattr(main, "get_warmup", lambda: probe)
+
+    resp = _get_ready(main.app)
+    assert resp.status_code == 503
+    assert resp.json()["models"]["fake"]["state"] == "pending"
+
+    probe.start()
+    deadline = time.time() + 2
+    while not probe.ready and time.time() < deadline:
+        time.sleep(0.01)
+
+    resp = _get_ready(main.app)
+    assert resp.status_code == 200
+    model = resp.json()["models"]["fake"]
+    assert calls == ["fake"]
+    assert model["state"] == "ready" and model["load_seconds"] >= 0.05
+    assert isinstance(model["rss_delta_bytes"], int)
+
+
+def test_failed_model_keeps_service_unready(monkeypatch):
+    def boom():
+        raise ImportError("sentence-transformers not installed")
+
+    monkeypatch.setitem(warmup.WARMUPS, "broken", boom)
+    probe = warmup.Warmup(["broken", "missing"])
+    probe._load("broken")
+    probe._load("missing")
+
+    report = probe.report()
+    assert report["ready"] is False
+    assert "ImportError" in report["models"]["broken"]["error"]
+    assert "unknown model" in report["models"]["missing"]["error"]
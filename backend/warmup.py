@@ -0,0 +1,128 @@
+"""Load models at startup and report readiness."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+try:  # pragma: no cover - not available on Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore
+
+from . import analyzer, rewrite, summary
+
+# ----- Config -----
+WARMUP_MODELS = [m.strip() for m in os.getenv("WARMUP_MODELS", "spacy,embedder,cross_encoder").split(",") if m.strip()]
+# 1 loads models one after another so each memory delta is attributable.
+WARMUP_THREADS = int(os.getenv("WARMUP_THREADS", "1"))
+
+
+def _warm_spacy() -> None:
+    analyzer.get_nlp()
+    analyzer.parse_for_skills(["Python developer with React experience."])
+
+
+def _warm_embedder() -> None:
+    analyzer.get_embedder().encode(["Python developer."], normalize_embeddings=True)
+
+
+def _warm_cross_encoder() -> None:
+    analyzer.get_cross_encoder().predict([["Python developer.", "Built Python APIs."]])
+
+
+def _warm_rewrite() -> None:
+    rewrite.rewrite_bullet("Built Python APIs.")
+
+
+def _warm_summary() -> None:
+    summary.get_summarizer()("Built Python APIs for a large team. " * 8, max_length=20, min_length=5, do_sample=False)
+
+
+WARMUPS: Dict[str, Callable[[], None]] = {
+    "spacy": _warm_spacy,
+    "embedder": _warm_embedder,
+    "cross_encoder": _warm_cross_encoder,
+    "rewrite": _warm_rewrite,
+    "summary": _warm_summary,
+}
+
+
+def resident_memory() -> int:
+    """Current resident set size in bytes (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):  # pragma: no cover - non-Linux
+        if resource is None:
+            return 0
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+@dataclass
+class ModelStatus:
+    state: str = "pending"  # pending | loading | ready | failed
+    load_seconds: Optional[float] = None
+    rss_delta_bytes: Optional[int] = None
+    error: Optional[str] = None
+
+
+class Warmup:
+    """Load and exercise the selected models in background threads."""
+
+    def __init__(self, models: List[str], threads: int = 1) -> None:
+        self.models = models
+        self.threads = max(threads, 1)
+        self.status: Dict[str, ModelStatus] = {name: ModelStatus() for name in models}
+        self._started = False
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="warmup")
+        for name in self.models:
+            pool.submit(self._load, name)
+        pool.shutdown(wait=False)
+
+    def _load(self, name: str) -> None:
+        status = self.status[name]
+        fn = WARMUPS.get(name)
+        if fn is None:
+            status.state, status.error = "failed", f"unknown model '{name}'"
+            return
+        status.state = "loading"
+        rss_before = resident_memory()
+        start = time.perf_counter()
+        try:
+            fn()
+        except Exception as exc:
+            status.state, status.error = "failed", f"{type(exc).__name__}: {exc}"
+        else:
+            status.state = "ready"
+        status.load_seconds = round(time.perf_counter() - start, 3)
+        status.rss_delta_bytes = resident_memory() - rss_before
+
+    @property
+    def ready(self) -> bool:
+        return all(s.state == "ready" for s in self.status.values())
+
+    def report(self) -> Dict:
+        return {
+            "ready": self.ready,
+            "rss_bytes": resident_memory(),
+            "models": {name: asdict(s) for name, s in self.status.items()},
+        }
+
+
+@lru_cache(maxsize=1)
+def get_warmup() -> Warmup:
+    """Create and cache the warmup for the configured models."""
+    return Warmup(WARMUP_MODELS, WARMUP_THREADS)
@@ -25,6 +25,8 @@ interface HistoryDetail {
 export function History() {
   const { showToast } = useToast();
   const [items, setItems] = useState<HistoryItem[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [selectedItem, setSelectedItem] = useState<HistoryDetail | null>(null);
   const [loading, setLoading] = useState(true);
   const [detailLoading, setDetailLoading] = useState(false);
@@ -33,6 +35,7 @@ export function History() {
     try {
       const response = await api.getHistory();
       setItems(response.items);
+      setNextCursor(response.nextCursor ?? null);
     } catch {
       showToast('error', 'Failed to load history');
     } finally {
@@ -40,6 +43,20 @@ export function History() {
     }
   }, [showToast]);
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const response = await api.getHistory(nextCursor);
+      setItems(prev => [...prev, ...response.items]);
+      setNextCursor(response.nextCursor ?? null);
+    } catch {
+      showToast('error', 'Failed to load history');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     loadHistory();
   }, [loadHistory]);
@@ -185,6 +202,16 @@ export function History() {
                 </div>
               ))}
             </div>
+
+            {nextCursor && (
+              <button
+                onClick={loadMore}
+                disabled={loadingMore}
+                className="w-full py-2 text-sm font-medium text-blue-600 dark:text-blue-400 hover:text-blue-700 disabled:opacity-50"
+              >
+                {loadingMore ? 'Loading...' : 'Load more'}
+              </button>
+            )}
           </div>
 
           {/* Detail View */}
@@ -22,7 +22,7 @@ export function Privacy() {
               Data Protection
             </h3>
             <p className="text-gray-600 dark:text-gray-400">
-              All resume data is processed in-memory and never permanently stored on our servers.
+              Resumes are processed in-memory. Their full text is only kept on our servers if you choose to save it to your resume library.
             </p>
           </div>
 
@@ -96,7 +96,10 @@ export function Privacy() {
               We believe in minimal data retention:
             </p>
             <ul className="list-disc pl-6 space-y-2 text-gray-600 dark:text-gray-400">
-              <li>Resume content is processed in real-time and not permanently stored</li>
+              <li>Full resume text is processed in real-time and not stored unless you save it to your resume library</li>
+              <li>To answer repeat requests quickly, analysis results (which quote short excerpts of your resume) are cached for up to 24 hours</li>
+              <li>Resumes submitted as background jobs are kept only until the job finishes, and job results are deleted after 24 hours</li>
+              <li>Deleting an analysis from your history also removes its resume from your library</li>
               <li>Analysis results are stored locally in your browser</li>
               <li>You can delete your analysis history at any time</li>
               <li>Server logs are automatically purged after 30 days</li>
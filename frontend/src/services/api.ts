@@ -148,8 +148,9 @@ export const api = {
     return response.json();
   },
 
-  async getHistory(): Promise<{ items: HistoryItem[] }> {
-    const response = await fetch(`${API_BASE_URL}/history`, {
+  async getHistory(cursor?: string): Promise<{ items: HistoryItem[]; nextCursor?: string | null }> {
+    const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+    const response = await fetch(`${API_BASE_URL}/history${query}`, {
       headers: authHeaders(),
     });
     if (!response.ok) {